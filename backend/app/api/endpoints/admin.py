@@ -2,8 +2,8 @@
 Admin-only endpoints for monitoring and platform management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Dict, Any, List, Literal
 
 from app.api import deps
 from app.core.logging import get_logger
@@ -60,6 +60,55 @@ async def get_system_health(
     ]
 
 
+@router.get("/ai/stats")
+async def get_ai_stats(
+    current_user: User = Depends(deps.require_admin),
+) -> Dict[str, Any]:
+    """Get in-process AI call counters (request coalescing, dispatch queue, log sink)."""
+    from app.core.llm_dispatch import llm_dispatcher
+    from app.services.ai_service import ai_service
+    from app.services.log_sink import agent_log_sink
+
+    return {
+        "singleflight": ai_service.inflight_stats(),
+        "dispatch": llm_dispatcher.stats(),
+        "log_sink": agent_log_sink.stats(),
+    }
+
+
+@router.get("/ai/usage/{group_by}")
+async def get_ai_usage(
+    group_by: Literal["method", "user", "day"],
+    days: int = Query(7, ge=1, le=90),
+    current_user: User = Depends(deps.require_admin),
+) -> List[Dict[str, Any]]:
+    """
+    LLM token usage, cache hits and latency percentiles over the last ``days``
+    days, grouped by AI method, user or day.
+    """
+    from app.services.ai_usage import ai_usage_recorder
+
+    try:
+        return await ai_usage_recorder.report(group_by, days=days)
+    except Exception as e:
+        logger.error(f"Failed to build AI usage report: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build AI usage report",
+        )
+
+
+@router.delete("/ai/cache")
+async def clear_ai_response_cache(
+    current_user: User = Depends(deps.require_admin),
+) -> Dict[str, Any]:
+    """Drop all cached LLM responses."""
+    from app.services.ai_service import ai_service
+
+    cleared = await ai_service.clear_response_cache()
+    return {"cleared": cleared}
+
+
 @router.get("/users")
 async def list_all_users(
     skip: int = 0,
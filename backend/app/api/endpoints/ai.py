@@ -1,13 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+import json
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, AsyncIterator
 from app.services.ai_service import ai_service
+from app.services.ai_usage import set_usage_user
+from app.core.logging import get_logger
 from app.core.features import features
 from app.schemas.ai import StructuredResume, CoverLetter
 from app.api import deps
 from app.models.user import User
 
 router = APIRouter()
+logger = get_logger(__name__)
 
 
 class ResumeBulletRequest(BaseModel):
@@ -19,44 +24,108 @@ class CoverLetterRequest(BaseModel):
     resume_summary: str
     job_description: str
     company_name: str
+    regenerate: bool = False
 
 
 class EmailPersonalizationRequest(BaseModel):
     template: str
     company_name: str
     role: str
+    regenerate: bool = False
 
 
 class ResumeGenerationRequest(BaseModel):
     job_description: str
+    regenerate: bool = False
+
+
+async def get_ai_user(current_user: User = Depends(deps.get_current_user)) -> User:
+    """The current user, with LLM usage in this request attributed to them."""
+    set_usage_user(str(current_user.id))
+    return current_user
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_stream(request: Request, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Forward generated text as Server-Sent Events.
+
+    Emits ``token`` events, then ``done`` with the full text (or ``error``).
+    Stops generating as soon as the client disconnects.
+    """
+    parts = []
+    try:
+        async for chunk in chunks:
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling AI generation")
+                return
+            parts.append(chunk)
+            yield _sse("token", {"text": chunk})
+        yield _sse("done", {"text": "".join(parts)})
+    except Exception as e:
+        logger.error(f"AI streaming failed: {e}")
+        yield _sse("error", {"detail": "AI generation failed"})
+    finally:
+        await chunks.aclose()
+
+
+def _sse_response(request: Request, chunks: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_stream(request, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/resume/generate", response_model=str)
 async def generate_resume_content(
     request: ResumeGenerationRequest,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(get_ai_user),
 ):
     """
     Generate optimized resume content based on job description.
     """
     features.require("ai_resume")
     try:
-        return await ai_service.generate_resume_content(request.job_description)
+        return await ai_service.generate_resume_content(
+            request.job_description, bypass_cache=request.regenerate
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail="AI generation failed")
 
 
+@router.post("/resume/generate/stream")
+async def stream_resume_content(
+    request: ResumeGenerationRequest,
+    http_request: Request,
+    current_user: User = Depends(get_ai_user),
+):
+    """
+    Stream optimized resume content as Server-Sent Events.
+    """
+    features.require("ai_resume")
+    return _sse_response(
+        http_request,
+        ai_service.stream_resume_content(request.job_description, bypass_cache=request.regenerate),
+    )
+
+
 @router.post("/resume/generate-structured", response_model=StructuredResume)
 async def generate_structured_resume(
     request: ResumeGenerationRequest,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(get_ai_user),
 ):
     """
     Generate optimized resume content as structured JSON.
     """
     features.require("ai_resume")
     try:
-        data = await ai_service.generate_structured_resume(request.job_description)
+        data = await ai_service.generate_structured_resume(
+            request.job_description, bypass_cache=request.regenerate
+        )
         return StructuredResume(**data)
     except Exception as e:
         raise HTTPException(status_code=500, detail="AI generation failed")
@@ -64,7 +133,7 @@ async def generate_structured_resume(
 
 @router.post("/cover-letter/generate-structured", response_model=CoverLetter)
 async def generate_structured_cover_letter(
-    request: CoverLetterRequest, current_user: User = Depends(deps.get_current_user)
+    request: CoverLetterRequest, current_user: User = Depends(get_ai_user)
 ):
     """
     Generate a professional cover letter as structured JSON.
@@ -72,7 +141,8 @@ async def generate_structured_cover_letter(
     features.require("ai_cover_letter")
     try:
         data = await ai_service.generate_structured_cover_letter(
-            request.resume_summary, request.job_description, request.company_name
+            request.resume_summary, request.job_description, request.company_name,
+            bypass_cache=request.regenerate
         )
         return CoverLetter(**data)
     except Exception as e:
@@ -81,7 +151,7 @@ async def generate_structured_cover_letter(
 
 @router.post("/resume/bullets", response_model=str)
 async def generate_resume_bullets(
-    request: ResumeBulletRequest, current_user: User = Depends(deps.get_current_user)
+    request: ResumeBulletRequest, current_user: User = Depends(get_ai_user)
 ):
     """
     Rewrite a resume bullet point using AI.
@@ -97,7 +167,7 @@ async def generate_resume_bullets(
 
 @router.post("/cover-letter", response_model=str)
 async def generate_cover_letter(
-    request: CoverLetterRequest, current_user: User = Depends(deps.get_current_user)
+    request: CoverLetterRequest, current_user: User = Depends(get_ai_user)
 ):
     """
     Generate a cover letter using AI.
@@ -105,17 +175,37 @@ async def generate_cover_letter(
     features.require("ai_cover_letter")
     try:
         return await ai_service.generate_cover_letter(
-            request.resume_summary, request.job_description, request.company_name
+            request.resume_summary, request.job_description, request.company_name,
+            bypass_cache=request.regenerate
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail="AI generation failed")
 
 
+@router.post("/cover-letter/stream")
+async def stream_cover_letter(
+    request: CoverLetterRequest,
+    http_request: Request,
+    current_user: User = Depends(get_ai_user),
+):
+    """
+    Stream a cover letter as Server-Sent Events.
+    """
+    features.require("ai_cover_letter")
+    return _sse_response(
+        http_request,
+        ai_service.stream_cover_letter(
+            request.resume_summary, request.job_description, request.company_name,
+            bypass_cache=request.regenerate
+        ),
+    )
+
+
 @router.post("/match")
 async def match_job_and_resume(
     job_description: str = Body(..., embed=True),
     resume_text: str = Body(..., embed=True),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(get_ai_user),
 ):
     """
     Execute a stateful matching workflow using LangGraph.
@@ -135,7 +225,7 @@ async def match_job_and_resume(
 @router.post("/email", response_model=str)
 async def personalize_email(
     request: EmailPersonalizationRequest,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(get_ai_user),
 ):
     """
     Personalize an email template using AI.
@@ -143,7 +233,8 @@ async def personalize_email(
     features.require("ai_email_personalization")
     try:
         return await ai_service.personalize_email(
-            request.template, request.company_name, request.role
+            request.template, request.company_name, request.role,
+            bypass_cache=request.regenerate
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail="AI personalization failed")
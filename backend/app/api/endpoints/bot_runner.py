@@ -43,9 +43,12 @@ async def _run_bot_with_logging(user_id: str, user_email: str):
         )
 
         # Import and run bot service
+        from app.core.llm_dispatch import LLMPriority, use_llm_priority
+        from app.services.ai_usage import track_ai_usage
         from app.services.bot import bot_service
 
-        results = await bot_service.run_job_automation(user_id)
+        with use_llm_priority(LLMPriority.AUTOMATION), track_ai_usage(user_id=user_id):
+            results = await bot_service.run_job_automation(user_id)
 
         await manager.send_to_user(
             user_id,
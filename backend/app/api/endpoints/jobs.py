@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body, Query
 from typing import List, Any, Optional
 from app.api import deps
 from app.services.job_scraper import job_scraper_service
 from app.core.features import features
 from app.services.job_service import JobService
+from app.services.resume_service import ResumeService
 from app.repositories.job import JobRepository
+from app.repositories.resume import ResumeRepository
 from app.schemas.job import Job as JobSchema, JobCreate, JobUpdate, JobCreateResponse
 from app.models.user import User as UserModel
 
 router = APIRouter()
 
+SCRAPED_JOB_INTERNAL_FIELDS = {"id", "embedding_vector", "embedding_model"}
+
 
 def get_job_service(
     job_repo: JobRepository = Depends(deps.get_job_repository),
@@ -17,6 +21,12 @@ def get_job_service(
     return JobService(job_repo)
 
 
+def get_resume_service(
+    resume_repo: ResumeRepository = Depends(deps.get_resume_repository),
+) -> ResumeService:
+    return ResumeService(resume_repo)
+
+
 @router.post("/scrape")
 async def trigger_scrape(
     keyword: str,
@@ -54,21 +64,54 @@ async def trigger_scrape(
 async def list_scraped_jobs(
     skip: int = 0,
     limit: int = 100,
+    include_duplicates: bool = False,
     current_user: UserModel = Depends(deps.get_current_user),
 ):
     """
     List global scraped jobs from the scraped_jobs collection.
+
+    Near-duplicates of another listed job are hidden unless ``include_duplicates`` is set.
     """
     from app.models.job import ScrapedJob
+    from app.services.near_duplicates import visible_jobs_filter
 
+    query = {} if include_duplicates else visible_jobs_filter()
     jobs = (
-        await ScrapedJob.find_all()
+        await ScrapedJob.find(query)
         .sort("-created_at")
         .skip(skip)
         .limit(limit)
         .to_list()
     )
-    return [{**job.dict(), "id": str(job.id)} for job in jobs]
+    return [{**job.dict(exclude=SCRAPED_JOB_INTERNAL_FIELDS), "id": str(job.id)} for job in jobs]
+
+
+@router.get("/recommend")
+async def recommend_jobs(
+    resume_id: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    resume_service: ResumeService = Depends(get_resume_service),
+    current_user: UserModel = Depends(deps.get_current_user),
+):
+    """
+    Recommend scraped jobs closest to a resume (defaults to the user's latest)
+    using approximate nearest-neighbour search over job embeddings.
+    """
+    from app.services.vector_index import vector_index_service
+
+    if resume_id:
+        resume = await resume_service.get_resume(resume_id, current_user)
+    else:
+        resumes = await resume_service.get_user_resumes(user=current_user, limit=1)
+        if not resumes:
+            raise HTTPException(status_code=404, detail="No resume found for recommendations")
+        resume = resumes[0]
+
+    recommendations = await vector_index_service.recommend(resume, limit=limit)
+    return [
+        {**job.dict(exclude=SCRAPED_JOB_INTERNAL_FIELDS), "id": str(job.id), "score": score}
+        for job, score in recommendations
+    ]
 
 
 @router.get("/stats")
@@ -1,10 +1,39 @@
 import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from app.automation.session import SessionManager
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-accelerated-2d-canvas",
+    "--no-first-run",
+    "--no-zygote",
+    "--disable-gpu",
+]
+
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+}
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
 class BrowserManager:
     def __init__(self):
         self.playwright = None
@@ -21,33 +50,15 @@ class BrowserManager:
             # Launch Chromium
             self.browser = await self.playwright.chromium.launch(
                 headless=getattr(settings, "PLAYWRIGHT_HEADLESS", True),
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-accelerated-2d-canvas",
-                    "--no-first-run",
-                    "--no-zygote",
-                    "--disable-gpu",
-                ]
+                args=LAUNCH_ARGS
             )
             
             # Create Context with stealth settings
-            self.context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                locale="en-US",
-                timezone_id="America/New_York",
-            )
+            self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
             
             # Anti-detection scripts
             page = await self.context.new_page()
-            await page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            """)
+            await page.add_init_script(STEALTH_SCRIPT)
             
             return page
             
@@ -66,3 +77,169 @@ class BrowserManager:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+
+
+class _PooledContext:
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium shared by all scrapes.
+    
+    Each scrape gets its own ``BrowserContext`` (cookies, storage and cache are
+    not shared with concurrent scrapes). Contexts are reused up to
+    ``max_uses_per_context`` times and have the saved session cookies loaded
+    once when created.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = 3,
+        max_uses_per_context: int = 20,
+        session_manager: Optional[SessionManager] = None
+    ):
+        self.max_contexts = max_contexts
+        self.max_uses_per_context = max_uses_per_context
+        self.session_manager = session_manager or SessionManager()
+
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self._idle: List[_PooledContext] = []
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._launch_lock = asyncio.Lock()
+
+        self.browser_launches = 0
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.leases = 0
+        self.in_use = 0
+
+    async def start(self) -> None:
+        """Launch the browser (idempotent; relaunches it if it crashed)."""
+        async with self._launch_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return
+
+            await self._close_browser()
+            start = time.perf_counter()
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(
+                headless=getattr(settings, "PLAYWRIGHT_HEADLESS", True),
+                args=LAUNCH_ARGS
+            )
+            self.browser_launches += 1
+            logger.info(f"Browser pool launched Chromium in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    async def stop(self) -> None:
+        """Close idle contexts and the browser."""
+        async with self._launch_lock:
+            await self._close_browser()
+
+    async def _close_browser(self) -> None:
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close_context(pooled)
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.debug(f"Failed to close browser: {e}")
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def _new_context(self) -> _PooledContext:
+        context = await self.browser.new_context(**CONTEXT_OPTIONS)
+        await context.add_init_script(STEALTH_SCRIPT)
+
+        cookies = self.session_manager.load_cookies()
+        if cookies:
+            await context.add_cookies(cookies)
+
+        self.contexts_created += 1
+        return _PooledContext(context)
+
+    def _is_live(self, pooled: _PooledContext) -> bool:
+        """Whether ``pooled`` belongs to the running browser (``stop`` or a relaunch orphans it)."""
+        return self.browser is not None and pooled.context.browser is self.browser and self.browser.is_connected()
+
+    @staticmethod
+    async def _close_context(pooled: _PooledContext) -> None:
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Failed to close browser context: {e}")
+
+    @asynccontextmanager
+    async def context(self):
+        """
+        Lease a browser context for one scrape.
+        
+        Waits while ``max_contexts`` contexts are in use.
+        """
+        async with self._slots:
+            await self.start()
+
+            pooled = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if self._is_live(candidate):
+                    pooled = candidate
+                    break
+                # Belongs to a browser that has since been relaunched
+                await self._close_context(candidate)
+            if pooled is None:
+                pooled = await self._new_context()
+
+            pooled.uses += 1
+            self.leases += 1
+            self.in_use += 1
+            failed = False
+            try:
+                yield pooled.context
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                self.in_use -= 1
+                # stop() may have run while this context was leased
+                if failed or pooled.uses >= self.max_uses_per_context or not self._is_live(pooled):
+                    self.contexts_recycled += 1
+                    await self._close_context(pooled)
+                else:
+                    self._idle.append(pooled)
+
+    @asynccontextmanager
+    async def page(self):
+        """Lease a context and open a fresh page in it, closed afterwards."""
+        async with self.context() as context:
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close page: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters since process start."""
+        return {
+            "running": self.browser is not None and self.browser.is_connected(),
+            "browser_launches": self.browser_launches,
+            "contexts_created": self.contexts_created,
+            "contexts_recycled": self.contexts_recycled,
+            "leases": self.leases,
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+        }
+
+
+browser_pool = BrowserPool(
+    max_contexts=settings.BROWSER_POOL_MAX_CONTEXTS,
+    max_uses_per_context=settings.BROWSER_POOL_MAX_USES_PER_CONTEXT,
+)
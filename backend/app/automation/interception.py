@@ -0,0 +1,87 @@
+"""
+Request interception for scraper pages.
+
+Scrapers only need DOM text, so images, fonts, media and third-party
+trackers are aborted before they are downloaded. Each scraper can allowlist
+URL patterns it still needs. ``PageTraffic`` counts requests and bytes so the
+savings can be measured with blocking on and off.
+"""
+import fnmatch
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from playwright.async_api import Page, Request, Route
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RequestBlockingPolicy:
+    """Which requests to abort: by Playwright resource type or URL glob, unless allowlisted."""
+    resource_types: FrozenSet[str] = frozenset()
+    url_patterns: Tuple[str, ...] = ()
+    allow_patterns: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_settings(cls, allow_patterns: Iterable[str] = ()) -> "RequestBlockingPolicy":
+        return cls(
+            resource_types=frozenset(settings.SCRAPER_BLOCKED_RESOURCE_TYPES),
+            url_patterns=tuple(settings.SCRAPER_BLOCKED_URL_PATTERNS),
+            allow_patterns=tuple(allow_patterns),
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if any(fnmatch.fnmatch(url, pattern) for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.resource_types:
+            return True
+        return any(fnmatch.fnmatch(url, pattern) for pattern in self.url_patterns)
+
+
+@dataclass
+class PageTraffic:
+    """Request/byte counters for one page, with optional blocking."""
+    policy: Optional[RequestBlockingPolicy] = None
+    requests: int = 0
+    blocked: int = 0
+    bytes_received: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    page_load_ms: Optional[float] = None
+
+    async def attach(self, page: Page) -> "PageTraffic":
+        """Start counting (and, with a policy, intercepting) the page's requests."""
+        page.on("requestfinished", self._on_finished)
+        if self.policy is not None:
+            await page.route("**/*", self._on_route)
+        return self
+
+    async def _on_route(self, route: Route) -> None:
+        request = route.request
+        if self.policy.should_block(request.resource_type, request.url):
+            self.blocked += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _on_finished(self, request: Request) -> None:
+        self.requests += 1
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            # Page or context closed before the sizes were available
+            return
+        self.bytes_received += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "blocking": self.policy is not None,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "bytes_received": self.bytes_received,
+            "page_load_ms": round(self.page_load_ms, 1) if self.page_load_ms is not None else None,
+        }
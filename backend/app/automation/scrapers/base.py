@@ -1,15 +1,99 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from playwright.async_api import Page
+from app.automation.interception import PageTraffic, RequestBlockingPolicy
 from app.automation.session import SessionManager
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Reads every card in one round-trip: {field: (selector, "text" | attribute name)}
+EXTRACT_CARDS_SCRIPT = """
+({card, fields, offset}) => Array.from(document.querySelectorAll(card)).slice(offset).map(el => {
+    const out = {};
+    for (const [name, [selector, source]] of Object.entries(fields)) {
+        const node = el.querySelector(selector);
+        out[name] = !node ? null : source === "text" ? node.innerText : node.getAttribute(source);
+    }
+    return out;
+})
+"""
+
+# Resolves true as soon as more than `count` cards exist, false after `timeout` ms
+WAIT_FOR_MORE_CARDS_SCRIPT = """
+([selector, count, timeout]) => new Promise(resolve => {
+    const ready = () => document.querySelectorAll(selector).length > count;
+    if (ready()) return resolve(true);
+    const observer = new MutationObserver(() => {
+        if (ready()) {
+            observer.disconnect();
+            resolve(true);
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    setTimeout(() => {
+        observer.disconnect();
+        resolve(ready());
+    }, timeout);
+})
+"""
+
 class BaseScraper(ABC):
+    # URL globs this scraper needs even if blocking rules would abort them
+    request_allowlist: Tuple[str, ...] = ()
+    # Job card selector and per-field (selector, "text" | attribute name)
+    card_selector: str = ""
+    field_selectors: Dict[str, Tuple[str, str]] = {}
+
     def __init__(self, page: Page):
         self.page = page
         self.session_manager = SessionManager()
+        self.traffic = PageTraffic()
+
+    async def intercept_requests(self) -> PageTraffic:
+        """
+        Count the page's traffic and, unless SCRAPER_BLOCK_RESOURCES is off,
+        abort requests the scraper does not need.
+        """
+        policy = None
+        if settings.SCRAPER_BLOCK_RESOURCES:
+            policy = RequestBlockingPolicy.from_settings(self.request_allowlist)
+        self.traffic = PageTraffic(policy=policy)
+        return await self.traffic.attach(self.page)
+
+    async def extract_cards(self, offset: int = 0, mode: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+        """
+        Raw field values of every card matching ``card_selector`` (from ``offset``).
+
+        Fields whose selector matches nothing are None. ``mode`` (default
+        SCRAPER_EXTRACTION_MODE) is "evaluate" for a single ``page.evaluate``
+        or "handles" for one element-handle round-trip per field.
+        """
+        mode = mode or settings.SCRAPER_EXTRACTION_MODE
+        if mode == "evaluate":
+            return await self.page.evaluate(
+                EXTRACT_CARDS_SCRIPT,
+                {"card": self.card_selector, "fields": self.field_selectors, "offset": offset},
+            )
+
+        cards = []
+        for card in (await self.page.query_selector_all(self.card_selector))[offset:]:
+            values = {}
+            for name, (selector, source) in self.field_selectors.items():
+                element = await card.query_selector(selector)
+                if element is None:
+                    values[name] = None
+                elif source == "text":
+                    values[name] = await element.inner_text()
+                else:
+                    values[name] = await element.get_attribute(source)
+            cards.append(values)
+        return cards
+
+    async def wait_for_more_cards(self, count: int, timeout_ms: int = 5000) -> bool:
+        """Wait (on DOM mutations, not a fixed sleep) until more than ``count`` cards exist."""
+        return await self.page.evaluate(WAIT_FOR_MORE_CARDS_SCRIPT, [self.card_selector, count, timeout_ms])
 
     @abstractmethod
     async def login(self):
@@ -19,12 +103,21 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
+    def iter_jobs(self, keyword: str, location: str, limit: int = 10) -> AsyncIterator[List[Dict]]:
+        """
+        Scrapes job listings page by page, yielding each new batch as it loads.
+        """
+        pass
+
     async def scrape_jobs(self, keyword: str, location: str, limit: int = 10) -> List[Dict]:
         """
         Scrapes job listings based on keyword and location.
         Returns a list of dictionaries with job details.
         """
-        pass
+        jobs = []
+        async for batch in self.iter_jobs(keyword, location, limit):
+            jobs.extend(batch)
+        return jobs
     
     async def save_session(self):
         """
@@ -1,17 +1,33 @@
-from typing import List, Dict
-import asyncio
+from typing import AsyncIterator, List, Dict, Optional
+import time
 from app.automation.scrapers.base import BaseScraper
 import logging
 
 logger = logging.getLogger(__name__)
 
 class LinkedInScraper(BaseScraper):
+    # Guest job-search endpoints that load more results
+    request_allowlist = ("*linkedin.com/jobs-guest/*",)
+    # Only result cards; a bare "li" also matches nav and footer items
+    card_selector = ".jobs-search__results-list > li"
+    field_selectors = {
+        "title": ("h3, .base-search-card__title", "text"),
+        "company": ("h4, .base-search-card__subtitle", "text"),
+        "location": (".job-search-card__location, .base-search-card__metadata", "text"),
+        "link": ("a", "href"),
+    }
+
     async def login(self):
         # For now, we rely on existing cookies or public pages
         # LinkedIn login is strict with CAPTCHAs, so we prioritize public scraping or cookie reuse
-        cookies = self.session_manager.load_cookies()
-        if cookies:
-            await self.page.context.add_cookies(cookies)
+        # Pooled contexts already carry the saved cookies
+        has_session = bool(await self.page.context.cookies("https://www.linkedin.com"))
+        if not has_session:
+            cookies = self.session_manager.load_cookies()
+            if cookies:
+                await self.page.context.add_cookies(cookies)
+                has_session = True
+        if has_session:
             await self.page.goto("https://www.linkedin.com/feed/")
             # Check if logged in
             if "feed" in self.page.url:
@@ -20,10 +36,22 @@ class LinkedInScraper(BaseScraper):
 
         logger.warning("No valid session found for LinkedIn. Proceeding in guest mode (limited).")
 
-    async def scrape_jobs(self, keyword: str, location: str, limit: int = 10) -> List[Dict]:
+    async def iter_jobs(
+        self,
+        keyword: str,
+        location: str,
+        limit: int = 10,
+        page_timeout_ms: int = 5000
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Yield batches of new jobs, loading more results (scroll or "See more jobs")
+        until ``limit`` jobs are found or no more results appear within ``page_timeout_ms``.
+        """
         url = f"https://www.linkedin.com/jobs/search?keywords={keyword}&location={location}"
+        total = 0
         try:
             logger.info(f"Navigating to {url}")
+            load_start = time.perf_counter()
             await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
             
             # Wait for results or empty state
@@ -31,49 +59,71 @@ class LinkedInScraper(BaseScraper):
                 await self.page.wait_for_selector(".jobs-search__results-list, .results-context-header", timeout=15000)
             except:
                 logger.warning("Timeout waiting for job selectors, attempting to parse whatever is on page")
+            self.traffic.page_load_ms = (time.perf_counter() - load_start) * 1000
             
-            # Scroll to load more (basic)
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight/2)")
-            await asyncio.sleep(2)
-            
-            jobs = []
-            cards = await self.page.query_selector_all("li")
-            
-            count = 0
-            for card in cards:
-                if count >= limit:
+            # Cards before `offset` are done; cards from the first unparsed one
+            # on (e.g. not rendered yet) are read again after the next load.
+            # A card gets one retry, so one that never parses (an ad, a
+            # placeholder) does not hold `offset` back for the rest of the search
+            offset = 0
+            seen_links = set()
+            missed = set()
+            while total < limit:
+                cards = await self.extract_cards(offset=offset)
+                card_count = offset + len(cards)
+                
+                batch = []
+                done = len(cards)
+                for position, card in enumerate(cards):
+                    job = self._to_job(card)
+                    if job is None:
+                        if offset + position not in missed:
+                            missed.add(offset + position)
+                            done = min(done, position)
+                    elif job["link"] not in seen_links and total + len(batch) < limit:
+                        seen_links.add(job["link"])
+                        batch.append(job)
+                offset += done
+                
+                if batch:
+                    total += len(batch)
+                    yield batch
+                
+                if total >= limit:
+                    break
+                
+                await self._load_more()
+                if not await self.wait_for_more_cards(card_count, page_timeout_ms):
+                    logger.info("No more LinkedIn results")
                     break
-                    
-                try:
-                    title_elem = await card.query_selector("h3, .base-search-card__title")
-                    company_elem = await card.query_selector("h4, .base-search-card__subtitle")
-                    loc_elem = await card.query_selector(".job-search-card__location, .base-search-card__metadata")
-                    link_elem = await card.query_selector("a")
-    
-                    if title_elem and link_elem:
-                        title = await title_elem.inner_text()
-                        company = await company_elem.inner_text() if company_elem else "Unknown"
-                        location = await loc_elem.inner_text() if loc_elem else "Unknown"
-                        link = await link_elem.get_attribute("href")
-                        
-                        if link:
-                            # Cleanup link
-                            link = link.split("?")[0].strip()
-                            
-                            jobs.append({
-                                "title": title.strip(),
-                                "company": company.strip(),
-                                "location": location.strip(),
-                                "link": link,
-                                "source": "linkedin"
-                            })
-                            count += 1
-                except Exception as e:
-                    logger.debug(f"Failed to parse job card: {e}")
-                    continue
-                    
-            logger.info(f"Successfully scraped {len(jobs)} jobs from LinkedIn")
-            return jobs
         except Exception as e:
             logger.error(f"Error during LinkedIn scraping: {e}")
-            return []
+        
+        logger.info(f"Successfully scraped {total} jobs from LinkedIn")
+
+    async def _load_more(self):
+        """Click "See more jobs" if it is shown, otherwise scroll to trigger infinite scroll."""
+        button = await self.page.query_selector("button.infinite-scroller__show-more-button")
+        if button and await button.is_visible():
+            await button.click()
+        else:
+            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+    @staticmethod
+    def _to_job(card: Dict[str, Optional[str]]) -> Optional[Dict]:
+        """Job dict from extracted card fields, or None if it is not a job card."""
+        if not card.get("title") or not card.get("link"):
+            return None
+
+        # Cleanup link
+        link = card["link"].split("?")[0].strip()
+        if not link:
+            return None
+
+        return {
+            "title": card["title"].strip(),
+            "company": card["company"].strip() if card.get("company") is not None else "Unknown",
+            "location": card["location"].strip() if card.get("location") is not None else "Unknown",
+            "link": link,
+            "source": "linkedin"
+        }
@@ -7,6 +7,7 @@ Permissions:
 from openai import OpenAI, AsyncOpenAI
 import logging
 from app.core.config import settings
+from app.core.llm_dispatch import DispatchedAsyncClient, llm_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +24,14 @@ class AIClient:
                     api_key=self.api_key,
                     base_url=self.base_url
                 )
-                self.async_client = AsyncOpenAI(
-                     api_key=self.api_key,
-                     base_url=self.base_url
+                # Retries (including 429 backoff) are handled by the dispatcher
+                self.async_client = DispatchedAsyncClient(
+                    AsyncOpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        max_retries=0
+                    ),
+                    llm_dispatcher
                 )
                 logger.info("AI Client (Groq) initialized successfully.")
             except Exception as e:
@@ -2,9 +2,13 @@
 Redis caching utilities for performance optimization.
 """
 import redis.asyncio as redis
+import base64
 import json
 import logging
-from typing import Optional, Any, Callable
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Any, Callable, Tuple
 from functools import wraps
 import hashlib
 
@@ -148,6 +152,120 @@ class Cache:
 cache = Cache()
 
 
+class LRUCache:
+    """Bounded in-process LRU cache with per-entry expiry."""
+    
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, expire: int = 300) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + expire, value)
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def compress_value(value: Any) -> str:
+    """Serialize a JSON-compatible value to a zlib-compressed, base64 string."""
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return base64.b64encode(zlib.compress(raw)).decode("ascii")
+
+
+def decompress_value(payload: str) -> Any:
+    """Inverse of ``compress_value``."""
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRU in front of the shared Redis cache.
+    
+    Reads hit the local tier first and fall back to Redis, back-filling the
+    local tier on a Redis hit. Writes and invalidations go to both tiers.
+    All keys are stored in Redis under ``<namespace>:<key>``. With
+    ``compress=True`` values are zlib-compressed before going to Redis; the
+    local tier always holds the plain value.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        expire: int = 300,
+        max_local_entries: int = 1024,
+        backend: Optional[Cache] = None,
+        compress: bool = False
+    ):
+        self.namespace = namespace
+        self.expire = expire
+        self.local = LRUCache(max_size=max_local_entries)
+        self.backend = backend or cache
+        self.compress = compress
+    
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from the local tier, then from Redis."""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        
+        value = await self.backend.get(self._redis_key(key))
+        if value is not None and self.compress:
+            try:
+                value = decompress_value(value)
+            except Exception as e:
+                logger.error(f"Cache decompress error for key {key}: {e}")
+                return None
+        if value is not None:
+            self.local.set(key, value, self.expire)
+        
+        return value
+    
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Set value in both tiers."""
+        ttl = expire or self.expire
+        self.local.set(key, value, ttl)
+        stored = compress_value(value) if self.compress else value
+        return await self.backend.set(self._redis_key(key), stored, ttl)
+    
+    async def delete(self, key: str) -> bool:
+        """Invalidate a single key in both tiers."""
+        self.local.delete(key)
+        return await self.backend.delete(self._redis_key(key))
+    
+    async def clear(self) -> int:
+        """Invalidate every key in this namespace."""
+        self.local.clear()
+        return await self.backend.clear_pattern(f"{self.namespace}:*")
+
+
 def cache_key(*args, **kwargs) -> str:
     """
     Generate cache key from function arguments.
@@ -2,7 +2,7 @@
 Application configuration with security settings.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -33,6 +33,9 @@ class Settings(BaseSettings):
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "job_automation"
 
+    # Cache - Redis
+    REDIS_URL: str = "redis://localhost:6379/0"
+
     # Feature Flags
     JOB_SCRAPING_ENABLED: bool = True
     FEATURE_AI_RESUME: bool = True
@@ -54,6 +57,93 @@ class Settings(BaseSettings):
     AI_MODEL_FAST: str = "llama3-70b-8192"
     AI_MODEL_SMART: str = "llama3-70b-8192"
     
+    # Outbound LLM dispatch budget (shared by every caller in the process)
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 30000
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_MAX_RETRIES: int = 3
+    LLM_EXPECTED_COMPLETION_TOKENS: int = 512  # budgeted per call until usage is known
+    
+    # Token usage / latency rollups
+    AI_USAGE_FLUSH_INTERVAL: float = 60.0  # seconds between rollup writes
+    
+    # Write-behind AgentLog sink
+    AGENT_LOG_QUEUE_SIZE: int = 10000
+    AGENT_LOG_BATCH_SIZE: int = 200
+    AGENT_LOG_FLUSH_INTERVAL: float = 2.0  # seconds
+    AGENT_LOG_OVERLOAD_THRESHOLD: float = 0.8  # queue fill ratio where sampling starts
+    AGENT_LOG_OVERLOAD_SAMPLE_RATE: float = 0.1  # fraction of logs kept while overloaded
+    AGENT_LOG_MAX_FIELD_CHARS: int = 0  # 0 keeps prompts/outputs in full; >0 truncates (or compresses) longer fields
+    AGENT_LOG_COMPRESS: bool = False  # compress long fields instead of truncating
+    
+    # Coalesce identical concurrent LLM calls (optionally across workers via Redis)
+    AI_SINGLEFLIGHT_DISTRIBUTED: bool = False
+    AI_SINGLEFLIGHT_LOCK_TTL: int = 60
+    AI_SINGLEFLIGHT_RESULT_TTL: int = 10
+    
+    # Opt-in LLM response cache (Redis + in-process L1), TTL in seconds per AIService method
+    AI_RESPONSE_CACHE_ENABLED: bool = False
+    AI_RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    AI_RESPONSE_CACHE_TTLS: Dict[str, int] = {
+        "parse_resume": 604800,  # 7 days
+        "generate_structured_resume": 86400,
+        "generate_structured_cover_letter": 86400,
+        "personalize_email": 3600,
+        "generate_resume_content": 86400,
+        "generate_cover_letter": 86400,
+    }
+    
+    # Matching engine analysis cache
+    ANALYSIS_CACHE_TTL: int = 86400  # 24 hours
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Batch resume/job matching
+    MATCH_BATCH_TOKEN_BUDGET: int = 6000  # approx. prompt tokens per batch call
+    MATCH_BATCH_JOB_CHARS: int = 1000  # description chars kept per job
+    MATCH_BATCH_MAX_JOBS: int = 10
+    MATCH_FALLBACK_CONCURRENCY: int = 4  # single-job matches run at once when a batch fails
+    
+    # Local embedding pre-filter (runs before LLM matching)
+    EMBEDDING_BACKEND: str = "hashing"  # "hashing" or "sentence-transformers"
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSIONS: int = 512
+    MATCH_PREFILTER_TOP_K: int = 5
+    MATCH_PREFILTER_MIN_SIMILARITY: float = 0.05
+    
+    # Approximate nearest-neighbour job search
+    VECTOR_INDEX_PATH: str = "data/vector_index.npz"
+    VECTOR_INDEX_LISTS: int = 256
+    VECTOR_INDEX_PROBES: int = 16
+    VECTOR_INDEX_SAVE_INTERVAL: int = 300  # seconds between snapshots
+    VECTOR_INDEX_EMBED_BATCH: int = 256  # jobs embedded and written per round trip on rebuild
+    
+    # Near-duplicate scraped jobs (MinHash LSH over title + company + description)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.35  # estimated Jaccard similarity of word 3-grams
+    NEAR_DUPLICATE_HIDE_THRESHOLD: float = 0.45  # flagged jobs this similar are hidden from listings and alerts
+    NEAR_DUPLICATE_NUM_PERM: int = 120
+    NEAR_DUPLICATE_BANDS: int = 40  # 3 rows per band (see scripts/benchmark_near_duplicates.py)
+    SCRAPED_JOB_RETENTION_DAYS: int = 0  # delete scraped jobs older than this daily; 0 keeps them
+    
+    # Shared Playwright browser for job scraping
+    BROWSER_POOL_MAX_CONTEXTS: int = 3  # concurrent scrapes
+    BROWSER_POOL_MAX_USES_PER_CONTEXT: int = 20  # scrapes before a context is recycled
+    
+    SCRAPER_EXTRACTION_MODE: str = "evaluate"  # "evaluate" (one round-trip) or "handles" (per field)
+    
+    # Abort scraper requests that are not needed for DOM text (Playwright resource types / URL globs)
+    SCRAPER_BLOCK_RESOURCES: bool = True
+    SCRAPER_BLOCKED_RESOURCE_TYPES: List[str] = ["image", "media", "font"]
+    SCRAPER_BLOCKED_URL_PATTERNS: List[str] = [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*facebook.net*",
+        "*px.ads.linkedin.com*",
+        "*linkedin.com/li/track*",
+        "*snap.licdn.com/li.lms-analytics*",
+    ]
+    
     # Telegram Settings
     TELEGRAM_ENABLED: bool = False
     TELEGRAM_BOT_TOKEN: Optional[str] = None
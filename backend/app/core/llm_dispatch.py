@@ -0,0 +1,336 @@
+"""
+Global dispatch layer for outbound LLM calls.
+
+Every chat completion goes through one ``LLMDispatcher`` that enforces the
+provider's requests/min and tokens/min budgets with token buckets, caps the
+number of concurrent calls, and serves waiting callers by priority class
+(interactive > automation > background). 429 responses pause dispatching
+for the duration given by ``Retry-After`` before the call is retried; the
+wrapped SDK client's own retries are disabled so they cannot bypass the
+budget.
+
+Callers set their priority with ``use_llm_priority``; HTTP requests default
+to ``LLMPriority.INTERACTIVE``.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+from openai import APIConnectionError, InternalServerError, RateLimitError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    AUTOMATION = 1
+    BACKGROUND = 2
+
+
+_current_priority: contextvars.ContextVar[LLMPriority] = contextvars.ContextVar(
+    "llm_priority", default=LLMPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def use_llm_priority(priority: LLMPriority):
+    """Run LLM calls made inside the block at ``priority``."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def estimate_request_tokens(kwargs: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion: ~4 chars per prompt token plus expected output."""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+    completion = kwargs.get("max_tokens") or settings.LLM_EXPECTED_COMPLETION_TOKENS
+    return prompt_chars // 4 + completion
+
+
+def retry_after_seconds(error: RateLimitError, default: float) -> float:
+    """Read the wait time from a 429's ``retry-after-ms`` / ``retry-after`` headers."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return default
+
+
+class TokenBucket:
+    """Refills ``rate_per_minute`` units per minute up to ``capacity``."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take units; the balance may go negative when correcting an estimate."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMDispatcher:
+    """Admission control shared by every outbound LLM call in the process."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int = 3
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+        self.rate_limited = 0
+        self._waits: Dict[LLMPriority, Dict[str, float]] = {
+            p: {"count": 0, "total_ms": 0.0, "max_ms": 0.0} for p in LLMPriority
+        }
+
+    @property
+    def _cond(self) -> asyncio.Condition:
+        """
+        Condition bound to the running event loop.
+
+        The dispatcher is a module-level singleton, but asyncio primitives
+        only work on one loop, so they are recreated (and the queue reset)
+        when the dispatcher is first used from a new loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._waiters = []
+            self._in_flight = 0
+        return self._condition
+
+    def _admission_delay(self, tokens: int) -> Optional[float]:
+        """Seconds the head of the queue must wait, or None if blocked on concurrency."""
+        if self._in_flight >= self.max_concurrency:
+            return None
+        return max(
+            self._paused_until - time.monotonic(),
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens),
+            0.0,
+        )
+
+    async def acquire(self, tokens: int, priority: LLMPriority) -> None:
+        """Wait for a dispatch slot. Pair with ``release``."""
+        entry = (int(priority), next(self._seq))
+        start = time.monotonic()
+
+        async with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self._admission_delay(tokens)
+                        if timeout == 0:
+                            break
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self._in_flight += 1
+            # Let the next waiter re-evaluate now that it is at the head
+            self._cond.notify_all()
+
+        waited_ms = (time.monotonic() - start) * 1000
+        stats = self._waits[priority]
+        stats["count"] += 1
+        stats["total_ms"] += waited_ms
+        stats["max_ms"] = max(stats["max_ms"], waited_ms)
+
+    async def release(self, estimated_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """Free the slot and correct the token budget with the reported usage."""
+        async with self._cond:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                difference = estimated_tokens - actual_tokens
+                if difference > 0:
+                    self.tokens.refund(difference)
+                else:
+                    self.tokens.consume(-difference)
+            self._cond.notify_all()
+
+    async def pause(self, seconds: float) -> None:
+        """Hold all dispatching for ``seconds`` (after a 429)."""
+        async with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics since process start."""
+        depth = {p.name.lower(): 0 for p in LLMPriority}
+        for priority, _ in self._waiters:
+            depth[LLMPriority(priority).name.lower()] += 1
+
+        waits = {}
+        for priority, stats in self._waits.items():
+            count = stats["count"]
+            waits[priority.name.lower()] = {
+                "count": count,
+                "avg_ms": round(stats["total_ms"] / count, 2) if count else 0.0,
+                "max_ms": round(stats["max_ms"], 2),
+            }
+
+        return {
+            "queue_depth": depth,
+            "in_flight": self._in_flight,
+            "wait_ms": waits,
+            "rate_limited": self.rate_limited,
+            "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "request_budget": round(self.requests.tokens, 2),
+            "token_budget": round(self.tokens.tokens, 2),
+        }
+
+
+class _DispatchedStream:
+    """Async stream proxy that holds the dispatch slot until the stream ends."""
+
+    def __init__(self, stream, dispatcher: LLMDispatcher, tokens: int):
+        self._stream = stream
+        self._dispatcher = dispatcher
+        self._tokens = tokens
+        self._released = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            chunk = await self._stream.__anext__()
+        except BaseException:
+            await self._release()
+            raise
+        return chunk
+
+    async def close(self) -> None:
+        try:
+            await self._stream.close()
+        finally:
+            await self._release()
+
+    async def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            await self._dispatcher.release(self._tokens)
+
+
+class _DispatchedCompletions:
+    def __init__(self, completions, dispatcher: LLMDispatcher):
+        self._completions = completions
+        self._dispatcher = dispatcher
+
+    async def create(self, **kwargs):
+        dispatcher = self._dispatcher
+        tokens = estimate_request_tokens(kwargs)
+        priority = _current_priority.get()
+
+        for attempt in range(dispatcher.max_retries + 1):
+            await dispatcher.acquire(tokens, priority)
+            try:
+                response = await self._completions.create(**kwargs)
+            except RateLimitError as e:
+                await dispatcher.release(tokens)
+                dispatcher.rate_limited += 1
+                if attempt >= dispatcher.max_retries:
+                    raise
+                delay = retry_after_seconds(e, default=2 ** attempt)
+                logger.warning(f"LLM rate limited, pausing dispatch for {delay:.1f}s")
+                await dispatcher.pause(delay)
+                continue
+            except (APIConnectionError, InternalServerError):
+                await dispatcher.release(tokens)
+                if attempt >= dispatcher.max_retries:
+                    raise
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+            except BaseException:
+                await dispatcher.release(tokens)
+                raise
+
+            if kwargs.get("stream"):
+                return _DispatchedStream(response, dispatcher, tokens)
+
+            usage = getattr(response, "usage", None)
+            await dispatcher.release(tokens, getattr(usage, "total_tokens", None))
+            return response
+
+
+class _DispatchedChat:
+    def __init__(self, chat, dispatcher: LLMDispatcher):
+        self.completions = _DispatchedCompletions(chat.completions, dispatcher)
+
+
+class DispatchedAsyncClient:
+    """Drop-in for ``AsyncOpenAI`` whose chat completions go through the dispatcher."""
+
+    def __init__(self, client, dispatcher: LLMDispatcher):
+        self._client = client
+        self.chat = _DispatchedChat(client.chat, dispatcher)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+llm_dispatcher = LLMDispatcher(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_retries=settings.LLM_MAX_RETRIES,
+)
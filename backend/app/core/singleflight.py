@@ -0,0 +1,146 @@
+"""
+Single-flight request coalescing.
+
+Concurrent calls with the same key share one execution of the underlying
+coroutine instead of each hitting the upstream service. Within a worker
+this uses a shared asyncio task; across workers it optionally uses a Redis
+lock plus a short-lived result key.
+"""
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicate identical in-flight async calls.
+
+    In distributed mode results are handed to other workers through Redis,
+    so the coalesced coroutine must return a string.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        distributed: bool = False,
+        lock_ttl: int = 60,
+        result_ttl: int = 10,
+        poll_interval: float = 0.1
+    ):
+        """
+        Args:
+            namespace: Redis key prefix for cross-worker coordination
+            distributed: Also coalesce across workers via Redis
+            lock_ttl: Seconds before a leader's Redis lock expires
+            result_ttl: Seconds a shared result stays readable in Redis
+            poll_interval: Seconds between checks while waiting on another worker
+        """
+        self.namespace = namespace
+        self.distributed = distributed
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters since process start."""
+        return {
+            "hits": self.hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "in_flight": len(self._inflight),
+        }
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func`` once for all concurrent callers using ``key``.
+
+        The shared call runs in its own task, so cancelling one waiter does
+        not cancel it for the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._run(key, func))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.distributed:
+            self.misses += 1
+            return await func()
+
+        try:
+            client = await get_redis_client()
+        except Exception as e:
+            logger.warning(f"Single-flight Redis unavailable, running locally: {e}")
+            self.misses += 1
+            return await func()
+
+        return await self._run_distributed(client, key, func)
+
+    async def _run_distributed(self, client, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"{self.namespace}:lock:{key}"
+        result_key = f"{self.namespace}:result:{key}"
+        token = uuid.uuid4().hex
+        waited = False
+
+        while True:
+            try:
+                if await client.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                    if not waited:
+                        break
+                    # The leader we waited on publishes before releasing the lock
+                    result = await client.get(result_key)
+                    if result is None:
+                        break
+                    await self._release(client, lock_key, token)
+                    self.remote_hits += 1
+                    return result
+
+                waited = True
+                result = await client.get(result_key)
+                if result is not None:
+                    self.remote_hits += 1
+                    return result
+
+                if not await client.exists(lock_key):
+                    # Leader finished (or died) without a readable result: retry the lock
+                    continue
+            except Exception as e:
+                logger.warning(f"Single-flight Redis error, running locally: {e}")
+                self.misses += 1
+                return await func()
+
+            await asyncio.sleep(self.poll_interval)
+
+        self.misses += 1
+        try:
+            result = await func()
+            try:
+                await client.set(result_key, result, ex=self.result_ttl)
+            except Exception as e:
+                logger.warning(f"Failed to publish single-flight result {result_key}: {e}")
+            return result
+        finally:
+            await self._release(client, lock_key, token)
+
+    async def _release(self, client, lock_key: str, token: str) -> None:
+        try:
+            # Only release the lock if it is still ours
+            if await client.get(lock_key) == token:
+                await client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Failed to release single-flight lock {lock_key}: {e}")
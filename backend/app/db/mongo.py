@@ -13,9 +13,42 @@ from app.models.job import Job, ScrapedJob
 from app.models.match import Match
 from app.models.automation import AutomationRun
 from app.models.log import AgentLog, Log
+from app.models.ai_usage import AIUsageRollup
 
 logger = get_logger(__name__)
 
+def get_collection(document_model):
+    """Raw driver collection of a Beanie document (for bulk writes)."""
+    # Beanie 2.x renamed get_motor_collection to get_pymongo_collection
+    getter = getattr(document_model, "get_pymongo_collection", None) or document_model.get_motor_collection
+    return getter()
+
+async def migrate_scraped_job_link_index(database):
+    """
+    Replace the old non-unique ``link`` index on scraped_jobs with a unique one.
+
+    Duplicate postings are removed first (the oldest copy is kept), then the
+    old index is dropped so Beanie can create the unique index.
+    """
+    collection = database["scraped_jobs"]
+    indexes = await collection.index_information()
+    link_index = indexes.get("link_1")
+    if not link_index or link_index.get("unique"):
+        return
+
+    duplicates = collection.aggregate([
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": "$link", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+    removed = 0
+    async for group in duplicates:
+        result = await collection.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+
+    await collection.drop_index("link_1")
+    logger.info(f"Migrated scraped_jobs link index to unique ({removed} duplicates removed)")
+
 async def init_db():
     """Initialize MongoDB connection and Beanie ODM."""
     try:
@@ -25,6 +58,7 @@ async def init_db():
             connectTimeoutMS=20000,
         )
         database = client[settings.MONGODB_DB_NAME]
+        await migrate_scraped_job_link_index(database)
         
         document_models = [
             User, 
@@ -35,7 +69,8 @@ async def init_db():
             Match, 
             AutomationRun, 
             AgentLog,
-            Log
+            Log,
+            AIUsageRollup
         ]
         
         await init_beanie(database=database, document_models=document_models)
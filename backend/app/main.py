@@ -38,6 +38,7 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager with health checks."""
     # Startup
     logger.info("Starting application...")
+    background_tasks = []
     
     try:
         # Initialize Database (MongoDB)
@@ -47,6 +48,30 @@ async def lifespan(app: FastAPI):
         # Start scheduler
         start_scheduler()
         
+        # Start the background AgentLog writer
+        from app.services.log_sink import agent_log_sink
+        agent_log_sink.start()
+        
+        # Start the periodic AI usage rollup writer
+        from app.services.ai_usage import ai_usage_recorder
+        ai_usage_recorder.start()
+        
+        # Launch the shared scraping browser; scrapes retry the launch lazily if this fails
+        if settings.JOB_SCRAPING_ENABLED:
+            from app.automation.browser import browser_pool
+            try:
+                await browser_pool.start()
+            except Exception as e:
+                logger.error(f"Failed to launch scraping browser: {e}")
+        
+        # Load (or build) the job vector index without blocking startup
+        from app.services.vector_index import vector_index_service
+        background_tasks.append(asyncio.create_task(vector_index_service.start()))
+        
+        # Rebuild the near-duplicate index of scraped jobs without blocking startup
+        from app.services.near_duplicates import near_duplicate_service
+        background_tasks.append(asyncio.create_task(near_duplicate_service.start()))
+        
         # Start scheduler health check
         # asyncio.create_task(health_check_scheduler())
         
@@ -63,6 +88,24 @@ async def lifespan(app: FastAPI):
     
     try:
         shutdown_scheduler()
+        
+        # Stop index builds still running before flushing the indexes
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        
+        from app.services.vector_index import vector_index_service
+        await vector_index_service.stop()
+        
+        from app.automation.browser import browser_pool
+        await browser_pool.stop()
+        
+        # Persist in-memory AI usage and queued AgentLogs before the database connection goes away
+        from app.services.ai_usage import ai_usage_recorder
+        await ai_usage_recorder.stop()
+        
+        from app.services.log_sink import agent_log_sink
+        await agent_log_sink.stop()
         logger.info("Application shut down successfully")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}", exc_info=True)
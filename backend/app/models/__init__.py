@@ -5,4 +5,5 @@ from app.models.job import Job
 from app.models.match import Match
 from app.models.automation import AutomationRun
 from app.models.log import AgentLog
+from app.models.ai_usage import AIUsageRollup
 from app.models.enums import UserRole, JobStatus
@@ -0,0 +1,31 @@
+from typing import Dict, Optional
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+import pymongo
+
+class AIUsageRollup(Document):
+    """Per-minute LLM usage totals for one (method, user, model)."""
+    minute: datetime
+    method: str
+    user_id: Optional[str] = None
+    model: str
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms_total: float = 0.0
+    # Call counts keyed by latency bucket upper bound in ms (see ai_usage.LATENCY_BUCKETS_MS)
+    latency_buckets: Dict[str, int] = Field(default_factory=dict)
+
+    class Settings:
+        name = "ai_usage_rollups"
+        indexes = [
+            "minute",
+            "method",
+            "user_id",
+            pymongo.IndexModel(
+                [("minute", 1), ("method", 1), ("user_id", 1), ("model", 1)],
+                unique=True
+            )
+        ]
@@ -2,6 +2,7 @@ from typing import Optional, List
 from datetime import datetime
 from beanie import Document, Indexed, Link, PydanticObjectId
 from pydantic import Field, ConfigDict
+import pymongo
 from app.models.enums import JobStatus
 # from app.models.user import User
 # from app.models.team import Team
@@ -18,6 +19,11 @@ class Job(Document):
     status: JobStatus = JobStatus.PENDING
     skills_required: List[str] = []
     
+    # Local embedding used to pre-filter jobs before LLM matching
+    embedding_vector: List[float] = []
+    embedding_model: Optional[str] = None
+    embedding_hash: Optional[str] = None  # Hash of the text embedding_vector was built from
+    
     # Relationships (ObjectIds as strings)
     team_id: PydanticObjectId
     user_id: PydanticObjectId
@@ -64,10 +70,20 @@ class ScrapedJob(Document):
     posted_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # Local embedding indexed by the vector search service
+    embedding_vector: List[float] = []
+    embedding_model: Optional[str] = None
+    
+    # Canonical posting this one near-duplicates (e.g. the same role on another job board)
+    duplicate_of: Optional[PydanticObjectId] = None
+    duplicate_score: Optional[float] = None
+    
     class Settings:
         name = "scraped_jobs"
         indexes = [
-            "link",
+            # Unique so concurrent scrapes cannot insert the same posting twice
+            pymongo.IndexModel([("link", 1)], unique=True),
             "title",
-            "company"
+            "company",
+            "duplicate_of"
         ]
@@ -13,6 +13,8 @@ class Resume(Document):
     
     parsed_data: Dict[str, Any] = {}
     embedding_vector: List[float] = []
+    embedding_model: Optional[str] = None  # Embedder that produced embedding_vector
+    embedding_hash: Optional[str] = None  # Hash of the text embedding_vector was built from
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
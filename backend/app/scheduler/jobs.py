@@ -8,7 +8,8 @@ from app.core.features import features
 from app.scheduler.job_wrapper import with_execution_lock
 from app.services.job_scraper import job_scraper_service
 from app.services.bot import run_job_automation
-from app.models.job import Job, JobStatus
+from app.models.job import Job, JobStatus, ScrapedJob
+from app.db.mongo import get_collection
 from app.models.log import Log
 from app.notifications.telegram import telegram_service
 
@@ -90,6 +91,31 @@ async def cleanup_old_logs_task():
     except Exception as e:
         logger.error(f"Log cleanup failed: {e}", exc_info=True)
 
+@with_execution_lock("cleanup_scraped_jobs", timeout_seconds=600)
+async def cleanup_old_scraped_jobs_task():
+    """Delete scraped jobs older than SCRAPED_JOB_RETENTION_DAYS (0 keeps them)."""
+    if settings.SCRAPED_JOB_RETENTION_DAYS <= 0:
+        return
+
+    try:
+        logger.info("Starting scraped job cleanup...")
+        
+        cutoff_date = datetime.utcnow() - timedelta(days=settings.SCRAPED_JOB_RETENTION_DAYS)
+        collection = get_collection(ScrapedJob)
+        
+        deleted = 0
+        while True:
+            cursor = collection.find({"created_at": {"$lt": cutoff_date}}, {"_id": 1}).limit(1000)
+            job_ids = [doc["_id"] async for doc in cursor]
+            if not job_ids:
+                break
+            deleted += await job_scraper_service.delete_jobs(job_ids)
+        
+        logger.info(f"Deleted {deleted} old scraped jobs")
+            
+    except Exception as e:
+        logger.error(f"Scraped job cleanup failed: {e}", exc_info=True)
+
 async def run_job_automation_task():
     """
     Wrapper for job automation with error handling.
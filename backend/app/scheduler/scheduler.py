@@ -2,7 +2,13 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from app.core.config import settings
-from .jobs import scrape_jobs_task, check_follow_ups_task, cleanup_old_logs_task, run_job_automation_task
+from .jobs import (
+    scrape_jobs_task,
+    check_follow_ups_task,
+    cleanup_old_logs_task,
+    cleanup_old_scraped_jobs_task,
+    run_job_automation_task,
+)
 import pytz
 import logging
 import threading
@@ -68,6 +74,15 @@ class SchedulerManager:
             replace_existing=True,
             name="Cleanup Logs (Daily 2 AM)"
         )
+        
+        # 5. Scraped Job Cleanup (Daily at 3 AM, if SCRAPED_JOB_RETENTION_DAYS is set)
+        self.scheduler.add_job(
+            cleanup_old_scraped_jobs_task,
+            trigger=CronTrigger(hour=3, minute=0, timezone=self.timezone),
+            id="cleanup_scraped_jobs",
+            replace_existing=True,
+            name="Cleanup Scraped Jobs (Daily 3 AM)"
+        )
 
         self.scheduler.start()
         logger.info(f"Scheduler started with timezone {self.timezone}")
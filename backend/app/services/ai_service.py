@@ -1,80 +1,316 @@
 import logging
 import json
-from typing import Optional, Any
+import hashlib
+from typing import Optional, Any, AsyncIterator
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from app.core.ai import ai_client
+from app.core.cache import TieredCache
 from app.core.config import settings
+from app.core.singleflight import SingleFlight
 from app.models.log import AgentLog
+from app.services.ai_usage import ai_usage_recorder, track_ai_usage
+from app.services.log_sink import agent_log_sink
 import time
 
 logger = logging.getLogger(__name__)
 
+# Only malformed model output is retried here. 429s and transport errors are
+# already retried by the LLM dispatcher, and a missing client never recovers.
+retry_malformed_json = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_exception_type(json.JSONDecodeError),
+    reraise=True
+)
+
+
+def singleflight_key(model: str, prompt: str, json_mode: bool, temperature: float) -> str:
+    """Key identifying an LLM request for in-flight deduplication."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{model}:{prompt_hash}:{int(json_mode)}:{temperature}"
+
+
+def response_cache_key(method: str, model: str, prompt: str) -> str:
+    """Key for a cached LLM response; insensitive to prompt whitespace/indentation."""
+    normalized = " ".join(prompt.split())
+    prompt_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return f"{method}:{model}:{prompt_hash}"
+
+
+def stream_chunk_usage(chunk) -> Optional[dict]:
+    """Token usage reported on a streamed chunk (OpenAI ``usage`` or Groq ``x_groq.usage``)."""
+    usage = getattr(chunk, "usage", None)
+    if usage is None:
+        x_groq = getattr(chunk, "x_groq", None) or {}
+        usage = x_groq.get("usage") if isinstance(x_groq, dict) else getattr(x_groq, "usage", None)
+    if usage is None:
+        return None
+    if not isinstance(usage, dict):
+        usage = {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+    return {"prompt_tokens": usage.get("prompt_tokens", 0), "completion_tokens": usage.get("completion_tokens", 0)}
+
+
+class AIUnavailableError(Exception):
+    """Raised when no LLM client is configured."""
+
+
 class AIService:
     def __init__(self):
         self.client = ai_client.get_client()
+        self._inflight = SingleFlight(
+            namespace="ai:singleflight",
+            distributed=settings.AI_SINGLEFLIGHT_DISTRIBUTED,
+            lock_ttl=settings.AI_SINGLEFLIGHT_LOCK_TTL,
+            result_ttl=settings.AI_SINGLEFLIGHT_RESULT_TTL,
+        )
+        self._response_cache = TieredCache(
+            namespace="ai:response",
+            max_local_entries=settings.AI_RESPONSE_CACHE_MAX_ENTRIES,
+            compress=True,
+        )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((json.JSONDecodeError, Exception)),
-        reraise=True
-    )
+    @retry_malformed_json
     async def _generate_json(self, prompt: str, model: str) -> dict:
         """
         Helper to generate and validate JSON response.
-        Retries on JSON errors or API failures.
+        Retries when the model returns invalid JSON.
         """
         response_text = await self.generate_text(prompt, model=model, json_mode=True)
         # Validate and parse JSON
         return json.loads(response_text)
 
-    async def generate_text(self, prompt: str, model: str = None, json_mode: bool = False) -> str:
+    async def generate_text(
+        self,
+        prompt: str,
+        model: str = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> str:
         """
         Generates text using Groq (via OpenAI SDK) asynchronously.
+        Concurrent identical requests share a single upstream call.
+        Falls back to a mock response if the API is unavailable.
         """
+        try:
+            return await self._complete(prompt, model, json_mode, temperature)
+        except AIUnavailableError:
+            return self._mock_response(prompt, json_mode=json_mode)
+        except Exception as e:
+            logger.error(f"AI API error: {e}")
+            return self._mock_response(prompt, json_mode=json_mode)
+
+    async def _complete(
+        self,
+        prompt: str,
+        model: str = None,
+        json_mode: bool = False,
+        temperature: float = 0.7
+    ) -> str:
+        """Like generate_text, but raises instead of returning a mock response."""
         client = ai_client.get_async_client()
         if not client:
-            return self._mock_response(prompt, json_mode=json_mode)
+            raise AIUnavailableError("AI client is not configured")
             
+        # use fast model by default if not specified
+        model_to_use = model or settings.AI_MODEL_FAST
+        key = singleflight_key(model_to_use, prompt, json_mode, temperature)
+        
+        return await self._inflight.do(
+            key,
+            lambda: self._call_model(client, prompt, model_to_use, json_mode, temperature)
+        )
+
+    async def _call_model(
+        self,
+        client,
+        prompt: str,
+        model: str,
+        json_mode: bool,
+        temperature: float
+    ) -> str:
+        """Perform one chat completion request and log it."""
+        kwargs = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+        }
+        
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        
+        start_time = time.time()
+        response = await client.chat.completions.create(**kwargs)
+        duration = (time.time() - start_time) * 1000
+        
+        content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        ai_usage_recorder.record(
+            model,
+            getattr(usage, "prompt_tokens", 0),
+            getattr(usage, "completion_tokens", 0),
+            duration,
+        )
+        self._log_call(prompt, model, json_mode, content, duration)
+        return content
+
+    def _log_call(
+        self,
+        prompt: str,
+        model: str,
+        json_mode: bool,
+        content: str,
+        duration: float,
+        **extra: Any
+    ) -> None:
+        """Queue a completed model call for the AgentLog sink."""
         try:
-            # use fast model by default if not specified
-            model_to_use = model or settings.AI_MODEL_FAST
-            
-            kwargs = {
-                "model": model_to_use,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7,
-            }
-            
-            if json_mode:
-                kwargs["response_format"] = {"type": "json_object"}
-            
-            start_time = time.time()
-            response = await client.chat.completions.create(**kwargs)
-            duration = (time.time() - start_time) * 1000
-            
-            content = response.choices[0].message.content or ""
-            
-            # Log to AgentLog
-            try:
-                await AgentLog(
-                    agent_name="AIService",
-                    input={"prompt": prompt, "model": model_to_use, "json_mode": json_mode},
-                    output={"content": content},
-                    execution_time_ms=duration,
-                    # user_id should be passed if available, but for now we log globally
-                ).insert()
-            except Exception as log_err:
-                logger.error(f"Failed to log AI call: {log_err}")
-                
-            return content
+            agent_log_sink.submit(AgentLog(
+                agent_name="AIService",
+                input={"prompt": prompt, "model": model, "json_mode": json_mode},
+                output={"content": content, **extra},
+                execution_time_ms=duration,
+                # user_id should be passed if available, but for now we log globally
+            ))
+        except Exception as log_err:
+            logger.error(f"Failed to log AI call: {log_err}")
+
+    async def stream_text(
+        self,
+        prompt: str,
+        model: str = None,
+        method: Optional[str] = None,
+        bypass_cache: bool = False,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Yield completion text as it is generated.
+
+        The assembled text is logged once the stream ends (flagged
+        ``cancelled`` if the consumer stopped early) and, for a cacheable
+        ``method``, stored in the response cache. A cache hit is yielded as a
+        single chunk. Closing the generator closes the upstream stream.
+        """
+        model_to_use = model or settings.AI_MODEL_FAST
+        ttl = settings.AI_RESPONSE_CACHE_TTLS.get(method) if settings.AI_RESPONSE_CACHE_ENABLED else None
+        key = response_cache_key(method, model_to_use, prompt) if ttl else None
+        if key and not bypass_cache:
+            cached = await self._response_cache.get(key)
+            if cached is not None:
+                ai_usage_recorder.record_cache_hit(model_to_use, method)
+                yield cached
+                return
+
+        client = ai_client.get_async_client()
+        if not client:
+            yield self._mock_response(prompt)
+            return
+
+        start_time = time.time()
+        try:
+            stream = await client.chat.completions.create(
+                model=model_to_use,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                stream=True,
+            )
         except Exception as e:
             logger.error(f"AI API error: {e}")
-            return self._mock_response(prompt, json_mode=json_mode)
+            yield self._mock_response(prompt)
+            return
+
+        chunks = []
+        usage = None
+        completed = False
+        try:
+            async for chunk in stream:
+                usage = stream_chunk_usage(chunk) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+            completed = True
+        finally:
+            await stream.close()
+            duration = (time.time() - start_time) * 1000
+            content = "".join(chunks)
+            if usage is None:
+                # Provider sent no usage (e.g. cancelled stream): estimate ~4 chars/token
+                usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+            ai_usage_recorder.record(
+                model_to_use, usage["prompt_tokens"], usage["completion_tokens"], duration, method
+            )
+            self._log_call(
+                prompt, model_to_use, False, content, duration,
+                stream=True, cancelled=not completed
+            )
 
+        if key:
+            await self._response_cache.set(key, content, ttl)
 
+    @retry_malformed_json
+    async def _complete_json(self, prompt: str, model: str) -> dict:
+        """Generate and parse a JSON response, raising on failure."""
+        return json.loads(await self._complete(prompt, model=model, json_mode=True))
+
+    async def _cached_generate(
+        self,
+        method: str,
+        prompt: str,
+        model: str = None,
+        json_mode: bool = False,
+        bypass_cache: bool = False
+    ) -> Any:
+        """
+        Serve ``method``'s response from the response cache when enabled.
+
+        Cache hits never reach the model, so they are not logged to AgentLog.
+        ``bypass_cache`` forces a fresh generation (the "regenerate" action)
+        and overwrites the cached entry. Mock fallbacks are never cached.
+        """
+        ttl = settings.AI_RESPONSE_CACHE_TTLS.get(method)
+        if not settings.AI_RESPONSE_CACHE_ENABLED or not ttl:
+            with track_ai_usage(method=method):
+                if json_mode:
+                    return await self._generate_json(prompt, model=model)
+                return await self.generate_text(prompt, model=model)
 
-    async def generate_structured_resume(self, job_description: str) -> dict:
+        model_to_use = model or settings.AI_MODEL_FAST
+        key = response_cache_key(method, model_to_use, prompt)
+        if not bypass_cache:
+            cached = await self._response_cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI response cache hit for {method}")
+                ai_usage_recorder.record_cache_hit(model_to_use, method)
+                return cached
+
+        try:
+            with track_ai_usage(method=method):
+                if json_mode:
+                    result = await self._complete_json(prompt, model_to_use)
+                else:
+                    result = await self._complete(prompt, model_to_use)
+        except Exception as e:
+            if not isinstance(e, AIUnavailableError):
+                logger.error(f"AI API error: {e}")
+            mock = self._mock_response(prompt, json_mode=json_mode)
+            return json.loads(mock) if json_mode else mock
+
+        await self._response_cache.set(key, result, ttl)
+        return result
+
+    async def clear_response_cache(self) -> int:
+        """Drop every cached LLM response."""
+        return await self._response_cache.clear()
+
+    def inflight_stats(self) -> dict:
+        """Single-flight hit/miss counters for generate_text."""
+        return self._inflight.stats()
+
+
+
+    async def generate_structured_resume(self, job_description: str, bypass_cache: bool = False) -> dict:
         prompt = f"""
         You are an AI job automation assistant. Your goal is to rewrite and optimize resume content to match the provided job description.
         
@@ -99,17 +335,32 @@ class AIService:
             ]
         }}
         """
-        return await self._generate_json(prompt, model=settings.AI_MODEL_FAST)
+        return await self._cached_generate(
+            "generate_structured_resume", prompt, settings.AI_MODEL_FAST,
+            json_mode=True, bypass_cache=bypass_cache
+        )
 
-    async def generate_resume_content(self, job_description: str) -> str:
-        prompt = f"""
+    def _resume_content_prompt(self, job_description: str) -> str:
+        return f"""
         You are an AI job automation assistant. Your goal is to rewrite and optimize resume bullet points to match the provided job description.
         Output only the optimized resume content.
         
         Job Description:
         {job_description[:2000]}...
         """
-        return await self.generate_text(prompt, model=settings.AI_MODEL_FAST)
+
+    async def generate_resume_content(self, job_description: str, bypass_cache: bool = False) -> str:
+        return await self._cached_generate(
+            "generate_resume_content", self._resume_content_prompt(job_description),
+            settings.AI_MODEL_FAST, bypass_cache=bypass_cache
+        )
+
+    def stream_resume_content(self, job_description: str, bypass_cache: bool = False) -> AsyncIterator[str]:
+        """Streaming variant of generate_resume_content."""
+        return self.stream_text(
+            self._resume_content_prompt(job_description), settings.AI_MODEL_FAST,
+            method="generate_resume_content", bypass_cache=bypass_cache
+        )
 
     async def generate_resume_bullets(self, bullet: str, job_description: str) -> str:
         prompt = f"""
@@ -123,9 +374,16 @@ class AIService:
         
         Optimized Bullet:
         """
-        return await self.generate_text(prompt)
+        with track_ai_usage(method="generate_resume_bullets"):
+            return await self.generate_text(prompt)
 
-    async def generate_structured_cover_letter(self, resume_summary: str, job_description: str, company_name: str) -> dict:
+    async def generate_structured_cover_letter(
+        self,
+        resume_summary: str,
+        job_description: str,
+        company_name: str,
+        bypass_cache: bool = False
+    ) -> dict:
         prompt = f"""
         Write a professional cover letter for {company_name}.
         
@@ -143,10 +401,13 @@ class AIService:
             "tone": "professional"
         }}
         """
-        return await self._generate_json(prompt, model=settings.AI_MODEL_SMART)
+        return await self._cached_generate(
+            "generate_structured_cover_letter", prompt, settings.AI_MODEL_SMART,
+            json_mode=True, bypass_cache=bypass_cache
+        )
 
-    async def generate_cover_letter(self, resume_summary: str, job_description: str, company_name: str) -> str:
-        prompt = f"""
+    def _cover_letter_prompt(self, resume_summary: str, job_description: str, company_name: str) -> str:
+        return f"""
         Write a professional cover letter for {company_name}.
         
         Job Description:
@@ -157,9 +418,40 @@ class AIService:
         
         Cover Letter:
         """
-        return await self.generate_text(prompt, model=settings.AI_MODEL_SMART)
 
-    async def personalize_email(self, template: str, company_name: str, role: str) -> str:
+    async def generate_cover_letter(
+        self,
+        resume_summary: str,
+        job_description: str,
+        company_name: str,
+        bypass_cache: bool = False
+    ) -> str:
+        return await self._cached_generate(
+            "generate_cover_letter",
+            self._cover_letter_prompt(resume_summary, job_description, company_name),
+            settings.AI_MODEL_SMART, bypass_cache=bypass_cache
+        )
+
+    def stream_cover_letter(
+        self,
+        resume_summary: str,
+        job_description: str,
+        company_name: str,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """Streaming variant of generate_cover_letter."""
+        return self.stream_text(
+            self._cover_letter_prompt(resume_summary, job_description, company_name),
+            settings.AI_MODEL_SMART, method="generate_cover_letter", bypass_cache=bypass_cache
+        )
+
+    async def personalize_email(
+        self,
+        template: str,
+        company_name: str,
+        role: str,
+        bypass_cache: bool = False
+    ) -> str:
         prompt = f"""
         Personalize the following email template for {company_name} hiring a {role}.
         Keep it professional and concise.
@@ -169,11 +461,12 @@ class AIService:
         
         Personalized Email:
         """
-        return await self.generate_text(prompt)
+        return await self._cached_generate("personalize_email", prompt, bypass_cache=bypass_cache)
 
-    async def parse_resume(self, resume_text: str) -> dict:
+    async def parse_resume(self, resume_text: str, bypass_cache: bool = False) -> dict:
         """
         Parse raw resume text into structured JSON.
+        Re-uploads of the same resume are served from the response cache when enabled.
         """
         prompt = f"""
         You are an expert HR data parser. Extract structured information from the following resume text.
@@ -208,7 +501,10 @@ class AIService:
             ]
         }}
         """
-        return await self._generate_json(prompt, model=settings.AI_MODEL_FAST)
+        return await self._cached_generate(
+            "parse_resume", prompt, settings.AI_MODEL_FAST,
+            json_mode=True, bypass_cache=bypass_cache
+        )
 
     def _mock_response(self, prompt: str, json_mode: bool = False) -> str:
         """Fallback mock response."""
@@ -0,0 +1,240 @@
+"""
+Token-usage and latency accounting for LLM calls.
+
+Each call is attributed to a method (``parse_resume``, ``matching.analyze_job``,
+...) and a user via context variables, then added to an in-memory per-minute
+rollup. A background task upserts finished minutes into the
+``ai_usage_rollups`` collection, so the database sees one write per
+(minute, method, user, model) instead of one per call.
+
+Latency is kept as a histogram with fixed buckets so rollups can be merged
+and percentiles computed over any time range.
+"""
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.mongo import get_collection
+from app.models.ai_usage import AIUsageRollup
+
+logger = get_logger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open-ended
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+OVERFLOW_BUCKET = "inf"
+
+_usage_method: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("ai_usage_method", default=None)
+_usage_user: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("ai_usage_user", default=None)
+
+RollupKey = Tuple[datetime, str, Optional[str], str]
+
+
+@contextmanager
+def track_ai_usage(method: Optional[str] = None, user_id: Optional[str] = None):
+    """Attribute LLM calls made inside the block to ``method`` and/or ``user_id``."""
+    tokens = []
+    if method is not None:
+        tokens.append((_usage_method, _usage_method.set(method)))
+    if user_id is not None:
+        tokens.append((_usage_user, _usage_user.set(str(user_id))))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+def set_usage_user(user_id: Optional[str]) -> None:
+    """Attribute the rest of the current task's LLM calls to ``user_id``."""
+    _usage_user.set(str(user_id) if user_id is not None else None)
+
+
+def latency_bucket(latency_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if latency_ms <= bound:
+            return str(bound)
+    return OVERFLOW_BUCKET
+
+
+def histogram_percentile(buckets: Dict[str, int], percentile: float) -> Optional[float]:
+    """
+    Upper bound (ms) of the bucket containing ``percentile``; None if empty.
+
+    Latencies beyond the last bucket report that bucket's bound.
+    """
+    total = sum(buckets.values())
+    if not total:
+        return None
+
+    threshold = total * percentile / 100
+    seen = 0
+    for bound in LATENCY_BUCKETS_MS:
+        seen += buckets.get(str(bound), 0)
+        if seen >= threshold:
+            return float(bound)
+    return float(LATENCY_BUCKETS_MS[-1])
+
+
+def _empty_rollup() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "latency_ms_total": 0.0,
+        "latency_buckets": {},
+    }
+
+
+def _merge(target: Dict[str, Any], rollup: Dict[str, Any]) -> None:
+    for field in ("calls", "cache_hits", "prompt_tokens", "completion_tokens", "latency_ms_total"):
+        target[field] += rollup.get(field, 0)
+    for bucket, count in (rollup.get("latency_buckets") or {}).items():
+        target["latency_buckets"][bucket] = target["latency_buckets"].get(bucket, 0) + count
+
+
+class AIUsageRecorder:
+    """Aggregates LLM usage in memory and periodically persists per-minute rollups."""
+
+    def __init__(self, flush_interval: float = 60.0):
+        self.flush_interval = flush_interval
+        self._rollups: Dict[RollupKey, Dict[str, Any]] = {}
+        self._worker: Optional[asyncio.Task] = None
+
+    def _rollup(self, model: str, method: Optional[str] = None) -> Dict[str, Any]:
+        minute = datetime.utcnow().replace(second=0, microsecond=0)
+        key = (minute, method or _usage_method.get() or "other", _usage_user.get(), model)
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            rollup = self._rollups[key] = _empty_rollup()
+        return rollup
+
+    def record(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: float,
+        method: Optional[str] = None
+    ) -> None:
+        """Account one completed model call to ``method`` (default: the current one) and user."""
+        rollup = self._rollup(model, method)
+        rollup["calls"] += 1
+        rollup["prompt_tokens"] += prompt_tokens or 0
+        rollup["completion_tokens"] += completion_tokens or 0
+        rollup["latency_ms_total"] += latency_ms
+        bucket = latency_bucket(latency_ms)
+        rollup["latency_buckets"][bucket] = rollup["latency_buckets"].get(bucket, 0) + 1
+
+    def record_cache_hit(self, model: str, method: Optional[str] = None) -> None:
+        """Account a response served from cache (no tokens spent)."""
+        self._rollup(model, method)["cache_hits"] += 1
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and persist everything, including the current minute."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        await self.flush(include_current=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self, include_current: bool = False) -> int:
+        """Upsert finished minutes into MongoDB. Returns the number of rollups written."""
+        current_minute = datetime.utcnow().replace(second=0, microsecond=0)
+        keys = [key for key in self._rollups if include_current or key[0] < current_minute]
+        if not keys:
+            return 0
+
+        pending = {key: self._rollups.pop(key) for key in keys}
+        operations = []
+        for (minute, method, user_id, model), rollup in pending.items():
+            increments = {
+                field: rollup[field]
+                for field in ("calls", "cache_hits", "prompt_tokens", "completion_tokens", "latency_ms_total")
+            }
+            increments.update({
+                f"latency_buckets.{bucket}": count
+                for bucket, count in rollup["latency_buckets"].items()
+            })
+            operations.append(UpdateOne(
+                {"minute": minute, "method": method, "user_id": user_id, "model": model},
+                {"$inc": increments},
+                upsert=True,
+            ))
+
+        try:
+            await get_collection(AIUsageRollup).bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to write {len(operations)} AI usage rollups: {e}")
+            # Keep the data in memory so the next flush retries it
+            for key, rollup in pending.items():
+                _merge(self._rollups.setdefault(key, _empty_rollup()), rollup)
+            return 0
+        return len(operations)
+
+    async def report(self, group_by: str, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Usage totals and latency percentiles grouped by ``method``, ``user`` or ``day``.
+
+        Includes rollups not yet written to MongoDB.
+        """
+        since = (datetime.utcnow() - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        stored = await AIUsageRollup.find({"minute": {"$gte": since}}).to_list()
+
+        rows = [((doc.minute, doc.method, doc.user_id, doc.model), doc.model_dump()) for doc in stored]
+        rows += [(key, rollup) for key, rollup in self._rollups.items() if key[0] >= since]
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for (minute, method, user_id, _), rollup in rows:
+            if group_by == "method":
+                group = method
+            elif group_by == "user":
+                group = user_id or "system"
+            else:
+                group = minute.date().isoformat()
+            _merge(groups.setdefault(group, _empty_rollup()), rollup)
+
+        report = []
+        for group, totals in groups.items():
+            calls = totals["calls"]
+            report.append({
+                group_by: group,
+                "calls": calls,
+                "cache_hits": totals["cache_hits"],
+                "prompt_tokens": totals["prompt_tokens"],
+                "completion_tokens": totals["completion_tokens"],
+                "total_tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+                "latency_ms": {
+                    "avg": round(totals["latency_ms_total"] / calls, 2) if calls else None,
+                    "p50": histogram_percentile(totals["latency_buckets"], 50),
+                    "p90": histogram_percentile(totals["latency_buckets"], 90),
+                    "p99": histogram_percentile(totals["latency_buckets"], 99),
+                },
+            })
+
+        if group_by == "day":
+            report.sort(key=lambda row: row["day"])
+        else:
+            report.sort(key=lambda row: row["total_tokens"], reverse=True)
+        return report
+
+
+ai_usage_recorder = AIUsageRecorder(flush_interval=settings.AI_USAGE_FLUSH_INTERVAL)
@@ -15,9 +15,12 @@ from app.services.email import email_service
 from app.repositories.resume import ResumeRepository
 from app.services.resume_service import ResumeService
 from app.services.match_service import MatchService
+from app.services.embedding_service import embedding_service
 from app.repositories.match import MatchRepository
 from app.models.automation import AutomationRun
 from app.core.retry import async_retry_with_backoff, timeout
+from app.core.llm_dispatch import LLMPriority, use_llm_priority
+from app.services.ai_usage import track_ai_usage
 
 # Instantiate dependencies
 resume_repo = ResumeRepository()
@@ -37,6 +40,7 @@ class BotService:
         results = {
             'jobs_processed': 0,
             'jobs_applied': 0,
+            'jobs_prefiltered_out': 0,
             'errors': []
         }
         
@@ -70,11 +74,22 @@ class BotService:
             jobs = await self._get_pending_jobs(user_id)
             results['jobs_processed'] = len(jobs)
             
+            # Cheap local similarity pass so only plausible jobs reach the LLM
+            candidates = await self._prefilter_jobs(resume, jobs)
+            results['jobs_prefiltered_out'] = len(jobs) - len(candidates)
+            jobs = candidates
+            
+            # Score remaining candidates up front in batched LLM calls; a job whose
+            # match failed gets the exception, reported per job below
+            matches = await match_service.match_resume_with_jobs(resume, jobs, return_exceptions=True)
+            
             # Process each job with individual timeout
-            for job in jobs:
+            for job, match in zip(jobs, matches):
                 try:
+                    if isinstance(match, BaseException):
+                        raise match
+                    
                     # Check match score before applying
-                    match = await match_service.match_resume_with_job(resume, job)
                     if match.match_score < 0.5:
                         logger.info(f"Skipping job {job.id} due to low match score: {match.match_score}")
                         continue
@@ -107,6 +122,16 @@ class BotService:
                 await run.save()
             raise
     
+    async def _prefilter_jobs(self, resume, jobs: List[Job]) -> List[Job]:
+        """
+        Embedding pre-filter; on any failure every job goes on to LLM matching.
+        """
+        try:
+            return await embedding_service.prefilter_jobs(resume, jobs)
+        except Exception as e:
+            logger.error(f"Embedding pre-filter failed, matching all {len(jobs)} jobs: {e}", exc_info=True)
+            return jobs
+    
     async def _get_pending_jobs(self, user_id: str) -> List[Job]:
         """Get pending jobs for user."""
         from beanie import PydanticObjectId
@@ -249,11 +274,14 @@ async def run_job_automation():
     async def process_user(user: User):
         async with semaphore:
             try:
-                await bot_service.run_job_automation(str(user.id))
+                with track_ai_usage(user_id=user.id):
+                    await bot_service.run_job_automation(str(user.id))
             except Exception as e:
                 logger.error(f"Automation failed for user {user.id}: {e}")
     
-    await asyncio.gather(
-        *[process_user(user) for user in users],
-        return_exceptions=True
-    )
+    # Scheduled batches yield the LLM budget to interactive and manual runs
+    with use_llm_priority(LLMPriority.BACKGROUND):
+        await asyncio.gather(
+            *[process_user(user) for user in users],
+            return_exceptions=True
+        )
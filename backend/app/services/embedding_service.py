@@ -0,0 +1,228 @@
+"""
+Local embedding service used to pre-filter jobs before LLM matching.
+
+Vectors are computed on CPU and stored on the documents
+(``Resume.embedding_vector`` / ``Job.embedding_vector``) together with the
+name of the embedder that produced them and a hash of the embedded text, so
+they are only recomputed when the text or the embedder changes.
+"""
+import asyncio
+import hashlib
+import math
+import re
+import zlib
+from typing import List, Optional, Protocol, Sequence, Tuple
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.mongo import get_collection
+from app.models.job import Job
+from app.models.resume import Resume
+
+logger = get_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "our", "that", "the", "their", "this",
+    "to", "we", "will", "with", "you", "your",
+})
+
+
+class Embedder(Protocol):
+    """Interface for pluggable local embedding models."""
+
+    name: str
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Return one L2-normalized vector per input text."""
+        ...
+
+
+class HashingEmbedder:
+    """
+    Dependency-free TF vectorizer using the hashing trick.
+
+    Mirrors the TF-IDF ranking in ``bot_engine/ai/matching.py`` without
+    needing a fitted vocabulary: tokens (and adjacent-token bigrams) are
+    hashed into a fixed number of buckets with sublinear term frequency.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def _tokens(self, text: str) -> List[str]:
+        words = [w for w in TOKEN_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+        bigrams = [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words + bigrams
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        counts = {}
+        for token in self._tokens(text or ""):
+            # crc32 is stable across processes, unlike the builtin hash()
+            bucket = zlib.crc32(token.encode("utf-8")) % self.dimensions
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+        vector = [0.0] * self.dimensions
+        for bucket, count in counts.items():
+            vector[bucket] = 1.0 + math.log(count)
+
+        return _normalize(vector)
+
+
+class SentenceTransformerEmbedder:
+    """Dense embeddings from a local sentence-transformers model on CPU."""
+
+    def __init__(self, model_name: str):
+        # Optional dependency, only imported when this backend is selected
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = self.model.encode(list(texts), normalize_embeddings=True)
+        return [vector.tolist() for vector in vectors]
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors (dot product if already normalized)."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def create_embedder() -> Embedder:
+    """Build the embedder selected by ``EMBEDDING_BACKEND``."""
+    if settings.EMBEDDING_BACKEND == "sentence-transformers":
+        try:
+            return SentenceTransformerEmbedder(settings.EMBEDDING_MODEL)
+        except Exception as e:
+            logger.warning(f"Falling back to hashing embedder: {e}")
+    return HashingEmbedder(settings.EMBEDDING_DIMENSIONS)
+
+
+def job_embedding_text(job: Job) -> str:
+    return f"{job.title} {job.company} {' '.join(job.skills_required)} {job.description}"
+
+
+def text_hash(text: str) -> str:
+    """Fingerprint of embedded text, stored next to the vector to detect edits."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingService:
+    """Computes, stores and compares resume/job embeddings."""
+
+    def __init__(self, embedder: Optional[Embedder] = None):
+        self._embedder = embedder
+
+    @property
+    def embedder(self) -> Embedder:
+        # Created lazily so importing the service never loads a model
+        if self._embedder is None:
+            self._embedder = create_embedder()
+        return self._embedder
+
+    async def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed texts off the event loop."""
+        return await asyncio.to_thread(self.embedder.embed, texts)
+
+    def is_stale(self, document, text: str) -> bool:
+        """True if the stored vector is missing or was built by another embedder or from other text."""
+        return (
+            not document.embedding_vector
+            or document.embedding_model != self.embedder.name
+            or document.embedding_hash != text_hash(text)
+        )
+
+    async def ensure_resume_embedding(self, resume: Resume) -> List[float]:
+        """Return the resume vector, computing and persisting it if stale."""
+        text = resume.content or ""
+        if not self.is_stale(resume, text):
+            return resume.embedding_vector
+
+        [vector] = await self.embed_texts([text])
+        # Only the embedding fields are written, so concurrent edits are not overwritten
+        await resume.set({
+            "embedding_vector": vector,
+            "embedding_model": self.embedder.name,
+            "embedding_hash": text_hash(text),
+        })
+        return vector
+
+    async def ensure_job_embeddings(self, jobs: List[Job]) -> None:
+        """Compute and persist vectors for jobs that lack a current one."""
+        texts = {job.id: job_embedding_text(job) for job in jobs}
+        stale = [job for job in jobs if self.is_stale(job, texts[job.id])]
+        if not stale:
+            return
+
+        vectors = await self.embed_texts([texts[job.id] for job in stale])
+        operations = []
+        for job, vector in zip(stale, vectors):
+            job.embedding_vector = vector
+            job.embedding_model = self.embedder.name
+            job.embedding_hash = text_hash(texts[job.id])
+            operations.append(UpdateOne({"_id": job.id}, {"$set": {
+                "embedding_vector": job.embedding_vector,
+                "embedding_model": job.embedding_model,
+                "embedding_hash": job.embedding_hash,
+            }}))
+        await get_collection(Job).bulk_write(operations, ordered=False)
+
+    async def rank_jobs(self, resume: Resume, jobs: List[Job]) -> List[Tuple[Job, float]]:
+        """Return (job, similarity) pairs sorted by similarity, best first."""
+        resume_vector = await self.ensure_resume_embedding(resume)
+        await self.ensure_job_embeddings(jobs)
+
+        ranked = [
+            (job, cosine_similarity(resume_vector, job.embedding_vector))
+            for job in jobs
+        ]
+        ranked.sort(key=lambda pair: pair[1], reverse=True)
+        return ranked
+
+    async def prefilter_jobs(
+        self,
+        resume: Resume,
+        jobs: List[Job],
+        top_k: Optional[int] = None,
+        min_similarity: Optional[float] = None,
+    ) -> List[Job]:
+        """
+        Keep only the top-K jobs whose similarity clears the threshold.
+
+        Defaults come from MATCH_PREFILTER_TOP_K / MATCH_PREFILTER_MIN_SIMILARITY.
+        """
+        top_k = top_k if top_k is not None else settings.MATCH_PREFILTER_TOP_K
+        if min_similarity is None:
+            min_similarity = settings.MATCH_PREFILTER_MIN_SIMILARITY
+
+        ranked = await self.rank_jobs(resume, jobs)
+        candidates = [job for job, score in ranked if score >= min_similarity][:top_k]
+
+        logger.info(
+            f"Embedding pre-filter kept {len(candidates)}/{len(jobs)} jobs "
+            f"for resume {resume.id} (top_k={top_k}, min_similarity={min_similarity})"
+        )
+        return candidates
+
+
+embedding_service = EmbeddingService()
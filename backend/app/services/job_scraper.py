@@ -1,17 +1,23 @@
 import logging
 import asyncio
 
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
 from app.models.job import ScrapedJob, JobStatus
-from app.automation.browser import BrowserManager
+from app.automation.browser import browser_pool
 from app.automation.scrapers.linkedin import LinkedInScraper
 from app.notifications.telegram import telegram_service
 from app.core.config import settings
+from app.db.mongo import get_collection
 
 logger = logging.getLogger(__name__)
 
 class JobScraperService:
     def __init__(self):
-        self.browser_manager = BrowserManager()
+        # Shared across scrapes; each scrape leases its own browser context
+        self.browser_pool = browser_pool
         
     async def scrape_jobs(self, keyword: str, location: str, limit: int = 10, user_id: str = None):
         if not getattr(settings, "JOB_SCRAPING_ENABLED", False):
@@ -37,40 +43,35 @@ class JobScraperService:
 
         try:
             await send_progress(f"Launching browser agent for {keyword}...")
-            page = await self.browser_manager.launch()
-            scraper = LinkedInScraper(page)
-            
-            # Login (if cookies exist)
-            await send_progress("Checking LinkedIn session...")
-            await scraper.login()
-            
-            # Scrape
-            await send_progress(f"Searching LinkedIn for {keyword} in {location}...")
-            jobs_data = await scraper.scrape_jobs(keyword, location, limit)
-            
-            new_jobs_count = 0
-            for job_data in jobs_data:
-                # Check duplicates
-                existing = await ScrapedJob.find_one(ScrapedJob.link == job_data["link"])
+            async with self.browser_pool.page() as page:
+                scraper = LinkedInScraper(page)
+                await scraper.intercept_requests()
+                
+                # Login (if cookies exist)
+                await send_progress("Checking LinkedIn session...")
+                await scraper.login()
                 
-                if not existing:
-                    new_job = ScrapedJob(**job_data)
-                    await new_job.insert()
-                    new_jobs_count += 1
-                    
-                    # Alert for new job - Non-blocking
-                    alert_msg = (
-                        f"🎯 <b>New Job Found</b>\n"
-                        f"<b>Role:</b> {new_job.title}\n"
-                        f"<b>Company:</b> {new_job.company}\n"
-                        f"<b>Location:</b> {new_job.location}\n"
-                        f"<a href='{new_job.link}'>Apply Now</a>"
-                    )
-                    asyncio.create_task(telegram_service.send_alert(alert_msg))
+                # Scrape, persisting and notifying as each batch of results loads
+                await send_progress(f"Searching LinkedIn for {keyword} in {location}...")
+                total_found = 0
+                new_jobs_count = 0
+                matched_count = 0
+                duplicate_count = 0
+                async for jobs_data in scraper.iter_jobs(keyword, location, limit):
+                    total_found += len(jobs_data)
+                    saved = await self._save_new_jobs(jobs_data)
+                    new_jobs_count += saved["inserted"]
+                    matched_count += saved["matched"]
+                    duplicate_count += saved["duplicates"]
+                    await send_progress(f"Found {total_found} jobs so far ({new_jobs_count} new)...")
+            logger.info(f"LinkedIn scrape traffic: {scraper.traffic.summary()}")
             
-            logger.info(f"Scraping completed. Found {len(jobs_data)} jobs, {new_jobs_count} new.")
-            await send_progress(f"Scraping complete! Found {len(jobs_data)} jobs.", type="success")
-            return {"total": len(jobs_data), "new": new_jobs_count}
+            logger.info(
+                f"Scraping completed. Found {total_found} jobs, {new_jobs_count} new "
+                f"({duplicate_count} near-duplicates), {matched_count} already known."
+            )
+            await send_progress(f"Scraping complete! Found {total_found} jobs.", type="success")
+            return {"total": total_found, "new": new_jobs_count, "matched": matched_count, "duplicates": duplicate_count}
 
         except Exception as e:
             error_details = str(e) or e.__class__.__name__
@@ -78,8 +79,123 @@ class JobScraperService:
             await send_progress(f"Scraping failed: {error_details}", type="error")
             asyncio.create_task(telegram_service.send_alert(f"⚠️ <b>Job Scraping Failed</b>\nError: {error_details}"))
             raise e
-        finally:
-            await self.browser_manager.close()
+
+    async def upsert_jobs(self, jobs_data: list[dict]) -> dict:
+        """
+        Insert jobs whose link is not stored yet, in one unordered bulk write.
+
+        The unique ``link`` index does the dedupe, so concurrent scrapes
+        cannot insert the same posting twice. New jobs that near-duplicate a
+        stored job or another inserted job of the batch (same role posted on
+        another board) are still inserted, but flagged with ``duplicate_of``.
+
+        Returns:
+            {"inserted": int, "matched": int, "duplicates": int, "jobs": newly inserted ScrapedJobs}
+        """
+        # Duplicate links within one batch would race each other's upsert
+        unique_jobs = list({job_data["link"]: job_data for job_data in jobs_data}.values())
+        if not unique_jobs:
+            return {"inserted": 0, "matched": 0, "duplicates": 0, "jobs": []}
+
+        from app.services.near_duplicates import near_duplicate_service
+
+        # Ids are assigned up front so inserted jobs keep the id they were written with
+        docs = [ScrapedJob(id=PydanticObjectId(), **job_data) for job_data in unique_jobs]
+        near_duplicate_service.flag_duplicates(docs)
+        operations = [
+            UpdateOne(
+                {"link": doc.link},
+                {"$setOnInsert": {**doc.model_dump(exclude={"id", "revision_id"}), "_id": doc.id}},
+                upsert=True,
+            )
+            for doc in docs
+        ]
+
+        collection = get_collection(ScrapedJob)
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids
+            matched = result.matched_count
+        except BulkWriteError as e:
+            # A concurrent scrape inserted the same link first (duplicate key): count it as matched
+            details = e.details
+            other_errors = [error for error in details.get("writeErrors", []) if error.get("code") != 11000]
+            if other_errors:
+                raise
+            upserted = {item["index"]: item["_id"] for item in details.get("upserted", [])}
+            matched = details.get("nMatched", 0) + len(details.get("writeErrors", []))
+
+        new_jobs = [docs[index] for index in sorted(upserted)]
+        # Only now is it known which batch jobs exist to be pointed at
+        batch_duplicates = near_duplicate_service.flag_batch_duplicates(new_jobs)
+        if batch_duplicates:
+            await collection.bulk_write([
+                UpdateOne(
+                    {"_id": job.id},
+                    {"$set": {"duplicate_of": job.duplicate_of, "duplicate_score": job.duplicate_score}},
+                )
+                for job in batch_duplicates
+            ], ordered=False)
+        near_duplicate_service.add_jobs(new_jobs)
+        duplicates = sum(1 for job in new_jobs if job.duplicate_of is not None)
+
+        return {"inserted": len(new_jobs), "matched": matched, "duplicates": duplicates, "jobs": new_jobs}
+
+    async def delete_jobs(self, job_ids: list) -> int:
+        """
+        Delete scraped jobs and their near-duplicates, and drop them from the
+        near-duplicate and recommendation indexes.
+
+        Returns the number of documents deleted.
+        """
+        if not job_ids:
+            return 0
+
+        from app.services.near_duplicates import near_duplicate_service
+        from app.services.vector_index import vector_index_service
+
+        collection = get_collection(ScrapedJob)
+        # Copies of a deleted posting would otherwise point at a missing job
+        copies = [doc["_id"] async for doc in collection.find({"duplicate_of": {"$in": list(job_ids)}}, {"_id": 1})]
+        ids = list(job_ids) + copies
+        result = await collection.delete_many({"_id": {"$in": ids}})
+
+        near_duplicate_service.remove_jobs(ids)
+        await vector_index_service.remove_jobs(ids)
+        return result.deleted_count
+
+    async def _save_new_jobs(self, jobs_data: list[dict]) -> dict:
+        """
+        Store a batch of scraped jobs, alert on new ones and add them to the recommendation index.
+
+        Near-duplicates are stored but not indexed, and not alerted when they
+        are similar enough to be hidden.
+        """
+        from app.services.near_duplicates import is_hidden_duplicate
+
+        saved = await self.upsert_jobs(jobs_data)
+        new_jobs = [job for job in saved["jobs"] if job.duplicate_of is None]
+        alert_jobs = [job for job in saved["jobs"] if not is_hidden_duplicate(job)]
+
+        for new_job in alert_jobs:
+            # Alert for new job - Non-blocking
+            alert_msg = (
+                f"🎯 <b>New Job Found</b>\n"
+                f"<b>Role:</b> {new_job.title}\n"
+                f"<b>Company:</b> {new_job.company}\n"
+                f"<b>Location:</b> {new_job.location}\n"
+                f"<a href='{new_job.link}'>Apply Now</a>"
+            )
+            asyncio.create_task(telegram_service.send_alert(alert_msg))
+        
+        # Keep the recommendation index in sync with newly scraped jobs
+        try:
+            from app.services.vector_index import vector_index_service
+            await vector_index_service.add_jobs(new_jobs)
+        except Exception as e:
+            logger.error(f"Failed to index scraped jobs: {e}")
+        
+        return saved
 
     async def get_jobs(self, skip: int = 0, limit: int = 100) -> list[ScrapedJob]:
         """
@@ -0,0 +1,193 @@
+"""
+Write-behind sink for AgentLog documents.
+
+Callers enqueue logs without touching MongoDB; a background task drains the
+queue and writes them with ``insert_many`` once a batch fills up or the
+flush interval elapses. When the queue is nearly full, new logs are sampled
+and, once it is full, dropped, so logging never blocks an AI request.
+"""
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import compress_value
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.log import AgentLog
+
+logger = get_logger(__name__)
+
+
+def shrink_payload(value: Any, max_chars: int, compress: bool = False) -> Any:
+    """
+    Bound the size of strings inside a log payload.
+
+    Strings longer than ``max_chars`` are either truncated or, with
+    ``compress``, replaced by a zlib+base64 envelope holding the full text.
+    """
+    if max_chars <= 0:
+        return value
+
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        if compress:
+            return {"encoding": "zlib+base64", "length": len(value), "data": compress_value(value)}
+        return f"{value[:max_chars]}... [truncated {len(value) - max_chars} chars]"
+
+    if isinstance(value, dict):
+        return {k: shrink_payload(v, max_chars, compress) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [shrink_payload(v, max_chars, compress) for v in value]
+
+    return value
+
+
+class AgentLogSink:
+    """Bounded in-memory queue of AgentLog documents, flushed in batches."""
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 2.0,
+        overload_threshold: float = 0.8,
+        overload_sample_rate: float = 0.1
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overload_threshold = overload_threshold
+        self.overload_sample_rate = overload_sample_rate
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.written = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the background writer (idempotent). Raises RuntimeError outside an event loop."""
+        asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush everything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                await self._write(self._drain(self.batch_size))
+
+    def submit(self, log: AgentLog) -> bool:
+        """
+        Queue a log for writing. Never blocks.
+
+        Returns False if the log was sampled out or dropped because the
+        queue is overloaded.
+        """
+        log.input = shrink_payload(log.input, settings.AGENT_LOG_MAX_FIELD_CHARS, settings.AGENT_LOG_COMPRESS)
+        log.output = shrink_payload(log.output, settings.AGENT_LOG_MAX_FIELD_CHARS, settings.AGENT_LOG_COMPRESS)
+
+        try:
+            # Started lazily so scripts that never run the app lifespan still log
+            self.start()
+        except RuntimeError:
+            logger.warning("No running event loop, AgentLog not recorded")
+            self.dropped += 1
+            return False
+
+        if self._queue.qsize() >= self.max_queue * self.overload_threshold:
+            if random.random() >= self.overload_sample_rate:
+                self.sampled_out += 1
+                return False
+
+        try:
+            self._queue.put_nowait(log)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Sink counters since process start."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _drain(self, limit: int) -> List[AgentLog]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        batch: List[AgentLog] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+
+                # Fill the batch until it is full or the flush interval has passed
+                while len(batch) < self.batch_size:
+                    batch.extend(self._drain(self.batch_size - len(batch)))
+                    remaining = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Only forget the batch once written, so a write cut short by
+                # stop() is flushed again rather than lost
+                await self._write(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Put a partially collected or unwritten batch back so stop() can flush it
+            for log in batch:
+                try:
+                    self._queue.put_nowait(log)
+                except asyncio.QueueFull:
+                    self.dropped += 1
+            raise
+
+    async def _write(self, batch: List[AgentLog]) -> None:
+        if not batch:
+            return
+        try:
+            await AgentLog.insert_many(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} agent logs: {e}")
+
+
+agent_log_sink = AgentLogSink(
+    max_queue=settings.AGENT_LOG_QUEUE_SIZE,
+    batch_size=settings.AGENT_LOG_BATCH_SIZE,
+    flush_interval=settings.AGENT_LOG_FLUSH_INTERVAL,
+    overload_threshold=settings.AGENT_LOG_OVERLOAD_THRESHOLD,
+    overload_sample_rate=settings.AGENT_LOG_OVERLOAD_SAMPLE_RATE,
+)
@@ -1,8 +1,11 @@
 """
 Match service for resume-job matching using AI.
 """
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, List, Union
 from app.services.ai_service import ai_service
+from app.services.ai_usage import track_ai_usage
+from app.core.config import settings
 from app.repositories.match import MatchRepository
 from app.models.match import Match
 from app.models.resume import Resume
@@ -11,6 +14,15 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Rough chars-per-token ratio used to size batches without a tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for budgeting prompts."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
 class MatchService:
     """Service for matching resumes with jobs."""
     
@@ -43,7 +55,8 @@ class MatchService:
         
         try:
             # Use AIService to get structured matching data
-            match_data = await ai_service._generate_json(prompt, model="llama3-70b-8192")
+            with track_ai_usage(method="match_resume_with_job", user_id=resume.user_id):
+                match_data = await ai_service._generate_json(prompt, model=settings.AI_MODEL_FAST)
             
             # Create match record
             match = await self.match_repo.create(
@@ -67,3 +80,140 @@ class MatchService:
                 match_score=0.0,
                 reasoning=f"Matching failed: {str(e)}"
             )
+
+    async def match_resume_with_jobs(
+        self,
+        resume: Resume,
+        jobs: List[Job],
+        return_exceptions: bool = False
+    ) -> List[Union[Match, BaseException]]:
+        """
+        Score a resume against several jobs using as few LLM calls as possible.
+        
+        Job descriptions are truncated and packed into chunks that fit
+        MATCH_BATCH_TOKEN_BUDGET; each chunk is scored with a single JSON prompt.
+        Jobs missing from a chunk's response (or the whole chunk, if the JSON is
+        malformed) fall back to match_resume_with_job, at most
+        MATCH_FALLBACK_CONCURRENCY at a time.
+        Returns matches in the same order as ``jobs``. With
+        ``return_exceptions`` a job whose match could not be stored gets the
+        exception in its place instead of failing the whole batch.
+        """
+        if not jobs:
+            return []
+        
+        logger.info(f"Batch matching resume {resume.id} with {len(jobs)} jobs")
+        
+        resume_text = (resume.content or "")[:2000]
+        chunks = self._chunk_jobs(resume_text, jobs)
+        chunk_results = await asyncio.gather(
+            *[self._score_chunk(resume, resume_text, chunk) for chunk in chunks]
+        )
+        
+        # Chunks preserve job order, so flattening lines scores up with ``jobs``
+        scores: List[Optional[Dict[str, Any]]] = []
+        for chunk, result in zip(chunks, chunk_results):
+            scores.extend(result.get(position) for position in range(len(chunk)))
+        
+        fallback_slots = asyncio.Semaphore(settings.MATCH_FALLBACK_CONCURRENCY)
+        
+        async def store(job: Job, score: Optional[Dict[str, Any]]) -> Match:
+            if score is None:
+                logger.warning(f"No batch score for job {job.id}, falling back to single match")
+                async with fallback_slots:
+                    return await self.match_resume_with_job(resume, job)
+            
+            return await self.match_repo.create(
+                user_id=resume.user_id,
+                resume_id=resume.id,
+                job_id=job.id,
+                match_score=score["match_score"],
+                reasoning=score["reasoning"],
+            )
+        
+        return await asyncio.gather(
+            *[store(job, score) for job, score in zip(jobs, scores)],
+            return_exceptions=return_exceptions
+        )
+
+    def _chunk_jobs(self, resume_text: str, jobs: List[Job]) -> List[List[Job]]:
+        """Greedily pack jobs into chunks that fit the prompt token budget."""
+        budget = settings.MATCH_BATCH_TOKEN_BUDGET - estimate_tokens(resume_text)
+        max_size = settings.MATCH_BATCH_MAX_JOBS
+        
+        chunks: List[List[Job]] = []
+        current: List[Job] = []
+        used = 0
+        for job in jobs:
+            cost = estimate_tokens(self._job_snippet(job))
+            if current and (used + cost > budget or len(current) >= max_size):
+                chunks.append(current)
+                current, used = [], 0
+            current.append(job)
+            used += cost
+        
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _job_snippet(self, job: Job) -> str:
+        description = (job.description or "")[:settings.MATCH_BATCH_JOB_CHARS]
+        return f"{job.title} at {job.company}\n{description}"
+
+    async def _score_chunk(self, resume: Resume, resume_text: str, jobs: List[Job]) -> Dict[int, Dict[str, Any]]:
+        """
+        Score one chunk of jobs with a single prompt.
+        Returns a mapping of position-in-chunk to validated score data;
+        positions that could not be parsed are omitted.
+        """
+        job_blocks = "\n\n".join(
+            f"[Job {position}]\n{self._job_snippet(job)}"
+            for position, job in enumerate(jobs)
+        )
+        prompt = f"""
+        Analyze how well the following resume matches each of the {len(jobs)} job descriptions.
+        
+        Resume:
+        {resume_text}
+        
+        Job Descriptions:
+        {job_blocks}
+        
+        Output valid JSON with one entry per job, using the job number as "index":
+        {{
+            "matches": [
+                {{
+                    "index": 0,
+                    "match_score": 0.85,
+                    "reasoning": "A concise explanation of the match."
+                }}
+            ]
+        }}
+        """
+        
+        try:
+            with track_ai_usage(method="match_resume_with_jobs", user_id=resume.user_id):
+                data = await ai_service._generate_json(prompt, model=settings.AI_MODEL_FAST)
+        except Exception as e:
+            logger.error(f"Batch match request failed for {len(jobs)} jobs: {e}")
+            return {}
+        
+        results: Dict[int, Dict[str, Any]] = {}
+        entries = data.get("matches") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            logger.warning("Batch match response missing 'matches' list")
+            return results
+        
+        for entry in entries:
+            try:
+                position = int(entry["index"])
+                match_score = float(entry["match_score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= position < len(jobs) and 0.0 <= match_score <= 1.0:
+                results[position] = {
+                    "match_score": match_score,
+                    "reasoning": str(entry.get("reasoning") or "No reasoning provided."),
+                }
+        
+        return results
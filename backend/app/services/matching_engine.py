@@ -1,13 +1,54 @@
-from typing import TypedDict, List, Optional, Dict, Any
-from langgraph.graph import StateGraph, END
+from typing import TypedDict, List, Optional, Dict, Any, Annotated, Callable, Awaitable
+from functools import wraps
+from langgraph.graph import StateGraph, START, END
 import logging
+import hashlib
 import json
 import time
 from app.services.ai_service import ai_service
+from app.services.ai_usage import track_ai_usage
+from app.core.cache import TieredCache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the analysis prompts change so stale cached analyses are ignored.
+ANALYSIS_PROMPT_VERSION = "v1"
+
+# Text is truncated to these lengths before it reaches the LLM, so the cache
+# key is computed over the same slice.
+JOB_TEXT_LIMIT = 2000
+RESUME_TEXT_LIMIT = 4000
+
+analysis_cache = TieredCache(
+    namespace="match_analysis",
+    expire=settings.ANALYSIS_CACHE_TTL,
+    max_local_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+)
+
+
+def analysis_cache_key(kind: str, text: str, model: str) -> str:
+    """
+    Content-addressed key over normalized text, model and prompt version.
+
+    An edited job or resume hashes to a new key, so edits never need an
+    explicit invalidation; the old entry simply expires.
+    """
+    normalized = " ".join(text.split())
+    payload = f"{kind}|{model}|{ANALYSIS_PROMPT_VERSION}|{normalized}"
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def _keep_first_error(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Reducer so parallel branches can both report an error without conflicting."""
+    return current or new
+
+
+def _merge_timings(current: Optional[Dict[str, float]], new: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Reducer that merges per-node latency measurements from every branch."""
+    return {**(current or {}), **(new or {})}
+
+
 class JobMatchState(TypedDict):
     job_description: str
     resume_text: str
@@ -15,10 +56,40 @@ class JobMatchState(TypedDict):
     resume_analysis: Optional[Dict[str, Any]]
     match_result: Optional[Dict[str, Any]]
     recommendations: Optional[List[str]]
-    error: Optional[str]
+    error: Annotated[Optional[str], _keep_first_error]
+    node_timings_ms: Annotated[Dict[str, float], _merge_timings]
+
+
+NodeFn = Callable[[JobMatchState], Awaitable[Dict[str, Any]]]
+
+
+def timed_node(name: str) -> Callable[[NodeFn], NodeFn]:
+    """
+    Record the wall-clock duration of a graph node into ``node_timings_ms``
+    and attribute its LLM usage to ``matching.<name>``.
+    """
+    def decorator(func: NodeFn) -> NodeFn:
+        @wraps(func)
+        async def wrapper(state: JobMatchState) -> Dict[str, Any]:
+            start_time = time.perf_counter()
+            try:
+                with track_ai_usage(method=f"matching.{name}"):
+                    update = await func(state)
+            finally:
+                duration = (time.perf_counter() - start_time) * 1000
+            return {**update, "node_timings_ms": {name: round(duration, 2)}}
+        return wrapper
+    return decorator
+
 
 async def analyze_job_node(state: JobMatchState) -> Dict[str, Any]:
     """Extract key requirements and skills from the job description."""
+    job_text = state['job_description'][:JOB_TEXT_LIMIT]
+    key = analysis_cache_key("job", job_text, settings.AI_MODEL_FAST)
+    cached_analysis = await analysis_cache.get(key)
+    if cached_analysis is not None:
+        return {"job_analysis": cached_analysis}
+
     prompt = f"""
     Analyze this job description and extract:
     1. Key technical skills required.
@@ -27,7 +98,7 @@ async def analyze_job_node(state: JobMatchState) -> Dict[str, Any]:
     4. Top 3 primary responsibilities.
     
     Job Description:
-    {state['job_description'][:2000]}
+    {job_text}
     
     Output JSON:
     {{
@@ -38,7 +109,9 @@ async def analyze_job_node(state: JobMatchState) -> Dict[str, Any]:
     }}
     """
     try:
-        analysis = await ai_service._generate_json(prompt, model=settings.AI_MODEL_FAST)
+        # Raises instead of returning a mock, so a fallback never gets cached
+        analysis = await ai_service._complete_json(prompt, model=settings.AI_MODEL_FAST)
+        await analysis_cache.set(key, analysis)
         return {"job_analysis": analysis}
     except Exception as e:
         logger.error(f"Job analysis failed: {e}")
@@ -46,11 +119,17 @@ async def analyze_job_node(state: JobMatchState) -> Dict[str, Any]:
 
 async def analyze_resume_node(state: JobMatchState) -> Dict[str, Any]:
     """Parse resume and extract user skills/experience."""
+    resume_text = state['resume_text'][:RESUME_TEXT_LIMIT]
+    key = analysis_cache_key("resume", resume_text, settings.AI_MODEL_FAST)
+    cached_analysis = await analysis_cache.get(key)
+    if cached_analysis is not None:
+        return {"resume_analysis": cached_analysis}
+
     prompt = f"""
     Extract key skills and experience highlights from this resume.
     
     Resume:
-    {state['resume_text'][:4000]}
+    {resume_text}
     
     Output JSON:
     {{
@@ -59,7 +138,9 @@ async def analyze_resume_node(state: JobMatchState) -> Dict[str, Any]:
     }}
     """
     try:
-        analysis = await ai_service._generate_json(prompt, model=settings.AI_MODEL_FAST)
+        # Raises instead of returning a mock, so a fallback never gets cached
+        analysis = await ai_service._complete_json(prompt, model=settings.AI_MODEL_FAST)
+        await analysis_cache.set(key, analysis)
         return {"resume_analysis": analysis}
     except Exception as e:
         logger.error(f"Resume analysis failed: {e}")
@@ -118,14 +199,16 @@ async def generate_advice_node(state: JobMatchState) -> Dict[str, Any]:
 # Define the Graph
 workflow = StateGraph(JobMatchState)
 
-workflow.add_node("analyze_job", analyze_job_node)
-workflow.add_node("analyze_resume", analyze_resume_node)
-workflow.add_node("calculate_match", calculate_match_node)
-workflow.add_node("generate_advice", generate_advice_node)
+workflow.add_node("analyze_job", timed_node("analyze_job")(analyze_job_node))
+workflow.add_node("analyze_resume", timed_node("analyze_resume")(analyze_resume_node))
+workflow.add_node("calculate_match", timed_node("calculate_match")(calculate_match_node))
+workflow.add_node("generate_advice", timed_node("generate_advice")(generate_advice_node))
 
-workflow.set_entry_point("analyze_job")
-workflow.add_edge("analyze_job", "analyze_resume")
-workflow.add_edge("analyze_resume", "calculate_match")
+# Job and resume analyses are independent LLM calls: fan out from START and
+# join before scoring so the two round-trips overlap instead of adding up.
+workflow.add_edge(START, "analyze_job")
+workflow.add_edge(START, "analyze_resume")
+workflow.add_edge(["analyze_job", "analyze_resume"], "calculate_match")
 workflow.add_edge("calculate_match", "generate_advice")
 workflow.add_edge("generate_advice", END)
 
@@ -142,22 +225,25 @@ class JobMatchingEngine:
             "resume_analysis": None,
             "match_result": None,
             "recommendations": [],
-            "error": None
+            "error": None,
+            "node_timings_ms": {}
         }
         
         start_time = time.time()
         final_state = await engine.ainvoke(initial_state)
         duration = (time.time() - start_time) * 1000
         
-        # Log the full trace to AgentLog
+        # Log the full trace to AgentLog (written in the background)
         try:
             from app.models.log import AgentLog
-            await AgentLog(
+            from app.services.log_sink import agent_log_sink
+            agent_log_sink.submit(AgentLog(
                 agent_name="JobMatchingEngine",
                 input={"job_len": len(job_description), "resume_len": len(resume_text)},
                 output={
                     "score": final_state.get("match_result", {}).get("score"),
                     "recommendations": final_state.get("recommendations"),
+                    "node_timings_ms": final_state.get("node_timings_ms"),
                     "trace": {
                         "job_analysis": final_state.get("job_analysis"),
                         "resume_analysis": final_state.get("resume_analysis"),
@@ -165,7 +251,7 @@ class JobMatchingEngine:
                     }
                 },
                 execution_time_ms=duration
-            ).insert()
+            ))
         except Exception as e:
             logger.error(f"Failed to log engine trace: {e}")
             
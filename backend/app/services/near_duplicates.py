@@ -0,0 +1,260 @@
+"""
+Near-duplicate detection for scraped jobs.
+
+The same posting shows up on LinkedIn, Indeed and Naukri under different
+URLs, so the unique ``link`` index does not catch it. Each job's title,
+company and description are shingled into word 3-grams and summarised with
+a MinHash signature. Signatures are split into bands and hashed into an
+in-memory LSH index, so an insert only compares against the jobs that share
+at least one band bucket. A candidate is a duplicate when its estimated
+Jaccard similarity reaches ``NEAR_DUPLICATE_THRESHOLD``.
+
+Duplicates are flagged (``ScrapedJob.duplicate_of``) rather than deleted, and
+only canonical jobs are kept in the index. Flagged jobs are hidden from
+listings and alerts only when their score also reaches the stricter
+``NEAR_DUPLICATE_HIDE_THRESHOLD``. The index is rebuilt from MongoDB in the
+background at startup; until it is ready, new jobs are not checked.
+"""
+import asyncio
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.mongo import get_collection
+from app.models.job import ScrapedJob
+from app.services.embedding_service import STOP_WORDS, TOKEN_PATTERN
+
+logger = get_logger(__name__)
+
+SHINGLE_SIZE = 3
+
+
+def job_shingles(title: str, company: str, description: Optional[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Word n-grams of the job text, ignoring case, punctuation and stop words."""
+    text = f"{title} {company} {description or ''}".lower()
+    tokens = [token for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS]
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures using multiply-shift hashing over CRC32 shingle hashes."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        rng = np.random.default_rng(seed)
+        # Odd 64-bit multipliers; (a * x + b) >> 32 is universal for 32-bit x
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64
+        )
+        if not len(hashes):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        # uint64 arithmetic wraps, which is what multiply-shift expects
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return float(np.mean(a == b))
+
+
+class MinHashLSH:
+    """Banded LSH index over MinHash signatures."""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        self.remove(key)
+        self.signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets[band_key].add(key)
+
+    def remove(self, key: str) -> bool:
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return False
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+        return True
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        """Keys sharing at least one band bucket with ``signature``."""
+        found: Set[str] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            found |= buckets.get(band_key, set())
+        return found
+
+    def query(self, signature: np.ndarray, threshold: float) -> Optional[Tuple[str, float]]:
+        """Most similar indexed key at or above ``threshold``, if any."""
+        best = None
+        for key in self.candidates(signature):
+            score = MinHasher.similarity(signature, self.signatures[key])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+
+def is_hidden_duplicate(job: ScrapedJob) -> bool:
+    """Whether ``job`` is a near-duplicate certain enough to hide."""
+    return job.duplicate_of is not None and (job.duplicate_score or 0) >= settings.NEAR_DUPLICATE_HIDE_THRESHOLD
+
+
+def visible_jobs_filter() -> Dict[str, Any]:
+    """MongoDB filter for scraped jobs that are not hidden near-duplicates."""
+    return {"$or": [
+        {"duplicate_of": None},
+        {"duplicate_score": {"$lt": settings.NEAR_DUPLICATE_HIDE_THRESHOLD}},
+    ]}
+
+
+class NearDuplicateService:
+    """Keeps an LSH index of canonical scraped jobs and flags near-duplicates on insert."""
+
+    def __init__(self):
+        self.hasher = MinHasher(settings.NEAR_DUPLICATE_NUM_PERM)
+        self.threshold = settings.NEAR_DUPLICATE_THRESHOLD
+        self.index: Optional[MinHashLSH] = None
+        # Jobs stored (signature) or deleted (None) while a rebuild is reading
+        # MongoDB, replayed on the new index when it is done
+        self._pending: Optional[List[Tuple[str, Optional[np.ndarray]]]] = None
+        self._lock = asyncio.Lock()
+
+    def signature(self, job: ScrapedJob) -> np.ndarray:
+        return self.hasher.signature(job_shingles(job.title, job.company, job.description))
+
+    async def start(self) -> None:
+        """Build the index from the canonical jobs stored in MongoDB."""
+        if not settings.NEAR_DUPLICATE_ENABLED:
+            return
+        async with self._lock:
+            if self.index is not None:
+                return
+            try:
+                await self._rebuild()
+            except Exception as e:
+                logger.error(f"Failed to build near-duplicate index: {e}", exc_info=True)
+
+    async def rebuild(self) -> None:
+        async with self._lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        index = MinHashLSH(settings.NEAR_DUPLICATE_NUM_PERM, settings.NEAR_DUPLICATE_BANDS)
+        self._pending = []
+        try:
+            cursor = get_collection(ScrapedJob).find(
+                {"duplicate_of": None}, {"title": 1, "company": 1, "description": 1}
+            )
+            async for doc in cursor:
+                shingles = job_shingles(doc.get("title", ""), doc.get("company", ""), doc.get("description"))
+                index.add(str(doc["_id"]), self.hasher.signature(shingles))
+
+            for key, signature in self._pending:
+                if signature is None:
+                    index.remove(key)
+                else:
+                    index.add(key, signature)
+            self.index = index
+        finally:
+            self._pending = None
+        logger.info(f"Built near-duplicate index over {len(index)} jobs")
+
+    @staticmethod
+    def _flag(job: ScrapedJob, match: Tuple[str, float]) -> None:
+        job.duplicate_of = PydanticObjectId(match[0])
+        job.duplicate_score = round(match[1], 3)
+
+    def flag_duplicates(self, jobs: List[ScrapedJob]) -> int:
+        """
+        Set ``duplicate_of`` on jobs that match an indexed (already stored) job.
+
+        Call before the batch is written. Returns the number flagged.
+        """
+        if self.index is None:
+            return 0
+
+        flagged = 0
+        for job in jobs:
+            match = self.index.query(self.signature(job), self.threshold)
+            if match is not None:
+                self._flag(job, match)
+                flagged += 1
+        return flagged
+
+    def flag_batch_duplicates(self, jobs: List[ScrapedJob]) -> List[ScrapedJob]:
+        """
+        Set ``duplicate_of`` on unflagged jobs that match an earlier job in ``jobs``.
+
+        Call after the write with only the inserted jobs, so ``duplicate_of``
+        never points at a job whose insert did not happen (its link was
+        already stored). Returns the jobs flagged here; they still have to
+        be written.
+        """
+        if self.index is None:
+            return []
+
+        batch = MinHashLSH(self.index.num_perm, self.index.bands)
+        flagged = []
+        for job in jobs:
+            if job.duplicate_of is not None:
+                continue
+            signature = self.signature(job)
+            match = batch.query(signature, self.threshold)
+            if match is None:
+                batch.add(str(job.id), signature)
+            else:
+                self._flag(job, match)
+                flagged.append(job)
+        return flagged
+
+    def add_jobs(self, jobs: List[ScrapedJob]) -> None:
+        """Index newly stored canonical jobs."""
+        if self.index is None and self._pending is None:
+            return
+        for job in jobs:
+            if job.duplicate_of is not None:
+                continue
+            key, signature = str(job.id), self.signature(job)
+            if self.index is not None:
+                self.index.add(key, signature)
+            if self._pending is not None:
+                self._pending.append((key, signature))
+
+    def remove_jobs(self, job_ids: List[str]) -> int:
+        """Drop deleted jobs from the index."""
+        if self._pending is not None:
+            self._pending.extend((str(job_id), None) for job_id in job_ids)
+        if self.index is None:
+            return 0
+        return sum(self.index.remove(str(job_id)) for job_id in job_ids)
+
+
+near_duplicate_service = NearDuplicateService()
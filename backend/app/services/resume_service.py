@@ -15,6 +15,7 @@ from app.models.resume import Resume
 from app.models.user import User
 from app.schemas.resume import ResumeCreate
 from app.services.ai_service import ai_service
+from app.services.ai_usage import track_ai_usage
 from pypdf import PdfReader
 
 logger = get_logger(__name__)
@@ -70,7 +71,8 @@ class ResumeService:
         # Parse resume content using AI
         parsed_data = {}
         try:
-            parsed_data = await ai_service.parse_resume(content)
+            with track_ai_usage(user_id=user.id):
+                parsed_data = await ai_service.parse_resume(content)
         except Exception as e:
             logger.error(f"Failed to parse resume with AI: {e}")
 
@@ -0,0 +1,397 @@
+"""
+Approximate nearest-neighbour search over scraped job embeddings.
+
+An IVF-Flat index in pure NumPy: k-means centroids partition the vectors,
+and a query only scores the vectors assigned to its ``n_probe`` closest
+centroids. Inserts are assigned to an existing centroid; deletes are
+tombstoned and compacted once they make up a quarter of the index.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.mongo import get_collection
+from app.models.job import ScrapedJob
+from app.models.resume import Resume
+from app.services.embedding_service import embedding_service
+
+logger = get_logger(__name__)
+
+# Below this many vectors per list, exact search is cheaper than training
+MIN_VECTORS_PER_LIST = 39
+
+
+class IVFIndex:
+    """Inverted-file index over L2-normalized vectors (cosine similarity)."""
+
+    def __init__(self, dim: int, n_lists: int = 256, n_probe: int = 16):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.deleted = np.zeros(0, dtype=bool)
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def train(self, sample_size: int = 20000, iterations: int = 10, seed: int = 0) -> None:
+        """Fit centroids with spherical k-means on (a sample of) the live vectors."""
+        self.set_training(*self.fit(sample_size, iterations, seed))
+
+    def fit(
+        self, sample_size: int = 20000, iterations: int = 10, seed: int = 0
+    ) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Compute centroids and the matching row assignments without changing the index.
+
+        Safe to run in a worker thread while searches use the current
+        centroids, as long as no vectors are added or removed meanwhile.
+        Apply the result with ``set_training``.
+        """
+        live = self.vectors[~self.deleted]
+        n_lists = min(self.n_lists, len(live) // MIN_VECTORS_PER_LIST)
+        if n_lists < 2:
+            return None, self._assign(self.vectors, None)
+
+        rng = np.random.default_rng(seed)
+        sample = live[rng.choice(len(live), size=min(sample_size, len(live)), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+
+        centroids = centroids.astype(np.float32)
+        return centroids, self._assign(self.vectors, centroids)
+
+    def set_training(self, centroids: Optional[np.ndarray], assignments: np.ndarray) -> None:
+        """Swap in the result of ``fit``; centroids and assignments always change together."""
+        if len(assignments) != len(self.vectors):
+            raise ValueError("Index changed while it was being trained")
+        self.centroids, self.assignments = centroids, assignments
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: Optional[np.ndarray]) -> np.ndarray:
+        if centroids is None or not len(vectors):
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Insert or replace vectors by id."""
+        self.remove([i for i in ids if i in self._rows])
+
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        start = len(self.ids)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.assignments = np.concatenate([self.assignments, self._assign(vectors, self.centroids)])
+        self.deleted = np.concatenate([self.deleted, np.zeros(len(vectors), dtype=bool)])
+        for offset, vector_id in enumerate(ids):
+            self.ids.append(vector_id)
+            self._rows[vector_id] = start + offset
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """Tombstone vectors by id. Returns the number removed."""
+        removed = 0
+        for vector_id in ids:
+            row = self._rows.pop(vector_id, None)
+            if row is not None:
+                self.deleted[row] = True
+                removed += 1
+
+        if removed and self.deleted.sum() > len(self.deleted) // 4:
+            self.compact()
+        return removed
+
+    def compact(self) -> None:
+        """Physically drop tombstoned vectors."""
+        keep = ~self.deleted
+        self.vectors = self.vectors[keep]
+        self.assignments = self.assignments[keep]
+        self.ids = [vector_id for vector_id, alive in zip(self.ids, keep) if alive]
+        self.deleted = np.zeros(len(self.ids), dtype=bool)
+        self._rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+
+    def search(self, query: Sequence[float], k: int = 50, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (id, cosine similarity) pairs, best first."""
+        if not self._rows:
+            return []
+
+        q = self._normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+        probe = min(n_probe or self.n_probe, len(self.centroids)) if self.is_trained else 0
+
+        if probe and probe < len(self.centroids):
+            closest = np.argpartition(-(self.centroids @ q), probe - 1)[:probe]
+            rows = np.flatnonzero(~self.deleted & np.isin(self.assignments, closest))
+            scores = self.vectors[rows] @ q
+        else:
+            # Exact scan: score everything in place instead of gathering rows
+            rows = np.flatnonzero(~self.deleted)
+            scores = (self.vectors @ q)[rows]
+        if k < len(rows):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[rows[i]], float(scores[i])) for i in top]
+
+    def brute_force(self, query: Sequence[float], k: int = 50) -> List[Tuple[str, float]]:
+        """Exact search, used as the recall baseline."""
+        return self.search(query, k, n_probe=self.n_lists)
+
+    def save(self, path: str) -> None:
+        """Persist the index atomically to ``path`` (an .npz file)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            vectors=self.vectors,
+            assignments=self.assignments,
+            centroids=self.centroids if self.is_trained else np.zeros((0, self.dim), dtype=np.float32),
+            deleted=self.deleted,
+            meta=np.array(json.dumps({
+                "dim": self.dim,
+                "n_lists": self.n_lists,
+                "n_probe": self.n_probe,
+                "ids": self.ids,
+            })),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            index = cls(meta["dim"], meta["n_lists"], meta["n_probe"])
+            index.vectors = data["vectors"]
+            index.assignments = data["assignments"]
+            index.centroids = data["centroids"] if len(data["centroids"]) else None
+            index.deleted = data["deleted"]
+        index.ids = meta["ids"]
+        index._rows = {
+            vector_id: row for row, vector_id in enumerate(index.ids)
+            if not index.deleted[row]
+        }
+        return index
+
+
+EMBEDDING_TEXT_FIELDS = ("title", "company", "location", "description")
+
+
+def embedding_text(title: str, company: str, location: str, description: Optional[str]) -> str:
+    return f"{title} {company} {location} {description or ''}"
+
+
+def scraped_job_embedding_text(job: ScrapedJob) -> str:
+    return embedding_text(job.title, job.company, job.location, job.description)
+
+
+class VectorIndexService:
+    """Keeps an IVF index of ScrapedJob embeddings in sync with MongoDB."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.VECTOR_INDEX_PATH
+        self.index: Optional[IVFIndex] = None
+        self._lock = asyncio.Lock()
+        self._inserts_since_training = 0
+        self._dirty = False
+        self._last_saved = 0.0
+
+    @property
+    def _meta_path(self) -> str:
+        return f"{self.path}.embedder"
+
+    async def start(self) -> None:
+        """Load the index from disk, or build it from MongoDB if missing or stale."""
+        async with self._lock:
+            if self.index is not None:
+                return
+
+            try:
+                embedder_name = embedding_service.embedder.name
+                if os.path.exists(self.path) and os.path.exists(self._meta_path):
+                    with open(self._meta_path) as f:
+                        if f.read().strip() == embedder_name:
+                            self.index = await asyncio.to_thread(IVFIndex.load, self.path)
+                            logger.info(f"Loaded vector index with {len(self.index)} jobs from {self.path}")
+                            return
+
+                await self._rebuild()
+            except Exception as e:
+                logger.error(f"Failed to start vector index: {e}", exc_info=True)
+
+    async def stop(self) -> None:
+        """Flush pending changes to disk."""
+        async with self._lock:
+            if self.index is not None and self._dirty:
+                await self._save()
+
+    async def rebuild(self) -> None:
+        """Re-embed (where needed) every scraped job and retrain the index."""
+        async with self._lock:
+            await self._rebuild()
+
+    async def _rebuild(self) -> None:
+        # Near-duplicates would only crowd recommendations with copies of the same role
+        collection = get_collection(ScrapedJob)
+        embedder_name = embedding_service.embedder.name
+        current = {"duplicate_of": None, "embedding_model": embedder_name, "embedding_vector.0": {"$exists": True}}
+        stale = {"duplicate_of": None, "$or": [
+            {"embedding_model": {"$ne": embedder_name}},
+            {"embedding_vector.0": {"$exists": False}},
+        ]}
+
+        ids: List[str] = []
+        vectors: List[List[float]] = []
+
+        # Only jobs without a current vector need their text
+        batch = []
+        async for doc in collection.find(stale, {field: 1 for field in EMBEDDING_TEXT_FIELDS}):
+            batch.append(doc)
+            if len(batch) >= settings.VECTOR_INDEX_EMBED_BATCH:
+                await self._embed_documents(batch, ids, vectors)
+                batch = []
+        if batch:
+            await self._embed_documents(batch, ids, vectors)
+
+        async for doc in collection.find(current, {"embedding_vector": 1}):
+            ids.append(str(doc["_id"]))
+            vectors.append(doc["embedding_vector"])
+
+        dim = len(vectors[0]) if vectors else settings.EMBEDDING_DIMENSIONS
+        index = IVFIndex(dim, settings.VECTOR_INDEX_LISTS, settings.VECTOR_INDEX_PROBES)
+        if ids:
+            index.add(ids, np.array(vectors, dtype=np.float32))
+            await self._train(index)
+
+        self.index = index
+        self._inserts_since_training = 0
+        await self._save()
+        logger.info(f"Built vector index over {len(index)} jobs (trained={index.is_trained})")
+
+    async def _embed_documents(self, docs: List[dict], ids: List[str], vectors: List[List[float]]) -> None:
+        """Embed one batch of raw job documents, store the vectors and collect them for the index."""
+        texts = [embedding_text(*(doc.get(field) or "" for field in EMBEDDING_TEXT_FIELDS)) for doc in docs]
+        embedded = await embedding_service.embed_texts(texts)
+        await self._store_embeddings([doc["_id"] for doc in docs], embedded)
+        ids.extend(str(doc["_id"]) for doc in docs)
+        vectors.extend(embedded)
+
+    async def _store_embeddings(self, job_ids: List, vectors: List[List[float]]) -> None:
+        embedder_name = embedding_service.embedder.name
+        await get_collection(ScrapedJob).bulk_write([
+            UpdateOne({"_id": job_id}, {"$set": {"embedding_vector": vector, "embedding_model": embedder_name}})
+            for job_id, vector in zip(job_ids, vectors)
+        ], ordered=False)
+
+    async def _ensure_embeddings(self, jobs: List[ScrapedJob]) -> None:
+        embedder_name = embedding_service.embedder.name
+        stale = [job for job in jobs if not job.embedding_vector or job.embedding_model != embedder_name]
+        if not stale:
+            return
+
+        vectors = await embedding_service.embed_texts([scraped_job_embedding_text(job) for job in stale])
+        for job, vector in zip(stale, vectors):
+            job.embedding_vector = vector
+            job.embedding_model = embedder_name
+        await self._store_embeddings([job.id for job in stale], vectors)
+
+    @staticmethod
+    async def _train(index: IVFIndex) -> None:
+        """
+        Fit in a worker thread, then swap the result in on the event loop.
+
+        ``recommend`` searches without the lock, so the index must never be
+        seen with new centroids and old assignments.
+        """
+        centroids, assignments = await asyncio.to_thread(index.fit)
+        index.set_training(centroids, assignments)
+
+    async def _save(self) -> None:
+        await asyncio.to_thread(self.index.save, self.path)
+        with open(self._meta_path, "w") as f:
+            f.write(embedding_service.embedder.name)
+        self._dirty = False
+        self._last_saved = time.monotonic()
+
+    async def _mark_dirty(self) -> None:
+        """Persist at most every VECTOR_INDEX_SAVE_INTERVAL seconds; stop() flushes the rest."""
+        self._dirty = True
+        if time.monotonic() - self._last_saved >= settings.VECTOR_INDEX_SAVE_INTERVAL:
+            await self._save()
+
+    async def add_jobs(self, jobs: List[ScrapedJob]) -> None:
+        """Embed and index newly scraped jobs."""
+        if not jobs or self.index is None:
+            return
+
+        async with self._lock:
+            await self._ensure_embeddings(jobs)
+            self.index.add([str(job.id) for job in jobs], np.array([job.embedding_vector for job in jobs]))
+            self._inserts_since_training += len(jobs)
+
+            # Retrain once the index has grown enough for the centroids to drift
+            if self._inserts_since_training > max(len(self.index) // 2, MIN_VECTORS_PER_LIST * 2):
+                await self._train(self.index)
+                self._inserts_since_training = 0
+
+            await self._mark_dirty()
+
+    async def remove_jobs(self, job_ids: List[str]) -> int:
+        """Drop deleted jobs from the index."""
+        if self.index is None:
+            return 0
+
+        async with self._lock:
+            removed = self.index.remove([str(job_id) for job_id in job_ids])
+            if removed:
+                await self._mark_dirty()
+            return removed
+
+    async def recommend(self, resume: Resume, limit: int = 50) -> List[Tuple[ScrapedJob, float]]:
+        """Return the ``limit`` scraped jobs closest to the resume."""
+        if self.index is None:
+            await self.start()
+            if self.index is None:
+                return []
+
+        resume_vector = await embedding_service.ensure_resume_embedding(resume)
+        if len(resume_vector) != self.index.dim:
+            return []
+
+        hits = self.index.search(resume_vector, k=limit)
+        if not hits:
+            return []
+
+        jobs = await ScrapedJob.find({"_id": {"$in": [PydanticObjectId(job_id) for job_id, _ in hits]}}).to_list()
+        jobs_by_id = {str(job.id): job for job in jobs}
+        return [(jobs_by_id[job_id], score) for job_id, score in hits if job_id in jobs_by_id]
+
+
+vector_index_service = VectorIndexService()
@@ -0,0 +1,72 @@
+"""
+Benchmark LinkedIn card extraction: element handles vs a single page.evaluate.
+
+Serves a saved search results page (scripts/fixtures/linkedin_search.html)
+from a local HTTP server and times LinkedInScraper.extract_cards in both
+modes on the loaded page.
+
+Usage:
+    python scripts/benchmark_linkedin_extraction.py [--runs 20]
+"""
+import argparse
+import asyncio
+import functools
+import http.server
+import os
+import sys
+import threading
+import time
+
+# Add backend to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.automation.browser import BrowserPool
+from app.automation.scrapers.linkedin import LinkedInScraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def serve_fixtures() -> http.server.ThreadingHTTPServer:
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=FIXTURES)
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    server = serve_fixtures()
+    url = f"http://127.0.0.1:{server.server_address[1]}/linkedin_search.html"
+    pool = BrowserPool(max_contexts=1)
+    await pool.start()
+    try:
+        async with pool.page() as page:
+            await page.goto(url)
+            scraper = LinkedInScraper(page)
+
+            results = {}
+            print("   mode | cards | jobs | per page(ms)")
+            print("-" * 38)
+            for mode in ("handles", "evaluate"):
+                start = time.perf_counter()
+                for _ in range(args.runs):
+                    cards = await scraper.extract_cards(mode=mode)
+                elapsed_ms = (time.perf_counter() - start) * 1000 / args.runs
+
+                jobs = [job for job in map(scraper._to_job, cards) if job]
+                results[mode] = jobs
+                print(f"{mode:>8} | {len(cards):>5} | {len(jobs):>4} | {elapsed_ms:>12.1f}")
+
+            assert results["handles"] == results["evaluate"], "Extraction modes disagree"
+    finally:
+        await pool.stop()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
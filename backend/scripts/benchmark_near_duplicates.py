@@ -0,0 +1,120 @@
+"""
+Precision/recall of near-duplicate job detection on a labelled corpus.
+
+scripts/fixtures/near_duplicate_jobs.json holds the same postings as they
+appear on LinkedIn, Indeed and Naukri (reordered, truncated, retitled), plus
+different roles from the same company and the same role template at
+different companies. Jobs with the same ``cluster`` are duplicates.
+
+For each signature length, LSH banding and similarity threshold the script
+reports pairwise precision and recall (averaged over several MinHash seeds)
+and the share of pairs LSH had to compare. Exact Jaccard similarity is the
+baseline. ``(1/bands) ** (1/rows)`` is the similarity at which a pair becomes
+a candidate with probability of about one half. It should sit a little below
+the threshold.
+
+Usage:
+    python scripts/benchmark_near_duplicates.py [--shingle-size 3] [--seeds 5]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+# Add backend to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.near_duplicates import MinHasher, MinHashLSH, job_shingles
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "near_duplicate_jobs.json")
+THRESHOLDS = (0.25, 0.3, 0.35, 0.4, 0.45, 0.5)
+# (num_perm, bands)
+BANDINGS = ((128, 32), (128, 64), (96, 32), (120, 40), (144, 48))
+
+
+def precision_recall(predicted: set, actual: set):
+    true_positives = len(predicted & actual)
+    precision = true_positives / len(predicted) if predicted else 1.0
+    recall = true_positives / len(actual) if actual else 1.0
+    return precision, recall
+
+
+def lsh_pairs(signatures, num_perm: int, bands: int) -> set:
+    """Pairs that share at least one band bucket."""
+    index = MinHashLSH(num_perm, bands)
+    for i, signature in enumerate(signatures):
+        index.add(str(i), signature)
+
+    pairs = set()
+    for i, signature in enumerate(signatures):
+        pairs |= {(min(i, int(key)), max(i, int(key))) for key in index.candidates(signature) if int(key) != i}
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shingle-size", type=int, default=3)
+    parser.add_argument("--seeds", type=int, default=5, help="MinHash seeds to average over")
+    args = parser.parse_args()
+
+    with open(FIXTURE) as f:
+        jobs = json.load(f)
+
+    shingles = [job_shingles(job["title"], job["company"], job["description"], args.shingle_size) for job in jobs]
+    all_pairs = list(itertools.combinations(range(len(jobs)), 2))
+    actual = {pair for pair in all_pairs if jobs[pair[0]]["cluster"] == jobs[pair[1]]["cluster"]}
+    print(f"{len(jobs)} jobs, {len(all_pairs)} pairs, {len(actual)} duplicate pairs")
+
+    print("   method | perm | bands x rows | lsh at | threshold | precision | recall | compared")
+    print("-" * 87)
+    exact = {(i, j): len(shingles[i] & shingles[j]) / len(shingles[i] | shingles[j]) for i, j in all_pairs}
+    for threshold in THRESHOLDS:
+        predicted = {pair for pair, score in exact.items() if score >= threshold}
+        precision, recall = precision_recall(predicted, actual)
+        print(
+            f"{'exact':>9} | {'-':>4} | {'-':>12} | {'-':>6} | {threshold:>9.2f} | "
+            f"{precision:>9.2f} | {recall:>6.2f} | {1:>8.0%}"
+        )
+
+    signing_seconds = 0.0
+    signed = 0
+    runs = {}
+    for num_perm in sorted({num_perm for num_perm, _ in BANDINGS}):
+        runs[num_perm] = []
+        for seed in range(1, args.seeds + 1):
+            hasher = MinHasher(num_perm, seed=seed)
+            start = time.perf_counter()
+            runs[num_perm].append([hasher.signature(s) for s in shingles])
+            signing_seconds += time.perf_counter() - start
+            signed += len(jobs)
+
+    for num_perm, bands in BANDINGS:
+        rows = num_perm // bands
+        totals = {threshold: [0.0, 0.0] for threshold in THRESHOLDS}
+        compared = 0
+        for signatures in runs[num_perm]:
+            candidates = lsh_pairs(signatures, num_perm, bands)
+            compared += len(candidates)
+            for threshold in THRESHOLDS:
+                predicted = {
+                    (i, j) for i, j in candidates
+                    if MinHasher.similarity(signatures[i], signatures[j]) >= threshold
+                }
+                precision, recall = precision_recall(predicted, actual)
+                totals[threshold][0] += precision / args.seeds
+                totals[threshold][1] += recall / args.seeds
+
+        for threshold, (precision, recall) in totals.items():
+            print(
+                f"{'minhash':>9} | {num_perm:>4} | {f'{bands} x {rows}':>12} | {(1 / bands) ** (1 / rows):>6.2f} | "
+                f"{threshold:>9.2f} | {precision:>9.2f} | {recall:>6.2f} | {compared / args.seeds / len(all_pairs):>8.0%}"
+            )
+
+    print(f"\nsignatures: {signing_seconds * 1000 / signed:.2f} ms/job")
+
+
+if __name__ == "__main__":
+    main()
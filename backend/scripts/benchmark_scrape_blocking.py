@@ -0,0 +1,59 @@
+"""
+Compare LinkedIn scrape traffic with and without request blocking.
+
+Runs the same search with SCRAPER_BLOCK_RESOURCES off and on and reports
+requests, blocked requests, bytes received and page-load time.
+
+Usage:
+    python scripts/benchmark_scrape_blocking.py [--keyword "python developer"] [--location remote] [--runs 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+# Add backend to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.automation.browser import BrowserPool
+from app.automation.scrapers.linkedin import LinkedInScraper
+from app.core.config import settings
+
+
+async def scrape_once(pool: BrowserPool, keyword: str, location: str, block: bool):
+    settings.SCRAPER_BLOCK_RESOURCES = block
+    async with pool.page() as page:
+        scraper = LinkedInScraper(page)
+        await scraper.intercept_requests()
+        jobs = await scraper.scrape_jobs(keyword, location, limit=25)
+    return len(jobs), scraper.traffic.summary()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keyword", default="python developer")
+    parser.add_argument("--location", default="remote")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # Fresh context per scrape so neither mode benefits from the other's cache
+    pool = BrowserPool(max_contexts=1, max_uses_per_context=1)
+    await pool.start()
+    try:
+        print("blocking | jobs | requests | blocked |    KiB | load(ms)")
+        print("-" * 56)
+        for block in (False, True):
+            for _ in range(args.runs):
+                jobs, traffic = await scrape_once(pool, args.keyword, args.location, block)
+                print(
+                    f"{'on' if block else 'off':>8} | {jobs:>4} | {traffic['requests']:>8} | "
+                    f"{traffic['blocked']:>7} | {traffic['bytes_received'] / 1024:>6.0f} | "
+                    f"{traffic['page_load_ms'] or 0:>8.0f}"
+                )
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
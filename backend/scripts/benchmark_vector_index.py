@@ -0,0 +1,66 @@
+"""
+Benchmark the IVF job vector index against brute-force search.
+
+Reports build time, query latency and recall@k for several n_probe values
+on synthetic clustered embeddings (no database needed).
+
+Usage:
+    python scripts/benchmark_vector_index.py [--jobs 100000] [--dim 512]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from app.services.vector_index import IVFIndex
+
+
+def make_vectors(n: int, dim: int, noise: float, n_clusters: int = 500, seed: int = 0) -> np.ndarray:
+    """Clustered vectors, roughly like embeddings of related job postings."""
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(42).normal(size=(n_clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, size=n)
+    return centers[labels] + noise * rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--lists", type=int, default=256)
+    parser.add_argument("--noise", type=float, default=1.5, help="Within-cluster spread")
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.jobs, args.dim, args.noise)
+    queries = make_vectors(args.queries, args.dim, args.noise, seed=1)
+
+    index = IVFIndex(args.dim, n_lists=args.lists)
+    start = time.perf_counter()
+    index.add([str(i) for i in range(args.jobs)], vectors)
+    index.train()
+    print(f"Built index over {args.jobs} x {args.dim} in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    exact = [{job_id for job_id, _ in index.brute_force(q, args.k)} for q in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / args.queries
+    print(f"brute force: {brute_ms:.2f} ms/query")
+
+    print(f"{'n_probe':>8} | {'ms/query':>8} | recall@{args.k}")
+    for n_probe in (4, 8, 16, 32, 64):
+        start = time.perf_counter()
+        found = [{job_id for job_id, _ in index.search(q, args.k, n_probe=n_probe)} for q in queries]
+        ms = (time.perf_counter() - start) * 1000 / args.queries
+        recall = np.mean([len(f & e) / len(e) for f, e in zip(found, exact)])
+        print(f"{n_probe:>8} | {ms:>8.2f} | {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
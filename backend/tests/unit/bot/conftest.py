@@ -0,0 +1,20 @@
+"""
+Fixtures for bot engine unit tests.
+
+``bot_engine`` lives next to ``backend`` rather than inside it, so the
+repository root is put on ``sys.path`` for these tests.
+"""
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        if "tests/unit/bot/" in str(item.fspath).replace(os.sep, "/"):
+            item.add_marker(pytest.mark.bot)
@@ -0,0 +1,154 @@
+"""
+Async Resume Queue Tests
+Tests for the coroutine resume queue and the bot engine's LLM client settings.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+async_queue_module = pytest.importorskip("bot_engine.queue.async_resume_queue")
+gpt = pytest.importorskip("bot_engine.ai.gpt")
+AsyncResumeGenerationQueue = async_queue_module.AsyncResumeGenerationQueue
+
+
+class Generator:
+    """Scripted generate() that tracks concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, job_description, user_profile):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if job_description == "fail":
+                raise ValueError("bad prompt")
+            return f"resume for {job_description}"
+        finally:
+            self.in_flight -= 1
+
+
+def make_queue(**kwargs):
+    options = {"num_workers": 2, "max_queue_size": 10, "task_timeout": 5, "generate": Generator()}
+    options.update(kwargs)
+    queue = AsyncResumeGenerationQueue(**options)
+    queue.start()
+    return queue
+
+
+@pytest.mark.asyncio
+class TestAsyncResumeQueue:
+    """Test AsyncResumeGenerationQueue."""
+
+    async def test_futures_resolve_with_bounded_workers(self):
+        """Test every submit resolves and no more than num_workers run at once."""
+        generator = Generator()
+        queue = make_queue(generate=generator)
+        futures = [await queue.submit(f"t{i}", f"job {i}", {}) for i in range(6)]
+
+        results = await asyncio.gather(*futures)
+
+        assert [result["resume"] for result in results] == [f"resume for job {i}" for i in range(6)]
+        assert generator.max_in_flight == 2
+        queue.stop()
+
+    async def test_submit_waits_when_queue_is_full(self):
+        """Test submit() blocks once max_queue_size tasks are pending."""
+        queue = make_queue(num_workers=1, max_queue_size=1, generate=Generator(delay=0.1))
+        await queue.submit("running", "a", {})
+        await asyncio.sleep(0)  # let the worker take it
+        await queue.submit("pending", "b", {})
+
+        blocked = asyncio.create_task(queue.submit("blocked", "c", {}))
+        await asyncio.sleep(0.02)
+        assert not blocked.done()
+
+        await asyncio.wait_for(blocked, 1)
+        queue.stop()
+
+    async def test_failures_and_timeouts_resolve_as_failed(self):
+        """Test errors and slow generations resolve the future with a failed status."""
+        queue = make_queue(task_timeout=0.05, generate=Generator(delay=0.01))
+        failed = await (await queue.submit("t1", "fail", {}))
+        assert failed == {"status": "failed", "resume": None, "error": "bad prompt"}
+
+        queue.generate = Generator(delay=1)
+        timed_out = await (await queue.submit("t2", "slow", {}))
+        assert timed_out["status"] == "failed" and "timed out" in timed_out["error"]
+        queue.stop()
+
+    async def test_cancel_running_task(self):
+        """Test cancelling a running generation resolves it as cancelled and frees the worker."""
+        queue = make_queue(num_workers=1, generate=Generator(delay=1))
+        future = await queue.submit("t1", "a", {})
+        await asyncio.sleep(0.01)
+
+        assert queue.cancel("t1")
+        assert (await asyncio.wait_for(future, 1))["status"] == "cancelled"
+
+        queue.generate = Generator(delay=0)
+        assert (await asyncio.wait_for(await queue.submit("t2", "b", {}), 1))["status"] == "completed"
+        queue.stop()
+
+    async def test_stop_cancels_pending_futures(self):
+        """Test stop() cancels work nobody will pick up and rejects new submits."""
+        queue = make_queue(num_workers=1, generate=Generator(delay=1))
+        future = await queue.submit("t1", "a", {})
+        queue.stop()
+
+        assert future.cancelled()
+        assert (await queue.get_result("t1")) == {"status": "cancelled", "resume": None, "error": "cancelled"}
+        with pytest.raises(RuntimeError):
+            await queue.submit("t2", "b", {})
+
+
+class TestLLMConfig:
+    """Test how the bot engine picks its LLM provider."""
+
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        for name in ("OPENAI_API_KEY", "GROQ_API_KEY", "OPENAI_BASE_URL", "RESUME_MODEL"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setattr(gpt, "_async_client", None)
+
+    def test_groq_key_uses_groq_endpoint_and_model(self, monkeypatch):
+        """Test a Groq key alone targets Groq's OpenAI-compatible API with a Groq model."""
+        monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+        config = gpt.get_llm_config()
+        assert config == gpt.LLMConfig("gsk_test", gpt.GROQ_BASE_URL, gpt.GROQ_DEFAULT_MODEL)
+        assert str(gpt.get_async_client().base_url).rstrip("/") == gpt.GROQ_BASE_URL
+
+    def test_openai_key_takes_precedence(self, monkeypatch):
+        """Test OPENAI_API_KEY uses the default OpenAI endpoint and model."""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk_test")
+        monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+        assert gpt.get_llm_config() == gpt.LLMConfig("sk_test", None, gpt.OPENAI_DEFAULT_MODEL)
+
+    def test_overrides_and_missing_key(self, monkeypatch):
+        """Test OPENAI_BASE_URL and RESUME_MODEL win, and no key means no client."""
+        assert gpt.get_async_client() is None
+
+        monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://localhost:8000/v1")
+        monkeypatch.setenv("RESUME_MODEL", "custom")
+        assert gpt.get_llm_config() == gpt.LLMConfig("gsk_test", "http://localhost:8000/v1", "custom")
+
+    @pytest.mark.asyncio
+    async def test_generation_requests_configured_model(self, monkeypatch):
+        """Test generate_resume_gpt_async sends the provider's model."""
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="resume"))])
+
+        monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(gpt, "get_async_client", lambda: client)
+
+        assert await gpt.generate_resume_gpt_async("Python developer", {"name": "Ada"}) == "resume"
+        assert requests[0]["model"] == gpt.GROQ_DEFAULT_MODEL
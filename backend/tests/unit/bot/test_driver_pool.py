@@ -0,0 +1,199 @@
+"""
+Driver Pool Tests
+Tests for checking out, resetting, recycling and replacing pooled WebDrivers.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+driver_pool = pytest.importorskip("bot_engine.scrapers.driver_pool")
+WebDriverPool = driver_pool.WebDriverPool
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver; records what the pool does to it."""
+
+    def __init__(self, n):
+        self.n = n
+        self.visited = []
+        self.cookies_cleared = 0
+        self.quit_called = False
+        self.crashed = False
+
+    def execute_script(self, script):
+        if self.crashed or self.quit_called:
+            raise RuntimeError("invalid session id")
+        return 1
+
+    def delete_all_cookies(self):
+        if self.crashed:
+            raise RuntimeError("invalid session id")
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        if self.crashed:
+            raise RuntimeError("invalid session id")
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        return SimpleNamespace(text=f" {value} from driver {self.n} ")
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.drivers = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self._lock:
+            driver = FakeDriver(len(self.drivers))
+            self.drivers.append(driver)
+        return driver
+
+
+class TestWebDriverPool:
+    """Test WebDriverPool."""
+
+    def test_driver_is_reused_and_reset_between_pages(self):
+        """Test one browser serves consecutive pages and is cleaned after each."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=2)
+
+        for url in ("https://a", "https://b", "https://c"):
+            with pool.driver() as driver:
+                driver.get(url)
+
+        [driver] = factory.drivers
+        assert driver.visited == ["https://a", "about:blank", "https://b", "about:blank", "https://c", "about:blank"]
+        assert driver.cookies_cleared == 3
+        assert pool.stats()["drivers_started"] == 1 and pool.stats()["pages"] == 3
+
+    def test_pool_never_exceeds_size(self):
+        """Test concurrent checkouts are capped at the pool size."""
+        factory = FakeFactory(delay=0.01)
+        pool = WebDriverPool(factory, size=2)
+        in_use = []
+        peak = []
+        lock = threading.Lock()
+
+        def scrape(_):
+            with pool.driver():
+                with lock:
+                    in_use.append(1)
+                    peak.append(len(in_use))
+                time.sleep(0.01)
+                with lock:
+                    in_use.pop()
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(scrape, range(12)))
+
+        assert max(peak) == 2
+        assert len(factory.drivers) == 2
+        assert pool.stats()["pages"] == 12 and pool.stats()["in_use"] == 0
+
+    def test_driver_recycled_after_max_pages(self):
+        """Test a browser is quit and replaced once it has served max_pages_per_driver pages."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=1, max_pages_per_driver=2)
+
+        for _ in range(5):
+            with pool.driver():
+                pass
+
+        assert len(factory.drivers) == 3
+        assert [d.quit_called for d in factory.drivers] == [True, True, False]
+        assert pool.stats()["recycled"] == 2
+
+    def test_crashed_driver_is_replaced(self):
+        """Test a browser that crashed during a page is quit and not handed out again."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=1)
+
+        with pytest.raises(RuntimeError):
+            with pool.driver() as driver:
+                driver.crashed = True
+                driver.get("https://a")
+
+        with pool.driver() as driver:
+            assert driver is factory.drivers[1]
+        assert factory.drivers[0].quit_called
+        assert pool.stats()["crashed"] == 1
+
+    def test_page_error_keeps_healthy_driver(self):
+        """Test an exception from the scrape itself does not cost a healthy browser."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=1)
+
+        with pytest.raises(ValueError):
+            with pool.driver():
+                raise ValueError("selector missing")
+
+        with pool.driver() as driver:
+            assert driver is factory.drivers[0]
+        assert pool.stats()["crashed"] == 0
+
+    def test_idle_driver_failing_health_check_is_replaced(self):
+        """Test a browser that died while idle is discarded at checkout."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=1)
+        with pool.driver():
+            pass
+        factory.drivers[0].crashed = True
+
+        with pool.driver() as driver:
+            assert driver is factory.drivers[1]
+        assert pool.stats()["crashed"] == 1
+
+    def test_shutdown_quits_idle_and_returned_drivers(self):
+        """Test shutdown quits idle browsers now and in-use browsers when they come back."""
+        factory = FakeFactory()
+        pool = WebDriverPool(factory, size=2)
+        with pool.driver():
+            pass
+
+        with pool.driver() as busy:
+            with pool.driver() as other:
+                pass
+            pool.shutdown()
+            assert other.quit_called
+            assert not busy.quit_called
+        assert busy.quit_called
+
+        with pytest.raises(RuntimeError):
+            with pool.driver():
+                pass
+
+
+class TestParallelScraperPool:
+    """Test ParallelScraper scrapes through the pool."""
+
+    def test_scrape_job_reuses_pooled_driver(self, monkeypatch):
+        """Test consecutive scrapes share one browser and extract the page fields."""
+        parallel_scraper = pytest.importorskip("bot_engine.scrapers.parallel_scraper")
+        factory = FakeFactory()
+        monkeypatch.setattr(parallel_scraper.ParallelScraper, "_create_driver", lambda self: factory())
+        scraper = parallel_scraper.ParallelScraper(max_workers=2)
+        try:
+            first = scraper._scrape_job("https://jobs.example/1")
+            second = scraper._scrape_job("https://jobs.example/2")
+        finally:
+            scraper.shutdown()
+
+        assert first == {
+            "url": "https://jobs.example/1",
+            "title": "//h1 from driver 0",
+            "company": "//div[@class='company'] from driver 0",
+            "description": "//div[@class='description'] from driver 0",
+            "location": "//span[@class='location'] from driver 0",
+        }
+        assert second["url"] == "https://jobs.example/2"
+        assert len(factory.drivers) == 1 and factory.drivers[0].quit_called
@@ -0,0 +1,115 @@
+"""
+Durable Queue Tests
+Tests for acking, retrying and dead-lettering bot jobs, and the queue worker.
+"""
+import asyncio
+
+import pytest
+
+durable = pytest.importorskip("bot_engine.queue.durable")
+InMemoryJobQueue = durable.InMemoryJobQueue
+
+
+@pytest.mark.asyncio
+class TestInMemoryJobQueue:
+    """Test InMemoryJobQueue."""
+
+    async def test_ack_removes_message(self):
+        """Test an acknowledged message is never delivered again."""
+        queue = InMemoryJobQueue(visibility_timeout=0.01)
+        await queue.enqueue({"job": 1})
+        [message] = await queue.dequeue("worker", block_ms=10)
+        await queue.ack(message)
+
+        await asyncio.sleep(0.02)
+        assert await queue.dequeue("worker", block_ms=10) == []
+
+    async def test_nack_retries_then_dead_letters(self):
+        """Test a failing message is redelivered until max_attempts, then dead-lettered."""
+        queue = InMemoryJobQueue(max_attempts=3)
+        await queue.enqueue({"job": 1}, idempotency_key="u1:j1")
+
+        attempts = []
+        for _ in range(3):
+            [message] = await queue.dequeue("worker", block_ms=10)
+            attempts.append(message.attempts)
+            await queue.nack(message, f"failed {message.attempts}")
+
+        assert attempts == [1, 2, 3]
+        assert await queue.dequeue("worker", block_ms=10) == []
+        [dead] = await queue.dead_letters()
+        assert dead.payload == {"job": 1} and dead.error == "failed 3"
+        # Dead-lettering frees the idempotency key for a manual re-enqueue
+        assert await queue.enqueue({"job": 1}, idempotency_key="u1:j1") is not None
+
+    async def test_unacked_message_is_redelivered_after_visibility_timeout(self):
+        """Test a crashed consumer's message goes to another consumer."""
+        queue = InMemoryJobQueue(visibility_timeout=0.02, max_attempts=2)
+        await queue.enqueue({"job": 1})
+        [first] = await queue.dequeue("crashed", block_ms=10)
+        assert await queue.dequeue("other", block_ms=10) == []
+
+        await asyncio.sleep(0.03)
+        [second] = await queue.dequeue("other", block_ms=10)
+        assert second.id == first.id and second.attempts == 2
+
+        await asyncio.sleep(0.03)
+        assert await queue.dequeue("other", block_ms=10) == []
+        assert (await queue.dead_letters())[0].error == "visibility timeout expired"
+
+    async def test_idempotency_key_deduplicates(self):
+        """Test the same user/job is only queued once."""
+        queue = InMemoryJobQueue()
+        key = durable.job_idempotency_key("u1", "j1")
+        assert await queue.enqueue({"job": 1}, idempotency_key=key) is not None
+        assert await queue.enqueue({"job": 1}, idempotency_key=key) is None
+        assert len(await queue.dequeue("worker", count=5, block_ms=10)) == 1
+
+    async def test_dequeue_wakes_on_enqueue(self):
+        """Test a blocked dequeue returns as soon as a message arrives."""
+        queue = InMemoryJobQueue()
+        waiting = asyncio.create_task(queue.dequeue("worker", block_ms=1000))
+        await asyncio.sleep(0.01)
+        await queue.enqueue({"job": 1})
+        assert len(await asyncio.wait_for(waiting, 0.5)) == 1
+
+
+@pytest.mark.asyncio
+class TestQueueWorker:
+    """Test BotEngine.run_worker against the in-memory queue."""
+
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        engine_module = pytest.importorskip("bot_engine.engine")
+        engine = engine_module.BotEngine(max_concurrent_jobs=2)
+        yield engine
+        engine.executor.shutdown(wait=False)
+
+    async def test_successes_are_acked_and_failures_dead_lettered(self, engine, monkeypatch):
+        """Test processed jobs are acked and a job that keeps failing ends up dead-lettered."""
+        processed = []
+
+        async def process(job, user_profile):
+            processed.append(job["id"])
+            if job["id"] == "bad":
+                raise RuntimeError("smtp down")
+            return True
+
+        monkeypatch.setattr(engine, "_process_single_job", process)
+        queue = InMemoryJobQueue(max_attempts=2)
+        for job_id in ("a", "bad", "b"):
+            await queue.enqueue({"job": {"id": job_id}, "user_profile": {}})
+
+        stop = asyncio.Event()
+        worker = asyncio.create_task(engine.run_worker(queue, consumer="test", stop_event=stop))
+        for _ in range(100):
+            if await queue.dead_letters():
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(worker, 2)
+
+        assert sorted(processed) == ["a", "b", "bad", "bad"]
+        [dead] = await queue.dead_letters()
+        assert dead.payload["job"]["id"] == "bad" and dead.error == "smtp down"
+        assert queue._in_flight == {} and queue._ready == []
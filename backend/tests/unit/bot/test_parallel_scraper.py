@@ -0,0 +1,119 @@
+"""
+Parallel Scraper Tests
+Tests for scrape_one and iter_jobs streaming results without blocking the event loop.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+parallel_scraper = pytest.importorskip("bot_engine.scrapers.parallel_scraper")
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    scraper = parallel_scraper.ParallelScraper(max_workers=4)
+
+    async def no_wait(url=None):
+        return None
+
+    monkeypatch.setattr(scraper.rate_limiter, "acquire", no_wait)
+    yield scraper
+    scraper.shutdown()
+
+
+def fake_scrape(delays, results=None):
+    """A blocking _scrape_job that sleeps per URL and records which URLs started."""
+    started = []
+    lock = threading.Lock()
+
+    def scrape(url):
+        with lock:
+            started.append(url)
+        time.sleep(delays[url])
+        if results is not None and url in results:
+            result = results[url]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return {"url": url}
+
+    scrape.started = started
+    return scrape
+
+
+@pytest.mark.asyncio
+class TestScrapeOne:
+    """Test ParallelScraper.scrape_one."""
+
+    async def test_does_not_block_event_loop(self, scraper, monkeypatch):
+        """Test the loop keeps running while a page is scraped in the thread pool."""
+        monkeypatch.setattr(scraper, "_scrape_job", fake_scrape({"https://a": 0.2}))
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        try:
+            assert await scraper.scrape_one("https://a") == {"url": "https://a"}
+        finally:
+            beat.cancel()
+        assert ticks >= 10
+
+    async def test_timeout(self, scraper, monkeypatch):
+        """Test a page that takes too long raises TimeoutError."""
+        monkeypatch.setattr(scraper, "_scrape_job", fake_scrape({"https://slow": 0.3}))
+        with pytest.raises(asyncio.TimeoutError):
+            await scraper.scrape_one("https://slow", timeout=0.05)
+
+
+@pytest.mark.asyncio
+class TestIterJobs:
+    """Test ParallelScraper.iter_jobs."""
+
+    async def test_yields_in_completion_order(self, scraper, monkeypatch):
+        """Test a fast page is yielded before a slow one submitted earlier."""
+        delays = {"https://slow": 0.2, "https://fast": 0.01, "https://mid": 0.1}
+        monkeypatch.setattr(scraper, "_scrape_job", fake_scrape(delays))
+
+        urls = [job["url"] async for job in scraper.iter_jobs(list(delays))]
+        assert urls == ["https://fast", "https://mid", "https://slow"]
+
+    async def test_failed_and_empty_pages_are_skipped(self, scraper, monkeypatch):
+        """Test None results, exceptions and timeouts are dropped without ending the stream."""
+        delays = {"https://ok": 0.01, "https://none": 0.01, "https://error": 0.01, "https://slow": 0.5}
+        results = {"https://none": None, "https://error": RuntimeError("boom")}
+        monkeypatch.setattr(scraper, "_scrape_job", fake_scrape(delays, results))
+
+        jobs = [job async for job in scraper.iter_jobs(list(delays), timeout=0.1)]
+        assert jobs == [{"url": "https://ok"}]
+
+    async def test_breaking_out_cancels_pending_urls(self, scraper, monkeypatch):
+        """Test URLs still waiting for the rate limiter are never scraped after the consumer stops."""
+        async def slow_limiter(url=None):
+            if url != "https://first":
+                await asyncio.sleep(0.2)
+
+        monkeypatch.setattr(scraper.rate_limiter, "acquire", slow_limiter)
+        delays = {url: 0.0 for url in ("https://first", "https://b", "https://c")}
+        scrape = fake_scrape(delays)
+        monkeypatch.setattr(scraper, "_scrape_job", scrape)
+
+        async for job in scraper.iter_jobs(list(delays)):
+            assert job["url"] == "https://first"
+            break
+
+        await asyncio.sleep(0.3)
+        assert scrape.started == ["https://first"]
+
+    async def test_scrape_jobs_collects_stream(self, scraper, monkeypatch):
+        """Test scrape_jobs returns every scraped job."""
+        delays = {"https://a": 0.02, "https://b": 0.01}
+        monkeypatch.setattr(scraper, "_scrape_job", fake_scrape(delays))
+        jobs = await scraper.scrape_jobs(list(delays))
+        assert sorted(job["url"] for job in jobs) == ["https://a", "https://b"]
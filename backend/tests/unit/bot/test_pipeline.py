@@ -0,0 +1,109 @@
+"""
+Pipeline Tests
+Tests for draining, dropping, failures and backpressure in the staged bot pipeline.
+"""
+import asyncio
+
+import pytest
+
+pipeline = pytest.importorskip("bot_engine.pipeline")
+Pipeline = pipeline.Pipeline
+Stage = pipeline.Stage
+
+
+def delayed(fn, delay=0.0):
+    async def handler(item):
+        await asyncio.sleep(delay)
+        return fn(item)
+    return handler
+
+
+@pytest.mark.asyncio
+class TestPipeline:
+    """Test Pipeline.run."""
+
+    async def test_drains_every_item_through_every_stage(self):
+        """Test run returns only after all items have passed the last stage."""
+        stages = [
+            Stage("double", delayed(lambda x: x * 2, 0.005), concurrency=3, queue_size=2),
+            Stage("slow", delayed(lambda x: x + 1, 0.01), concurrency=2, queue_size=2),
+            Stage("last", delayed(lambda x: x, 0.02), concurrency=1, queue_size=1),
+        ]
+        result = await Pipeline(stages).run(range(20))
+
+        assert sorted(result.outputs) == [x * 2 + 1 for x in range(20)]
+        assert all(stats["processed"] == 20 and stats["in_flight"] == 0 for stats in result.stages.values())
+        assert result.first_output_seconds is not None and result.first_output_seconds < result.elapsed_seconds
+
+    async def test_dropped_and_failed_items_are_counted(self):
+        """Test None drops an item and an exception is recorded without stopping the pipeline."""
+        def check(x):
+            if x == 3:
+                raise ValueError("bad item")
+            return None if x % 2 else x
+
+        stages = [Stage("check", delayed(check), concurrency=2), Stage("out", delayed(lambda x: x))]
+        result = await Pipeline(stages, describe=lambda x: f"item-{x}").run(range(6))
+
+        assert sorted(result.outputs) == [0, 2, 4]
+        assert result.stages["check"]["processed"] == 3
+        assert result.stages["check"]["dropped"] == 2
+        assert result.stages["check"]["failed"] == 1
+        assert result.errors == [{"stage": "check", "item": "item-3", "error": "bad item"}]
+        assert result.stages["out"]["processed"] == 3
+
+    async def test_slow_stage_applies_backpressure(self):
+        """Test queues never grow past queue_size and the source is consumed lazily."""
+        pulled = []
+
+        async def source():
+            for i in range(30):
+                pulled.append(i)
+                yield i
+
+        stages = [
+            Stage("fast", delayed(lambda x: x), concurrency=4, queue_size=3),
+            Stage("slow", delayed(lambda x: x, 0.01), concurrency=1, queue_size=2),
+        ]
+        runner = Pipeline(stages)
+        task = asyncio.create_task(runner.run(source()))
+        await asyncio.sleep(0.05)
+        # About 5 items reach the slow stage in 50ms; the fast stage and the
+        # source stay a few items ahead of it and no further
+        assert len(pulled) < 20
+        result = await task
+
+        assert len(result.outputs) == 30
+        assert result.stages["fast"]["max_queue_depth"] <= 3
+        assert result.stages["slow"]["max_queue_depth"] <= 2
+
+    async def test_outputs_stream_before_source_is_exhausted(self):
+        """Test the first item finishes while later items are still being produced."""
+        first_output_at = []
+
+        async def source():
+            for i in range(5):
+                yield i
+                await asyncio.sleep(0.02)
+
+        async def record(item):
+            first_output_at.append(item)
+            return item
+
+        result = await Pipeline([Stage("only", record)]).run(source())
+        assert result.first_output_seconds < 0.05
+        assert result.elapsed_seconds >= 0.08
+        assert first_output_at == [0, 1, 2, 3, 4]
+
+    async def test_cancelling_run_stops_workers(self):
+        """Test cancelling run leaves no worker tasks behind."""
+        stages = [Stage("hang", delayed(lambda x: x, 10), concurrency=2)]
+        task = asyncio.create_task(Pipeline(stages).run(range(3)))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await asyncio.sleep(0)
+        leftover = [t for t in asyncio.all_tasks() if t.get_name().startswith("pipeline-")]
+        assert leftover == []
@@ -0,0 +1,81 @@
+"""
+Rate Limiter Tests
+Tests for the per-domain token bucket used by the scrapers.
+"""
+import asyncio
+
+import pytest
+
+parallel_scraper = pytest.importorskip("bot_engine.scrapers.parallel_scraper")
+RateLimiter = parallel_scraper.RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(parallel_scraper.time, "monotonic", clock)
+    return clock
+
+
+class TestReserve:
+    """Test RateLimiter.reserve."""
+
+    def test_burst_then_spaced_by_rate(self, clock):
+        """Test a domain gets its burst immediately, then one token per 1/rate seconds."""
+        limiter = RateLimiter(max_requests=10, time_window=60, burst=3)
+        waits = [limiter.reserve("https://jobs.example/a") for _ in range(5)]
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(6.0)
+        assert waits[4] == pytest.approx(12.0)
+
+    def test_tokens_refill_over_time(self, clock):
+        """Test idle time refills tokens up to the burst size."""
+        limiter = RateLimiter(max_requests=10, time_window=60, burst=2)
+        limiter.reserve("https://a.example")
+        limiter.reserve("https://a.example")
+        assert limiter.reserve("https://a.example") == pytest.approx(6.0)
+
+        clock.now += 600
+        assert [limiter.reserve("https://a.example") for _ in range(2)] == [0.0, 0.0]
+        assert limiter.reserve("https://a.example") > 0
+
+    def test_domains_are_limited_independently(self, clock):
+        """Test one busy domain does not delay another."""
+        limiter = RateLimiter(max_requests=1, time_window=60, burst=1)
+        assert limiter.reserve("https://linkedin.com/jobs/1") == 0.0
+        assert limiter.reserve("https://linkedin.com/jobs/2") == pytest.approx(60.0)
+        assert limiter.reserve("https://indeed.com/jobs/1") == 0.0
+        assert limiter.reserve(None) == 0.0
+
+    def test_burst_defaults_to_max_requests(self, clock):
+        """Test max_requests requests go through back to back without a burst setting."""
+        limiter = RateLimiter(max_requests=4, time_window=60)
+        assert [limiter.reserve("https://a.example") for _ in range(4)] == [0.0] * 4
+        assert limiter.reserve("https://a.example") > 0
+
+
+@pytest.mark.asyncio
+class TestAcquire:
+    """Test RateLimiter.acquire."""
+
+    async def test_concurrent_callers_are_spaced_not_serialised(self, monkeypatch):
+        """Test concurrent acquires each sleep for their own slot plus jitter."""
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(parallel_scraper.asyncio, "sleep", fake_sleep)
+        limiter = RateLimiter(max_requests=60, time_window=60, burst=1, jitter=(0.5, 0.5))
+
+        await asyncio.gather(*(limiter.acquire("https://a.example/x") for _ in range(3)))
+
+        assert sorted(sleeps) == pytest.approx([0.5, 1.5, 2.5], abs=0.05)
@@ -0,0 +1,106 @@
+"""
+Resume Queue Tests
+Tests for the threaded resume queue's futures and how the engine awaits them.
+"""
+import asyncio
+import time
+
+import pytest
+
+resume_queue_module = pytest.importorskip("bot_engine.queue.resume_queue")
+engine_module = pytest.importorskip("bot_engine.engine")
+
+
+class FastQueue(resume_queue_module.ResumeGenerationQueue):
+    """Threaded queue whose generation echoes the job description."""
+
+    def __init__(self, delay=0.01, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def _generate_resume(self, job_description, user_profile):
+        time.sleep(self.delay)
+        if job_description == "fail":
+            raise ValueError("generation failed")
+        return f"resume for {job_description}"
+
+    async def submit(self, task_id, job_description, user_profile):
+        future = await super().submit(task_id, job_description, user_profile)
+        # Yield like a full async queue does, so other submits interleave
+        await asyncio.sleep(0.005)
+        return future
+
+
+@pytest.fixture
+def queue():
+    queue = FastQueue(num_workers=2)
+    queue.start()
+    yield queue
+    queue.stop()
+
+
+@pytest.mark.asyncio
+class TestResumeGenerationQueue:
+    """Test the threaded queue."""
+
+    async def test_submit_returns_resolving_future(self, queue):
+        """Test the future from submit() resolves on the event loop with the result."""
+        future = await queue.submit("t1", "backend role", {})
+        result = await asyncio.wait_for(future, 5)
+        assert result == {"status": "completed", "resume": "resume for backend role", "error": None}
+
+    async def test_failure_is_reported_in_result(self, queue):
+        """Test a generation error resolves the future with a failed status."""
+        result = await asyncio.wait_for(await queue.submit("t1", "fail", {}), 5)
+        assert result["status"] == "failed" and result["error"] == "generation failed"
+
+    async def test_get_result_evicts_and_discard_forgets(self, queue):
+        """Test consumed results are not kept around."""
+        await queue.submit("t1", "a", {})
+        assert (await queue.get_result("t1", timeout=5))["status"] == "completed"
+        assert "t1" not in queue.results
+        assert await queue.get_result("t1", timeout=1) is None
+
+        future = await queue.submit("t2", "b", {})
+        await asyncio.wait_for(future, 5)
+        queue.discard("t2")
+        assert "t2" not in queue.results and "t2" not in queue._completed_at
+
+    async def test_cancel_pending_task(self):
+        """Test a task still waiting in the queue can be cancelled."""
+        queue = FastQueue(delay=0.2, num_workers=1)
+        queue.start()
+        try:
+            await queue.submit("busy", "a", {})
+            future = await queue.submit("waiting", "b", {})
+            assert queue.cancel("waiting")
+            assert (await future)["status"] == "cancelled"
+            assert not queue.cancel("waiting")
+        finally:
+            queue.stop()
+
+
+@pytest.mark.asyncio
+class TestEngineResumeGeneration:
+    """Test BotEngine._generate_resume."""
+
+    async def test_same_job_id_gets_its_own_result(self, queue, monkeypatch):
+        """Test concurrent generations for the same job id never share a result."""
+        monkeypatch.setattr(engine_module, "resume_queue", queue)
+        engine = engine_module.BotEngine(max_concurrent_jobs=2)
+
+        first, second = await asyncio.gather(
+            engine._generate_resume({"id": "42", "description": "first"}, {}),
+            engine._generate_resume({"id": "42", "description": "second"}, {}),
+        )
+
+        assert (first, second) == ("resume for first", "resume for second")
+        assert queue.results == {}
+
+    async def test_failed_generation_raises(self, queue, monkeypatch):
+        """Test a failed generation raises instead of returning a resume."""
+        monkeypatch.setattr(engine_module, "resume_queue", queue)
+        engine = engine_module.BotEngine()
+
+        with pytest.raises(Exception, match="generation failed"):
+            await engine._generate_resume({"id": "1", "description": "fail"}, {})
@@ -0,0 +1,80 @@
+"""
+TF-IDF Index Tests
+Tests for fitting, appending to and reloading the persistent job index.
+"""
+import threading
+
+import pytest
+
+tfidf_index = pytest.importorskip("bot_engine.ai.tfidf_index")
+TfidfJobIndex = tfidf_index.TfidfJobIndex
+
+
+def make_jobs(start, count, text="python developer"):
+    return [{"id": f"job{i}", "description": f"{text} skill{i}"} for i in range(start, start + count)]
+
+
+class TestTfidfJobIndex:
+    """Test TfidfJobIndex."""
+
+    def test_first_batch_becomes_corpus(self, tmp_path):
+        """Test add_jobs on an empty index fits it on that batch."""
+        index = TfidfJobIndex(str(tmp_path))
+        assert index.add_jobs(make_jobs(0, 3)) == 3
+        assert len(index) == 3
+        assert index.rank("skill1 python", top_k=1)[0][0] == "job1"
+
+    def test_append_skips_known_ids(self, tmp_path):
+        """Test appended jobs are ranked and duplicates are ignored."""
+        index = TfidfJobIndex(str(tmp_path))
+        index.fit(make_jobs(0, 3))
+        assert index.add_jobs(make_jobs(2, 3)) == 2
+        assert len(index) == 5
+        # skill4 is not in the fitted vocabulary, but the shared terms are
+        assert "job4" in {job_id for job_id, _ in index.rank("python developer", top_k=None)}
+        assert index.rank("skill4") == []
+
+    def test_concurrent_first_batches_are_all_kept(self, tmp_path):
+        """Test racing add_jobs calls on an empty index lose no jobs."""
+        index = TfidfJobIndex(str(tmp_path))
+        start = threading.Barrier(4)
+
+        def add(batch):
+            start.wait()
+            index.add_jobs(make_jobs(batch * 10, 10))
+
+        threads = [threading.Thread(target=add, args=(batch,)) for batch in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(index) == 40
+        assert {job_id for job_id, _ in index.rank("python developer", top_k=None)} == {f"job{i}" for i in range(40)}
+
+    def test_empty_vocabulary_is_skipped(self, tmp_path):
+        """Test fitting on no jobs or stop words only leaves the index unfitted."""
+        index = TfidfJobIndex(str(tmp_path))
+        index.fit([])
+        assert index.add_jobs([{"id": "a", "description": "the and of"}]) == 0
+        assert len(index) == 0
+        assert index.rank("python") == []
+
+        assert index.add_jobs(make_jobs(0, 2)) == 2
+
+    def test_refit_keeps_live_version_on_empty_corpus(self, tmp_path):
+        """Test an empty refit does not drop the live version."""
+        index = TfidfJobIndex(str(tmp_path))
+        index.fit(make_jobs(0, 2))
+        index.fit([])
+        assert len(index) == 2
+
+    def test_reload_from_disk(self, tmp_path):
+        """Test a new instance loads the fitted and appended segments."""
+        index = TfidfJobIndex(str(tmp_path))
+        index.fit(make_jobs(0, 2))
+        index.add_jobs(make_jobs(2, 2))
+
+        reloaded = TfidfJobIndex(str(tmp_path))
+        assert len(reloaded) == 4
+        assert reloaded.rank("skill3", top_k=1) == index.rank("skill3", top_k=1)
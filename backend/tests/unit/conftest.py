@@ -0,0 +1,148 @@
+"""
+Fixtures for unit tests.
+
+Unit tests exercise services in isolation and never touch MongoDB or Redis:
+the database fixtures from the parent conftest are overridden with no-ops,
+Redis-backed caches get an in-memory backend and scraped jobs are written
+to an in-memory collection.
+"""
+import fnmatch
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.models.job import ScrapedJob
+
+
+@pytest.fixture
+def init_test_db():
+    """No database for unit tests."""
+    return None
+
+
+@pytest.fixture(autouse=True)
+def clean_db(init_test_db):
+    return None
+
+
+class InMemoryCacheBackend:
+    """Stand-in for ``app.core.cache.Cache`` (ignores expiry)."""
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, expire: int = 300) -> bool:
+        self.data[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        self.data.pop(key, None)
+        return True
+
+    async def clear_pattern(self, pattern: str) -> int:
+        keys = [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+        for key in keys:
+            del self.data[key]
+        return len(keys)
+
+
+@pytest.fixture
+def cache_backend() -> InMemoryCacheBackend:
+    return InMemoryCacheBackend()
+
+
+class InMemoryCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+
+    def limit(self, count: int) -> "InMemoryCursor":
+        return InMemoryCursor(self.docs[:count])
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class InMemoryScrapedJobCollection:
+    """
+    Stand-in for the scraped_jobs collection: ``bulk_write`` of link upserts
+    with ``$setOnInsert`` (and ``$set`` updates by ``_id``) and a unique
+    ``link`` index, plus ``find`` and ``delete_many`` with ``$in``/``$lt``
+    filters.
+
+    Links in ``race_links`` are inserted by a "concurrent scrape" just before
+    the write, so their upserts fail with a duplicate-key error.
+    """
+
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.race_links: Set[str] = set()
+        self.other_errors: Set[str] = set()
+        self.writes: List[list] = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes.append(operations)
+        upserted, errors, matched = {}, [], 0
+        for index, operation in enumerate(operations):
+            if "_id" in operation._filter:
+                for doc in self.docs.values():
+                    if doc["_id"] == operation._filter["_id"]:
+                        doc.update(operation._doc["$set"])
+                        matched += 1
+                continue
+            link = operation._filter["link"]
+            if link in self.other_errors:
+                errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+            elif link in self.race_links:
+                self.race_links.discard(link)
+                self.docs[link] = {"_id": f"racer-{link}", "link": link}
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key error"})
+            elif link in self.docs:
+                matched += 1
+            else:
+                doc = dict(operation._doc["$setOnInsert"])
+                self.docs[link] = doc
+                upserted[index] = doc["_id"]
+
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors,
+                "upserted": [{"index": index, "_id": _id} for index, _id in upserted.items()],
+                "nMatched": matched,
+            })
+        return SimpleNamespace(upserted_ids=upserted, matched_count=matched)
+
+    @staticmethod
+    def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+        for field, condition in query.items():
+            value = doc.get(field)
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$lt" in condition and not (value is not None and value < condition["$lt"]):
+                return False
+        return True
+
+    def find(self, query: Dict[str, Any], projection: Optional[Dict[str, int]] = None) -> InMemoryCursor:
+        return InMemoryCursor([
+            {field: doc[field] for field in projection if field in doc} if projection else dict(doc)
+            for doc in self.docs.values() if self._matches(doc, query)
+        ])
+
+    async def delete_many(self, query: Dict[str, Any]):
+        links = [link for link, doc in self.docs.items() if self._matches(doc, query)]
+        for link in links:
+            del self.docs[link]
+        return SimpleNamespace(deleted_count=len(links))
+
+
+@pytest.fixture
+def scraped_jobs(monkeypatch) -> InMemoryScrapedJobCollection:
+    """In-memory scraped_jobs collection; also lets ScrapedJob be built without init_beanie."""
+    collection = InMemoryScrapedJobCollection()
+    monkeypatch.setattr(ScrapedJob, "get_pymongo_collection", classmethod(lambda cls: collection))
+    return collection
@@ -0,0 +1,137 @@
+"""
+AI Service Tests
+Tests for the opt-in response cache and the JSON retry policy.
+"""
+import json
+
+import httpx
+import pytest
+from openai import RateLimitError
+from tenacity import wait_none
+
+from app.core.cache import TieredCache
+from app.core.config import settings
+from app.services import ai_usage
+from app.services.ai_service import AIService, AIUnavailableError, ai_service, response_cache_key
+
+
+class FakeCompletion:
+    """Replaces AIService._complete with scripted replies (strings or exceptions)."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def __call__(self, prompt, model=None, json_mode=False, temperature=0.7):
+        self.calls += 1
+        reply = self.replies[min(self.calls, len(self.replies)) - 1]
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply
+
+
+def rate_limit_error():
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.example.com"))
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    for method in (AIService._complete_json, AIService._generate_json):
+        monkeypatch.setattr(method.retry, "wait", wait_none())
+
+
+@pytest.fixture
+def response_cache(monkeypatch, cache_backend):
+    cache = TieredCache("ai:response", backend=cache_backend)
+    monkeypatch.setattr(ai_service, "_response_cache", cache)
+    monkeypatch.setattr(settings, "AI_RESPONSE_CACHE_ENABLED", True)
+    return cache
+
+
+@pytest.mark.asyncio
+class TestResponseCache:
+    """Test _cached_generate."""
+
+    async def test_second_call_is_served_from_cache(self, response_cache, monkeypatch):
+        """Test an identical prompt reuses the cached response and counts a cache hit."""
+        completion = FakeCompletion("Dear hiring manager")
+        monkeypatch.setattr(ai_service, "_complete", completion)
+        hits = []
+        monkeypatch.setattr(ai_usage.ai_usage_recorder, "record_cache_hit", lambda model, method: hits.append(method))
+
+        first = await ai_service._cached_generate("personalize_email", "Write an email")
+        second = await ai_service._cached_generate("personalize_email", "Write  an\nemail")
+
+        assert first == second == "Dear hiring manager"
+        assert completion.calls == 1
+        assert hits == ["personalize_email"]
+
+    async def test_bypass_cache_regenerates_and_overwrites(self, response_cache, monkeypatch):
+        """Test bypass_cache calls the model again and stores the new response."""
+        completion = FakeCompletion("first", "second")
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        await ai_service._cached_generate("personalize_email", "prompt")
+        assert await ai_service._cached_generate("personalize_email", "prompt", bypass_cache=True) == "second"
+        assert await ai_service._cached_generate("personalize_email", "prompt") == "second"
+        assert completion.calls == 2
+
+    async def test_failures_return_mock_and_are_not_cached(self, response_cache, monkeypatch):
+        """Test a failed completion falls back to the mock without caching it."""
+        monkeypatch.setattr(ai_service, "_complete", FakeCompletion(AIUnavailableError("no client")))
+
+        result = await ai_service._cached_generate("generate_structured_resume", "prompt", json_mode=True)
+
+        assert "mock" in result["summary"].lower()
+        key = response_cache_key("generate_structured_resume", settings.AI_MODEL_FAST, "prompt")
+        assert await response_cache.get(key) is None
+
+    async def test_uncached_methods_skip_the_cache(self, response_cache, monkeypatch):
+        """Test methods without a TTL always reach the model."""
+        completion = FakeCompletion("text")
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        await ai_service._cached_generate("not_cached", "prompt")
+        await ai_service._cached_generate("not_cached", "prompt")
+        assert completion.calls == 2
+
+
+@pytest.mark.asyncio
+class TestJsonRetries:
+    """Test which failures _complete_json retries."""
+
+    async def test_malformed_json_is_retried(self, monkeypatch):
+        """Test invalid JSON is retried until the model returns valid JSON."""
+        completion = FakeCompletion("not json", '{"ok": true}')
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        assert await ai_service._complete_json("prompt", "model") == {"ok": True}
+        assert completion.calls == 2
+
+    async def test_missing_client_is_not_retried(self, monkeypatch):
+        """Test AIUnavailableError is raised after a single attempt."""
+        completion = FakeCompletion(AIUnavailableError("no client"))
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        with pytest.raises(AIUnavailableError):
+            await ai_service._complete_json("prompt", "model")
+        assert completion.calls == 1
+
+    async def test_rate_limits_are_left_to_the_dispatcher(self, monkeypatch):
+        """Test a 429 that exhausted the dispatcher's retries is not retried again."""
+        completion = FakeCompletion(rate_limit_error())
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        with pytest.raises(RateLimitError):
+            await ai_service._complete_json("prompt", "model")
+        assert completion.calls == 1
+
+    async def test_generate_json_retries_malformed_json(self, monkeypatch):
+        """Test _generate_json retries invalid JSON and gives up after three attempts."""
+        completion = FakeCompletion("not json")
+        monkeypatch.setattr(ai_service, "_complete", completion)
+
+        with pytest.raises(json.JSONDecodeError):
+            await ai_service._generate_json("prompt", "model")
+        assert completion.calls == 3
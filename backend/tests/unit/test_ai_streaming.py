@@ -0,0 +1,174 @@
+"""
+AI Streaming Tests
+Tests for streamed completions and their Server-Sent Events endpoint helper.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.endpoints import ai as ai_endpoints
+from app.core.ai import ai_client
+from app.core.cache import TieredCache
+from app.core.config import settings
+from app.services import ai_service as ai_service_module
+from app.services.ai_service import ai_service
+
+
+def chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, stream):
+        self.stream = stream
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.stream
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after=None):
+        self.disconnect_after = disconnect_after
+        self.checks = 0
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.disconnect_after is not None and self.checks > self.disconnect_after
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = SimpleNamespace(usage=[], logs=[])
+    monkeypatch.setattr(
+        ai_service_module.ai_usage_recorder, "record",
+        lambda model, prompt_tokens, completion_tokens, duration, method=None: calls.usage.append(
+            (method, prompt_tokens, completion_tokens)
+        ),
+    )
+    monkeypatch.setattr(
+        ai_service, "_log_call",
+        lambda prompt, model, json_mode, content, duration, **extra: calls.logs.append({"content": content, **extra}),
+    )
+    return calls
+
+
+@pytest.fixture
+def response_cache(monkeypatch, cache_backend):
+    cache = TieredCache("ai:response", backend=cache_backend)
+    monkeypatch.setattr(ai_service, "_response_cache", cache)
+    monkeypatch.setattr(settings, "AI_RESPONSE_CACHE_ENABLED", True)
+    return cache
+
+
+def use_stream(monkeypatch, chunks):
+    stream = FakeStream(chunks)
+    client = FakeClient(stream)
+    monkeypatch.setattr(ai_client, "get_async_client", lambda: client)
+    return client
+
+
+@pytest.mark.asyncio
+class TestStreamText:
+    """Test AIService.stream_text."""
+
+    async def test_yields_deltas_then_logs_and_caches(self, monkeypatch, recorded, response_cache):
+        """Test chunks are forwarded, usage is recorded and the full text is cached."""
+        usage = SimpleNamespace(prompt_tokens=12, completion_tokens=3)
+        client = use_stream(monkeypatch, [chunk("Hello"), chunk(" world"), chunk(usage=usage)])
+
+        parts = [part async for part in ai_service.stream_text("prompt", method="generate_cover_letter")]
+
+        assert parts == ["Hello", " world"]
+        assert client.requests[0]["stream"] is True
+        assert client.stream.closed
+        assert recorded.usage == [("generate_cover_letter", 12, 3)]
+        assert recorded.logs[0] == {"content": "Hello world", "stream": True, "cancelled": False}
+
+        cached = [part async for part in ai_service.stream_text("prompt", method="generate_cover_letter")]
+        assert cached == ["Hello world"]
+        assert len(client.requests) == 1
+
+    async def test_abandoned_stream_is_closed_and_not_cached(self, monkeypatch, recorded, response_cache):
+        """Test closing the generator early closes upstream and skips the cache."""
+        client = use_stream(monkeypatch, [chunk("a"), chunk("b"), chunk("c")])
+
+        stream = ai_service.stream_text("prompt", method="generate_cover_letter")
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+
+        assert client.stream.closed
+        assert recorded.logs[0]["cancelled"] is True
+        # No provider usage on a cancelled stream: estimated from the text
+        assert recorded.usage == [("generate_cover_letter", len("prompt") // 4, 0)]
+        assert response_cache.backend.data == {}
+
+    async def test_no_client_yields_mock(self, monkeypatch, recorded):
+        """Test an unconfigured client streams the mock response as one chunk."""
+        monkeypatch.setattr(ai_client, "get_async_client", lambda: None)
+        parts = [part async for part in ai_service.stream_text("prompt")]
+        assert len(parts) == 1 and "mock" in parts[0].lower()
+
+
+@pytest.mark.asyncio
+class TestSseStream:
+    """Test the SSE wrapper used by the streaming endpoints."""
+
+    async def test_token_events_then_done(self):
+        """Test each chunk becomes a token event followed by a done event."""
+        async def chunks():
+            yield "Hi"
+            yield " there"
+
+        events = [event async for event in ai_endpoints._sse_stream(FakeRequest(), chunks())]
+
+        assert events == [
+            'event: token\ndata: {"text": "Hi"}\n\n',
+            'event: token\ndata: {"text": " there"}\n\n',
+            'event: done\ndata: {"text": "Hi there"}\n\n',
+        ]
+
+    async def test_disconnect_stops_generation(self):
+        """Test a disconnected client stops reading and closes the generator."""
+        closed = []
+
+        async def chunks():
+            try:
+                for text in ("a", "b", "c"):
+                    yield text
+            finally:
+                closed.append(True)
+
+        events = [event async for event in ai_endpoints._sse_stream(FakeRequest(disconnect_after=1), chunks())]
+
+        assert events == ['event: token\ndata: {"text": "a"}\n\n']
+        assert closed == [True]
+
+    async def test_failure_becomes_error_event(self):
+        """Test an exception mid-stream is reported as an error event."""
+        async def chunks():
+            yield "a"
+            raise RuntimeError("upstream")
+
+        events = [event async for event in ai_endpoints._sse_stream(FakeRequest(), chunks())]
+        assert events[-1] == 'event: error\ndata: {"detail": "AI generation failed"}\n\n'
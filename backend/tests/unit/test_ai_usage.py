@@ -0,0 +1,153 @@
+"""
+AI Usage Tests
+Tests for per-minute usage rollups, their flush to MongoDB and usage reports.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import ai_usage as usage_module
+from app.services.ai_usage import AIUsageRecorder, histogram_percentile, latency_bucket, track_ai_usage
+
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.operations = []
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise RuntimeError("mongo down")
+        self.operations.extend(operations)
+
+
+class FakeQuery:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self):
+        return self.docs
+
+
+def stored_rollup(minute, method, user_id, calls, prompt_tokens, buckets):
+    fields = {
+        "minute": minute, "method": method, "user_id": user_id, "model": "m", "calls": calls,
+        "cache_hits": 0, "prompt_tokens": prompt_tokens, "completion_tokens": 0,
+        "latency_ms_total": 100.0 * calls, "latency_buckets": buckets,
+    }
+    return SimpleNamespace(**fields, model_dump=lambda: dict(fields))
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    fake = FakeCollection()
+    monkeypatch.setattr(usage_module, "get_collection", lambda model: fake)
+    return fake
+
+
+def age_rollups(recorder, minutes=2):
+    """Move every in-memory rollup ``minutes`` into the past."""
+    recorder._rollups = {
+        (minute - timedelta(minutes=minutes), *rest): rollup
+        for (minute, *rest), rollup in recorder._rollups.items()
+    }
+
+
+class TestRecording:
+    """Test in-memory aggregation."""
+
+    def test_calls_are_attributed_to_method_and_user(self):
+        """Test the tracked method and user key the rollup, and an explicit method wins."""
+        recorder = AIUsageRecorder()
+        with track_ai_usage(method="parse_resume", user_id="u1"):
+            recorder.record("m", 100, 20, 150)
+            recorder.record("m", 50, 10, 3000)
+            recorder.record("m", 1, 1, 10, method="explicit")
+        recorder.record_cache_hit("m", "parse_resume")
+
+        rollups = {(method, user): rollup for (_, method, user, _), rollup in recorder._rollups.items()}
+        assert rollups[("parse_resume", "u1")]["calls"] == 2
+        assert rollups[("parse_resume", "u1")]["prompt_tokens"] == 150
+        assert rollups[("parse_resume", "u1")]["latency_buckets"] == {"250": 1, "4000": 1}
+        assert rollups[("explicit", "u1")]["calls"] == 1
+        assert rollups[("parse_resume", None)]["cache_hits"] == 1
+
+    def test_latency_histogram(self):
+        """Test bucket assignment and percentiles over the bucket bounds."""
+        assert latency_bucket(100) == "100"
+        assert latency_bucket(101) == "250"
+        assert latency_bucket(10 ** 6) == "inf"
+        assert histogram_percentile({}, 50) is None
+        buckets = {"100": 8, "1000": 1, "inf": 1}
+        assert histogram_percentile(buckets, 50) == 100.0
+        assert histogram_percentile(buckets, 90) == 1000.0
+        assert histogram_percentile(buckets, 99) == 64000.0
+
+
+@pytest.mark.asyncio
+class TestFlush:
+    """Test persisting rollups."""
+
+    async def test_only_finished_minutes_are_flushed(self, collection):
+        """Test the current minute stays in memory until stop() flushes it."""
+        recorder = AIUsageRecorder()
+        recorder.record("m", 10, 5, 120, method="a")
+        age_rollups(recorder)
+        recorder.record("m", 10, 5, 120, method="b")
+
+        assert await recorder.flush() == 1
+        [operation] = collection.operations
+        assert operation._filter["method"] == "a"
+        assert operation._doc["$inc"] == {
+            "calls": 1, "cache_hits": 0, "prompt_tokens": 10, "completion_tokens": 5,
+            "latency_ms_total": 120, "latency_buckets.250": 1,
+        }
+        assert operation._upsert
+
+        await recorder.stop()
+        assert [op._filter["method"] for op in collection.operations] == ["a", "b"]
+        assert recorder._rollups == {}
+
+    async def test_failed_flush_keeps_rollups(self, monkeypatch):
+        """Test rollups survive a failed write and merge with newer calls."""
+        failing = FakeCollection(fail=True)
+        monkeypatch.setattr(usage_module, "get_collection", lambda model: failing)
+        recorder = AIUsageRecorder()
+        recorder.record("m", 10, 0, 50, method="a")
+
+        assert await recorder.flush(include_current=True) == 0
+        recorder.record("m", 5, 0, 50, method="a")
+
+        [rollup] = recorder._rollups.values()
+        assert rollup["calls"] == 2 and rollup["prompt_tokens"] == 15
+
+
+@pytest.mark.asyncio
+class TestReport:
+    """Test usage reports."""
+
+    async def test_report_merges_stored_and_pending_rollups(self, monkeypatch):
+        """Test stored and in-memory rollups are merged per group."""
+        today = datetime.utcnow().replace(second=0, microsecond=0)
+        yesterday = today - timedelta(days=1)
+        stored = [
+            stored_rollup(yesterday, "parse_resume", "u1", 3, 300, {"100": 3}),
+            stored_rollup(today, "matching.analyze_job", None, 1, 50, {"2000": 1}),
+        ]
+        monkeypatch.setattr(usage_module.AIUsageRollup, "find", lambda query: FakeQuery(stored))
+        recorder = AIUsageRecorder()
+        with track_ai_usage(method="parse_resume", user_id="u1"):
+            recorder.record("m", 100, 10, 90)
+
+        by_method = await recorder.report("method")
+        assert [row["method"] for row in by_method] == ["parse_resume", "matching.analyze_job"]
+        assert by_method[0]["calls"] == 4
+        assert by_method[0]["total_tokens"] == 410
+        assert by_method[0]["latency_ms"]["p50"] == 100.0
+
+        by_user = {row["user"]: row["calls"] for row in await recorder.report("user")}
+        assert by_user == {"u1": 4, "system": 1}
+
+        by_day = await recorder.report("day")
+        assert [row["day"] for row in by_day] == [yesterday.date().isoformat(), today.date().isoformat()]
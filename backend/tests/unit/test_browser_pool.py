@@ -0,0 +1,174 @@
+"""
+Browser Pool Tests
+Tests for leasing, reusing and recycling pooled Playwright browser contexts.
+"""
+import asyncio
+
+import pytest
+
+from app.automation import browser as browser_module
+from app.automation.browser import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.cookies = []
+        self.init_scripts = []
+        self.closed = False
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+        self.stopped = False
+
+    async def launch(self, headless=True, args=None):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        self.stopped = True
+
+
+class FakeSessions:
+    def load_cookies(self):
+        return [{"name": "li_at", "value": "token", "domain": ".linkedin.com", "path": "/"}]
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_module, "async_playwright", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def pool(playwright):
+    return BrowserPool(max_contexts=2, max_uses_per_context=3, session_manager=FakeSessions())
+
+
+@pytest.mark.asyncio
+class TestBrowserPool:
+    """Test BrowserPool."""
+
+    async def test_one_browser_contexts_reused(self, pool, playwright):
+        """Test scrapes share one browser and reuse a context with cookies loaded once."""
+        for _ in range(3):
+            async with pool.page():
+                pass
+
+        [browser] = playwright.browsers
+        [context] = browser.contexts
+        assert len(context.cookies) == 1 and context.init_scripts == [browser_module.STEALTH_SCRIPT]
+        assert pool.stats()["leases"] == 3 and pool.stats()["browser_launches"] == 1
+
+    async def test_context_recycled_after_max_uses(self, pool, playwright):
+        """Test a context is closed and replaced after max_uses_per_context leases."""
+        for _ in range(4):
+            async with pool.context():
+                pass
+
+        first, second = playwright.browsers[0].contexts
+        assert first.closed and not second.closed
+        assert pool.stats()["contexts_recycled"] == 1
+
+    async def test_concurrent_leases_bounded(self, pool, playwright):
+        """Test at most max_contexts contexts are leased at once and each lease gets its own."""
+        peak = 0
+        leased = []
+
+        async def scrape():
+            nonlocal peak
+            async with pool.context() as context:
+                leased.append(context)
+                peak = max(peak, pool.in_use)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(scrape() for _ in range(6)))
+        assert peak == 2
+        assert len(playwright.browsers[0].contexts) == 2
+
+    async def test_failed_scrape_discards_context(self, pool, playwright):
+        """Test a context whose scrape raised is not reused."""
+        with pytest.raises(RuntimeError):
+            async with pool.context():
+                raise RuntimeError("navigation failed")
+
+        async with pool.context() as context:
+            assert context is playwright.browsers[0].contexts[1]
+        assert playwright.browsers[0].contexts[0].closed
+
+    async def test_crashed_browser_is_relaunched(self, pool, playwright):
+        """Test idle contexts of a crashed browser are dropped and Chromium is relaunched."""
+        async with pool.context():
+            pass
+        playwright.browsers[0].connected = False
+
+        async with pool.context() as context:
+            assert context.browser is playwright.browsers[1]
+        assert playwright.browsers[0].contexts[0].closed
+        assert pool.stats()["browser_launches"] == 2
+
+    async def test_stop_while_leased(self, pool, playwright):
+        """Test a lease returned after stop() closes its context instead of raising."""
+        async with pool.page():
+            await pool.stop()
+            assert pool.browser is None
+
+        context = playwright.browsers[0].contexts[0]
+        assert context.closed
+        assert pool.stats() == {
+            "running": False,
+            "browser_launches": 1,
+            "contexts_created": 1,
+            "contexts_recycled": 1,
+            "leases": 1,
+            "in_use": 0,
+            "idle": 0,
+        }
+
+        async with pool.context() as context:
+            assert context.browser is playwright.browsers[1]
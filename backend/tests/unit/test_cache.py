@@ -0,0 +1,107 @@
+"""
+Cache Tests
+Tests for the in-process LRU cache and the two-tier (local + Redis) cache.
+"""
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import LRUCache, TieredCache, compress_value
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+class TestLRUCache:
+    """Test LRU eviction and expiry."""
+
+    def test_hit_and_miss(self):
+        """Test stored values are returned and unknown keys miss."""
+        lru = LRUCache(max_size=2)
+        lru.set("a", 1)
+        assert lru.get("a") == 1
+        assert lru.get("b") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently read entry is evicted first."""
+        lru = LRUCache(max_size=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        assert lru.get("b") is None
+        assert lru.get("a") == 1
+        assert lru.get("c") == 3
+
+    def test_entries_expire_after_ttl(self, clock):
+        """Test an entry is dropped once its TTL has passed."""
+        lru = LRUCache()
+        lru.set("a", 1, expire=10)
+        clock.now += 9
+        assert lru.get("a") == 1
+        clock.now += 2
+        assert lru.get("a") is None
+        assert len(lru) == 0
+
+
+@pytest.mark.asyncio
+class TestTieredCache:
+    """Test the local tier in front of Redis."""
+
+    async def test_miss_returns_none(self, cache_backend):
+        """Test a key in neither tier misses."""
+        tiered = TieredCache("ns", backend=cache_backend)
+        assert await tiered.get("missing") is None
+
+    async def test_set_writes_both_tiers(self, cache_backend):
+        """Test writes go to the local tier and to Redis under the namespace."""
+        tiered = TieredCache("ns", backend=cache_backend)
+        await tiered.set("k", {"v": 1})
+        assert tiered.local.get("k") == {"v": 1}
+        assert cache_backend.data["ns:k"] == {"v": 1}
+
+    async def test_redis_hit_backfills_local_tier(self, cache_backend):
+        """Test a value found only in Redis is copied into the local tier."""
+        cache_backend.data["ns:k"] = {"v": 2}
+        tiered = TieredCache("ns", backend=cache_backend)
+        assert await tiered.get("k") == {"v": 2}
+        assert tiered.local.get("k") == {"v": 2}
+
+    async def test_local_ttl_falls_back_to_redis(self, cache_backend, clock):
+        """Test an expired local entry is re-read from Redis."""
+        tiered = TieredCache("ns", expire=60, backend=cache_backend)
+        await tiered.set("k", "fresh")
+        cache_backend.data["ns:k"] = "from redis"
+        clock.now += 61
+        assert await tiered.get("k") == "from redis"
+
+    async def test_compressed_values(self, cache_backend):
+        """Test compressed entries round-trip and are stored compressed in Redis."""
+        tiered = TieredCache("ns", backend=cache_backend, compress=True)
+        await tiered.set("k", {"text": "x" * 1000})
+        assert cache_backend.data["ns:k"] == compress_value({"text": "x" * 1000})
+
+        reader = TieredCache("ns", backend=cache_backend, compress=True)
+        assert await reader.get("k") == {"text": "x" * 1000}
+
+    async def test_delete_and_clear(self, cache_backend):
+        """Test invalidation removes keys from both tiers."""
+        tiered = TieredCache("ns", backend=cache_backend)
+        await tiered.set("a", 1)
+        await tiered.set("b", 2)
+        await tiered.delete("a")
+        assert await tiered.get("a") is None
+
+        assert await tiered.clear() == 1
+        assert await tiered.get("b") is None
@@ -0,0 +1,178 @@
+"""
+Embedding Service Tests
+Tests for the hashing embedder, stale-vector detection and the pre-filter.
+"""
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService, HashingEmbedder, cosine_similarity, text_hash
+
+
+class FakeCollection:
+    def __init__(self):
+        self.operations = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+
+
+class FakeResume(SimpleNamespace):
+    """Resume stand-in recording partial ``$set`` updates."""
+
+    async def set(self, fields):
+        self.updates = getattr(self, "updates", []) + [fields]
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def make_job(n, description):
+    return SimpleNamespace(
+        id=f"job{n}", title=f"Role {n}", company="Acme", skills_required=[], description=description,
+        embedding_vector=[], embedding_model=None, embedding_hash=None,
+    )
+
+
+def make_resume(content):
+    return FakeResume(id="resume1", content=content, embedding_vector=[], embedding_model=None, embedding_hash=None)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    fake = FakeCollection()
+    monkeypatch.setattr(embedding_module, "get_collection", lambda model: fake)
+    return fake
+
+
+@pytest.fixture
+def service():
+    return EmbeddingService(HashingEmbedder(64))
+
+
+class TestHashingEmbedder:
+    """Test the dependency-free embedder."""
+
+    def test_vectors_are_normalized_and_deterministic(self):
+        """Test vectors have unit length and do not change between calls."""
+        embedder = HashingEmbedder(64)
+        [first] = embedder.embed(["Senior Python developer"])
+        [second] = HashingEmbedder(64).embed(["Senior Python developer"])
+        assert first == second
+        assert math.isclose(math.sqrt(sum(v * v for v in first)), 1.0)
+
+    def test_similar_texts_score_higher(self):
+        """Test related texts are closer than unrelated ones."""
+        embedder = HashingEmbedder(256)
+        resume, related, unrelated = embedder.embed([
+            "python backend developer fastapi",
+            "backend python developer with fastapi and redis",
+            "registered nurse hospital night shifts",
+        ])
+        assert cosine_similarity(resume, related) > cosine_similarity(resume, unrelated)
+
+
+@pytest.mark.asyncio
+class TestStaleEmbeddings:
+    """Test vectors are refreshed when text or embedder change, and only then."""
+
+    async def test_job_vectors_written_with_bulk_set(self, service, collection):
+        """Test stale jobs are embedded in one bulk write that only sets embedding fields."""
+        jobs = [make_job(i, f"Python developer {i}") for i in range(3)]
+        await service.ensure_job_embeddings(jobs)
+
+        assert len(collection.operations) == 3
+        for operation, job in zip(collection.operations, jobs):
+            assert operation._filter == {"_id": job.id}
+            assert set(operation._doc["$set"]) == {"embedding_vector", "embedding_model", "embedding_hash"}
+            assert job.embedding_hash == text_hash(embedding_module.job_embedding_text(job))
+
+    async def test_unchanged_jobs_are_not_reembedded(self, service, collection):
+        """Test a second pass over the same jobs writes nothing."""
+        jobs = [make_job(i, "Python developer") for i in range(2)]
+        await service.ensure_job_embeddings(jobs)
+        collection.operations.clear()
+
+        await service.ensure_job_embeddings(jobs)
+        assert collection.operations == []
+
+    async def test_edited_job_is_reembedded(self, service, collection):
+        """Test changing a job description makes its vector stale."""
+        job = make_job(1, "Python developer")
+        await service.ensure_job_embeddings([job])
+        old_vector = job.embedding_vector
+        collection.operations.clear()
+
+        job.description = "Registered nurse"
+        await service.ensure_job_embeddings([job])
+        assert len(collection.operations) == 1
+        assert job.embedding_vector != old_vector
+
+    async def test_embedder_change_marks_vectors_stale(self, collection):
+        """Test vectors from another embedder are recomputed."""
+        job = make_job(1, "Python developer")
+        await EmbeddingService(HashingEmbedder(64)).ensure_job_embeddings([job])
+        collection.operations.clear()
+
+        await EmbeddingService(HashingEmbedder(128)).ensure_job_embeddings([job])
+        assert len(job.embedding_vector) == 128
+        assert len(collection.operations) == 1
+
+    async def test_edited_resume_is_reembedded(self, service):
+        """Test a resume vector is reused until its content changes, and saved with a partial update."""
+        resume = make_resume("Python engineer")
+        vector = await service.ensure_resume_embedding(resume)
+        assert await service.ensure_resume_embedding(resume) == vector
+        assert len(resume.updates) == 1
+
+        resume.content = "Registered nurse"
+        assert await service.ensure_resume_embedding(resume) != vector
+        assert len(resume.updates) == 2
+        assert set(resume.updates[-1]) == {"embedding_vector", "embedding_model", "embedding_hash"}
+
+
+@pytest.mark.asyncio
+class TestPrefilter:
+    """Test the pre-filter in front of LLM matching."""
+
+    async def test_keeps_top_k_above_threshold(self, collection):
+        """Test only the closest jobs above the similarity threshold are kept."""
+        service = EmbeddingService(HashingEmbedder(512))
+        resume = make_resume("python backend developer fastapi redis")
+        jobs = [
+            make_job(1, "python backend developer fastapi redis postgres"),
+            make_job(2, "python backend developer"),
+            make_job(3, "registered nurse hospital night shifts"),
+        ]
+
+        kept = await service.prefilter_jobs(resume, jobs, top_k=2, min_similarity=0.1)
+        assert [job.id for job in kept] == ["job1", "job2"]
+
+        kept = await service.prefilter_jobs(resume, jobs, top_k=1, min_similarity=0.1)
+        assert [job.id for job in kept] == ["job1"]
+
+    async def test_automation_falls_back_to_all_jobs_when_prefilter_fails(self, monkeypatch):
+        """Test a failing embedder or write lets every job through to LLM matching."""
+        from app.services import bot as bot_module
+
+        async def failing_prefilter(resume, jobs):
+            raise RuntimeError("bulk write failed")
+
+        monkeypatch.setattr(bot_module.embedding_service, "prefilter_jobs", failing_prefilter)
+        jobs = [make_job(1, "python"), make_job(2, "nursing")]
+
+        kept = await bot_module.BotService()._prefilter_jobs(make_resume("python"), jobs)
+        assert kept == jobs
+
+    async def test_automation_uses_prefilter_result(self, collection, monkeypatch):
+        """Test the automation keeps only the pre-filtered jobs when the pre-filter works."""
+        from app.services import bot as bot_module
+
+        monkeypatch.setattr(bot_module, "embedding_service", EmbeddingService(HashingEmbedder(512)))
+        monkeypatch.setattr(embedding_module.settings, "MATCH_PREFILTER_MIN_SIMILARITY", 0.1)
+        resume = make_resume("python backend developer fastapi redis")
+        jobs = [make_job(1, "python backend developer fastapi redis"), make_job(2, "registered nurse night shifts")]
+
+        kept = await bot_module.BotService()._prefilter_jobs(resume, jobs)
+        assert [job.id for job in kept] == ["job1"]
@@ -0,0 +1,142 @@
+"""
+Interception Tests
+Tests for the scraper request blocking policy and traffic counters.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.automation.interception import PageTraffic, RequestBlockingPolicy
+from app.automation.scrapers.linkedin import LinkedInScraper
+from app.core.config import settings
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakeRequest:
+    def __init__(self, sizes=None):
+        self._sizes = sizes
+
+    async def sizes(self):
+        if self._sizes is None:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return self._sizes
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+        self.routes = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+
+@pytest.fixture
+def policy():
+    return RequestBlockingPolicy(
+        resource_types=frozenset({"image", "font"}),
+        url_patterns=("*google-analytics.com*",),
+        allow_patterns=("*linkedin.com/jobs-guest/*",),
+    )
+
+
+class TestRequestBlockingPolicy:
+    """Test RequestBlockingPolicy.should_block."""
+
+    def test_blocks_by_resource_type(self, policy):
+        """Test blocked resource types are aborted and others pass."""
+        assert policy.should_block("image", "https://media.licdn.com/logo.png")
+        assert policy.should_block("font", "https://static.licdn.com/font.woff2")
+        assert not policy.should_block("document", "https://www.linkedin.com/jobs/search")
+        assert not policy.should_block("script", "https://static.licdn.com/app.js")
+
+    def test_blocks_by_url_pattern(self, policy):
+        """Test tracker URLs are aborted whatever their resource type."""
+        assert policy.should_block("script", "https://www.google-analytics.com/analytics.js")
+
+    def test_allowlist_wins(self, policy):
+        """Test allowlisted URLs are never blocked."""
+        assert not policy.should_block("image", "https://www.linkedin.com/jobs-guest/jobs/api/seeMore?start=25")
+
+    def test_from_settings(self, monkeypatch):
+        """Test defaults come from settings and the allowlist from the scraper."""
+        monkeypatch.setattr(settings, "SCRAPER_BLOCKED_RESOURCE_TYPES", ["media"])
+        monkeypatch.setattr(settings, "SCRAPER_BLOCKED_URL_PATTERNS", ["*doubleclick.net*"])
+        policy = RequestBlockingPolicy.from_settings(LinkedInScraper.request_allowlist)
+
+        assert policy.resource_types == frozenset({"media"})
+        assert policy.url_patterns == ("*doubleclick.net*",)
+        assert policy.allow_patterns == LinkedInScraper.request_allowlist
+
+
+@pytest.mark.asyncio
+class TestPageTraffic:
+    """Test PageTraffic routing and counters."""
+
+    async def test_routes_and_counts_blocked_requests(self, policy):
+        """Test blocked requests are aborted and counted by type; others continue."""
+        page = FakePage()
+        traffic = await PageTraffic(policy=policy).attach(page)
+        [(pattern, handler)] = page.routes
+        assert pattern == "**/*"
+
+        routes = [
+            FakeRoute("image", "https://media.licdn.com/a.png"),
+            FakeRoute("image", "https://media.licdn.com/b.png"),
+            FakeRoute("script", "https://www.google-analytics.com/ga.js"),
+            FakeRoute("document", "https://www.linkedin.com/jobs/search"),
+        ]
+        for route in routes:
+            await handler(route)
+
+        assert [route.outcome for route in routes] == ["aborted", "aborted", "aborted", "continued"]
+        assert traffic.blocked == 3
+        assert traffic.blocked_by_type == {"image": 2, "script": 1}
+
+    async def test_counts_bytes_of_finished_requests(self):
+        """Test finished requests add their body and header sizes; closed pages are tolerated."""
+        page = FakePage()
+        traffic = await PageTraffic().attach(page)
+        assert page.routes == []
+
+        on_finished = page.handlers["requestfinished"]
+        await on_finished(FakeRequest({"responseBodySize": 1000, "responseHeadersSize": 200}))
+        await on_finished(FakeRequest({"responseBodySize": 50}))
+        await on_finished(FakeRequest(None))
+        traffic.page_load_ms = 123.456
+
+        assert traffic.summary() == {
+            "blocking": False,
+            "requests": 3,
+            "blocked": 0,
+            "blocked_by_type": {},
+            "bytes_received": 1250,
+            "page_load_ms": 123.5,
+        }
+
+    async def test_scraper_respects_block_setting(self, monkeypatch):
+        """Test intercept_requests only routes when SCRAPER_BLOCK_RESOURCES is on."""
+        monkeypatch.setattr(settings, "SCRAPER_BLOCK_RESOURCES", False)
+        page = FakePage()
+        traffic = await LinkedInScraper(page).intercept_requests()
+        assert traffic.policy is None and page.routes == []
+
+        monkeypatch.setattr(settings, "SCRAPER_BLOCK_RESOURCES", True)
+        page = FakePage()
+        traffic = await LinkedInScraper(page).intercept_requests()
+        assert traffic.policy.allow_patterns == LinkedInScraper.request_allowlist
+        assert len(page.routes) == 1
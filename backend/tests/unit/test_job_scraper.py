@@ -0,0 +1,82 @@
+"""
+Job Scraper Tests
+Tests for bulk-upserting scraped jobs on the unique link index.
+"""
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.services.job_scraper import JobScraperService
+from app.services.near_duplicates import near_duplicate_service
+
+
+def job_data(n, **fields):
+    return {
+        "title": f"Engineer {n}",
+        "company": f"Company {n}",
+        "location": "Remote",
+        "link": f"https://www.linkedin.com/jobs/view/{n}",
+        **fields,
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_near_duplicate_index(monkeypatch):
+    monkeypatch.setattr(near_duplicate_service, "index", None)
+
+
+@pytest.mark.asyncio
+class TestUpsertJobs:
+    """Test JobScraperService.upsert_jobs."""
+
+    async def test_new_links_inserted_in_one_write(self, scraped_jobs):
+        """Test a batch is one unordered bulk write and returns the inserted jobs."""
+        result = await JobScraperService().upsert_jobs([job_data(1), job_data(2)])
+
+        assert result["inserted"] == 2 and result["matched"] == 0
+        assert [job.title for job in result["jobs"]] == ["Engineer 1", "Engineer 2"]
+        assert len(scraped_jobs.writes) == 1
+        stored = scraped_jobs.docs[job_data(1)["link"]]
+        assert stored["_id"] == result["jobs"][0].id and stored["title"] == "Engineer 1"
+
+    async def test_known_links_are_matched_not_overwritten(self, scraped_jobs):
+        """Test a link that is already stored counts as matched and keeps its document."""
+        service = JobScraperService()
+        await service.upsert_jobs([job_data(1)])
+        first_id = scraped_jobs.docs[job_data(1)["link"]]["_id"]
+
+        result = await service.upsert_jobs([job_data(1, title="Retitled"), job_data(2)])
+
+        assert result["inserted"] == 1 and result["matched"] == 1
+        assert [job.title for job in result["jobs"]] == ["Engineer 2"]
+        assert scraped_jobs.docs[job_data(1)["link"]]["_id"] == first_id
+        assert scraped_jobs.docs[job_data(1)["link"]]["title"] == "Engineer 1"
+
+    async def test_duplicate_links_in_batch_collapsed(self, scraped_jobs):
+        """Test one operation is sent per link even if the scrape returned it twice."""
+        result = await JobScraperService().upsert_jobs([job_data(1), job_data(1, title="Again"), job_data(2)])
+        assert len(scraped_jobs.writes[0]) == 2
+        assert result["inserted"] == 2
+
+    async def test_concurrent_insert_counts_as_matched(self, scraped_jobs):
+        """Test a duplicate-key error from a racing scrape is treated as matched, not a failure."""
+        scraped_jobs.race_links = {job_data(2)["link"]}
+
+        result = await JobScraperService().upsert_jobs([job_data(1), job_data(2), job_data(3)])
+
+        assert result["inserted"] == 2 and result["matched"] == 1
+        assert [job.title for job in result["jobs"]] == ["Engineer 1", "Engineer 3"]
+        assert scraped_jobs.docs[job_data(2)["link"]]["_id"] == f"racer-{job_data(2)['link']}"
+
+    async def test_other_write_errors_are_raised(self, scraped_jobs):
+        """Test write errors other than duplicate keys propagate."""
+        scraped_jobs.race_links = {job_data(1)["link"]}
+        scraped_jobs.other_errors = {job_data(2)["link"]}
+
+        with pytest.raises(BulkWriteError):
+            await JobScraperService().upsert_jobs([job_data(1), job_data(2)])
+
+    async def test_empty_batch(self, scraped_jobs):
+        """Test no write is made for an empty batch."""
+        result = await JobScraperService().upsert_jobs([])
+        assert result == {"inserted": 0, "matched": 0, "duplicates": 0, "jobs": []}
+        assert scraped_jobs.writes == []
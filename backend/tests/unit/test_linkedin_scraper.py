@@ -0,0 +1,245 @@
+"""
+LinkedIn Scraper Tests
+Tests for job card extraction, conversion to job dicts and result pagination.
+"""
+import pytest
+from bs4 import BeautifulSoup
+
+from app.automation.scrapers import base as base_module
+from app.automation.scrapers.linkedin import LinkedInScraper
+from app.core.config import settings
+
+CARDS = [
+    {"title": " Python Developer ", "company": " Acme ", "location": " Remote ", "link": "https://www.linkedin.com/jobs/view/1?refId=abc"},
+    {"title": "Go Developer", "company": None, "location": None, "link": "https://www.linkedin.com/jobs/view/2"},
+    {"title": None, "company": "Ad", "location": None, "link": "https://ads.example"},
+]
+
+
+class FakeElement:
+    def __init__(self, text=None, attributes=None, children=None):
+        self.text = text
+        self.attributes = attributes or {}
+        self.children = children or {}
+
+    async def query_selector(self, selector):
+        return self.children.get(selector)
+
+    async def inner_text(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+def card_element(card):
+    selectors = LinkedInScraper.field_selectors
+    children = {}
+    for name, (selector, source) in selectors.items():
+        if card[name] is None:
+            continue
+        children[selector] = FakeElement(attributes={"href": card[name]}) if source == "href" else FakeElement(card[name])
+    return FakeElement(children=children)
+
+
+class FakePage:
+    """Answers page.evaluate and query_selector_all from a fixed list of cards."""
+
+    def __init__(self, cards):
+        self.cards = cards
+        self.evaluate_calls = []
+        self.selector_calls = []
+
+    async def evaluate(self, script, arg=None):
+        self.evaluate_calls.append((script, arg))
+        return self.cards[arg["offset"]:]
+
+    async def query_selector_all(self, selector):
+        self.selector_calls.append(selector)
+        return [card_element(card) for card in self.cards]
+
+
+@pytest.mark.asyncio
+class TestExtractCards:
+    """Test BaseScraper.extract_cards."""
+
+    async def test_evaluate_mode_is_one_round_trip(self):
+        """Test evaluate mode reads every card with a single page.evaluate."""
+        page = FakePage(CARDS)
+        cards = await LinkedInScraper(page).extract_cards(offset=1, mode="evaluate")
+
+        assert cards == CARDS[1:]
+        [(script, arg)] = page.evaluate_calls
+        assert script == base_module.EXTRACT_CARDS_SCRIPT
+        assert arg == {"card": LinkedInScraper.card_selector, "fields": LinkedInScraper.field_selectors, "offset": 1}
+        assert page.selector_calls == []
+
+    async def test_handles_mode_matches_evaluate_mode(self):
+        """Test the element-handle path returns the same fields, with None for missing ones."""
+        page = FakePage(CARDS)
+        scraper = LinkedInScraper(page)
+        assert await scraper.extract_cards(mode="handles") == CARDS
+        assert await scraper.extract_cards(offset=2, mode="handles") == CARDS[2:]
+        assert page.evaluate_calls == []
+
+    async def test_mode_defaults_to_setting(self, monkeypatch):
+        """Test SCRAPER_EXTRACTION_MODE picks the mode when none is given."""
+        monkeypatch.setattr(settings, "SCRAPER_EXTRACTION_MODE", "handles")
+        page = FakePage(CARDS)
+        await LinkedInScraper(page).extract_cards()
+        assert page.evaluate_calls == [] and len(page.selector_calls) == 1
+
+
+class TestToJob:
+    """Test LinkedInScraper._to_job."""
+
+    def test_fields_are_cleaned(self):
+        """Test text is stripped and tracking parameters are removed from the link."""
+        assert LinkedInScraper._to_job(CARDS[0]) == {
+            "title": "Python Developer",
+            "company": "Acme",
+            "location": "Remote",
+            "link": "https://www.linkedin.com/jobs/view/1",
+            "source": "linkedin",
+        }
+
+    def test_missing_company_and_location_default_to_unknown(self):
+        """Test absent optional fields become "Unknown"."""
+        job = LinkedInScraper._to_job(CARDS[1])
+        assert job["company"] == "Unknown" and job["location"] == "Unknown"
+
+    def test_cards_without_title_or_link_are_skipped(self):
+        """Test non-job cards (ads, placeholders) are rejected."""
+        assert LinkedInScraper._to_job(CARDS[2]) is None
+        assert LinkedInScraper._to_job({"title": "Engineer", "link": None}) is None
+        assert LinkedInScraper._to_job({"title": "Engineer", "link": "?refId=abc"}) is None
+
+
+class FakeSearchPage:
+    """
+    A LinkedIn search page rendered with BeautifulSoup.
+
+    Cards are revealed ``page_size`` at a time on each scroll. Scripts are
+    answered with the same CSS selectors the browser would use.
+    """
+
+    def __init__(self, cards, page_size=3, nav_items=2, footer_items=2):
+        self.cards = cards
+        self.page_size = page_size
+        self.nav_items = nav_items
+        self.footer_items = footer_items
+        self.visible = page_size
+        self.scrolls = 0
+        self.url = "about:blank"
+
+    def soup(self):
+        nav = "".join(f"<li><a href='/nav/{i}'>Nav {i}</a></li>" for i in range(self.nav_items))
+        footer = "".join(f"<li><a href='/legal/{i}'>Legal {i}</a></li>" for i in range(self.footer_items))
+        items = []
+        for card in self.cards[:self.visible]:
+            if callable(card):
+                card = card(self)
+            link = f"<a href='{card['link']}'></a>" if card.get("link") else ""
+            items.append(f"<li><h3>{card['title']}</h3><h4>{card['company']}</h4>{link}</li>")
+        return BeautifulSoup(
+            f"<ul class='nav__menu'>{nav}</ul><ul class='jobs-search__results-list'>{''.join(items)}</ul>"
+            f"<footer><ul>{footer}</ul></footer>",
+            "html.parser",
+        )
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def wait_for_selector(self, selector, timeout=None):
+        return None
+
+    async def query_selector(self, selector):
+        return None
+
+    async def evaluate(self, script, arg=None):
+        if script == base_module.EXTRACT_CARDS_SCRIPT:
+            cards = []
+            for element in self.soup().select(arg["card"])[arg["offset"]:]:
+                values = {}
+                for name, (selector, source) in arg["fields"].items():
+                    node = element.select_one(selector)
+                    values[name] = None if node is None else node.get_text() if source == "text" else node.get(source)
+                cards.append(values)
+            return cards
+        if script == base_module.WAIT_FOR_MORE_CARDS_SCRIPT:
+            selector, count, _ = arg
+            return len(self.soup().select(selector)) > count
+        # Scrolling reveals the next page of results
+        self.scrolls += 1
+        self.visible += self.page_size
+
+
+def make_cards(n):
+    return [{"title": f"Engineer {i}", "company": "Acme", "link": f"https://www.linkedin.com/jobs/view/{i}"} for i in range(n)]
+
+
+@pytest.mark.asyncio
+class TestPagination:
+    """Test LinkedInScraper.iter_jobs loading more results."""
+
+    async def test_batches_until_limit(self):
+        """Test each load yields only its new jobs and scraping stops at the limit."""
+        page = FakeSearchPage(make_cards(20))
+        batches = [batch async for batch in LinkedInScraper(page).iter_jobs("python", "remote", limit=7)]
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [job["title"] for batch in batches for job in batch] == [f"Engineer {i}" for i in range(7)]
+        assert page.scrolls == 2
+
+    async def test_navigation_items_are_not_cards(self):
+        """Test list items outside the results list neither become jobs nor shift the offset."""
+        page = FakeSearchPage(make_cards(6), nav_items=5, footer_items=4)
+        jobs = await LinkedInScraper(page).scrape_jobs("python", "remote", limit=10)
+        assert [job["link"] for job in jobs] == [f"https://www.linkedin.com/jobs/view/{i}" for i in range(6)]
+
+    async def test_stops_when_no_more_results(self):
+        """Test scraping ends when a load adds no cards."""
+        page = FakeSearchPage(make_cards(4))
+        jobs = await LinkedInScraper(page).scrape_jobs("python", "remote", limit=10)
+        assert len(jobs) == 4
+        assert page.scrolls == 2
+
+    async def test_reposted_links_are_deduplicated(self):
+        """Test a card repeated further down the list is only yielded once."""
+        cards = make_cards(5)
+        cards.append(dict(cards[1], title="Engineer 1 (promoted)"))
+        page = FakeSearchPage(cards)
+        jobs = await LinkedInScraper(page).scrape_jobs("python", "remote", limit=10)
+        assert [job["title"] for job in jobs] == [f"Engineer {i}" for i in range(5)]
+
+    async def test_card_rendered_late_is_not_skipped(self):
+        """Test a card without its link yet is read again after the next load."""
+        cards = make_cards(6)
+        lazy = cards[1]
+        # The link appears once the page has scrolled
+        cards[1] = lambda page: lazy if page.scrolls else dict(lazy, link=None)
+        page = FakeSearchPage(cards)
+        jobs = await LinkedInScraper(page).scrape_jobs("python", "remote", limit=10)
+
+        assert sorted(job["title"] for job in jobs) == [f"Engineer {i}" for i in range(6)]
+        assert len(jobs) == 6
+
+    async def test_card_that_never_parses_is_retried_once(self, monkeypatch):
+        """Test a card that never gets a link is read on one more load, then skipped."""
+        cards = make_cards(12)
+        cards[1] = dict(cards[1], link=None)
+        reads = []
+        to_job = LinkedInScraper._to_job
+
+        def counting_to_job(card):
+            reads.append(card["title"])
+            return to_job(card)
+
+        monkeypatch.setattr(LinkedInScraper, "_to_job", staticmethod(counting_to_job))
+        page = FakeSearchPage(cards)
+        jobs = await LinkedInScraper(page).scrape_jobs("python", "remote", limit=20)
+
+        assert [job["title"] for job in jobs] == [f"Engineer {i}" for i in range(12) if i != 1]
+        assert reads.count("Engineer 1") == 2
+        # Only the card loaded after it with the first page is read twice as well
+        assert len(reads) == 14
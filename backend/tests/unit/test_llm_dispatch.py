@@ -0,0 +1,155 @@
+"""
+LLM Dispatch Tests
+Tests for priority ordering, budgets and 429 handling in the LLM dispatcher.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.core.llm_dispatch import (
+    DispatchedAsyncClient,
+    LLMDispatcher,
+    LLMPriority,
+    TokenBucket,
+    retry_after_seconds,
+    use_llm_priority,
+)
+
+
+def rate_limit_error(headers=None):
+    response = httpx.Response(
+        429, headers=headers or {}, request=httpx.Request("POST", "https://api.example.com")
+    )
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+class FakeCompletions:
+    """Records call order; replies are scripted per call (response or exception)."""
+
+    def __init__(self, *replies, delay=0.0):
+        self.replies = list(replies)
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append((kwargs["messages"][0]["content"], time.monotonic()))
+        await asyncio.sleep(self.delay)
+        reply = self.replies.pop(0) if self.replies else SimpleNamespace(usage=SimpleNamespace(total_tokens=10))
+        if isinstance(reply, BaseException):
+            raise reply
+        return reply
+
+
+def make_client(completions, **dispatcher_kwargs):
+    options = {"requests_per_minute": 6000, "tokens_per_minute": 10 ** 6, "max_concurrency": 4}
+    options.update(dispatcher_kwargs)
+    dispatcher = LLMDispatcher(**options)
+    raw = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return DispatchedAsyncClient(raw, dispatcher), dispatcher
+
+
+async def call(client, prompt, priority=LLMPriority.INTERACTIVE):
+    with use_llm_priority(priority):
+        return await client.chat.completions.create(model="m", messages=[{"role": "user", "content": prompt}])
+
+
+class TestTokenBucket:
+    """Test the token bucket budget."""
+
+    def test_wait_time_and_refund(self):
+        """Test an exhausted bucket reports the refill delay and refunds restore it."""
+        bucket = TokenBucket(rate_per_minute=60)
+        bucket.consume(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+        bucket.refund(30)
+        assert bucket.wait_time(1) == 0
+
+    def test_retry_after_headers(self):
+        """Test Retry-After headers are read, preferring milliseconds."""
+        assert retry_after_seconds(rate_limit_error({"retry-after-ms": "1500"}), default=9) == 1.5
+        assert retry_after_seconds(rate_limit_error({"retry-after": "3"}), default=9) == 3.0
+        assert retry_after_seconds(rate_limit_error(), default=9) == 9
+
+
+@pytest.mark.asyncio
+class TestDispatcher:
+    """Test admission control."""
+
+    async def test_queued_calls_are_served_by_priority(self):
+        """Test waiting interactive calls go before automation and background ones."""
+        completions = FakeCompletions(delay=0.02)
+        client, dispatcher = make_client(completions, max_concurrency=1)
+
+        first = asyncio.create_task(call(client, "running"))
+        await asyncio.sleep(0.005)
+        queued = [
+            asyncio.create_task(call(client, "background", LLMPriority.BACKGROUND)),
+            asyncio.create_task(call(client, "automation", LLMPriority.AUTOMATION)),
+            asyncio.create_task(call(client, "interactive", LLMPriority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0.005)
+        assert dispatcher.stats()["queue_depth"] == {"interactive": 1, "automation": 1, "background": 1}
+
+        await asyncio.gather(first, *queued)
+        assert [prompt for prompt, _ in completions.calls] == ["running", "interactive", "automation", "background"]
+        assert dispatcher.stats()["in_flight"] == 0
+
+    async def test_concurrency_is_capped(self):
+        """Test no more than max_concurrency calls run at once."""
+        in_flight = []
+
+        class Tracking(FakeCompletions):
+            async def create(self, **kwargs):
+                in_flight.append(dispatcher._in_flight)
+                return await super().create(**kwargs)
+
+        client, dispatcher = make_client(Tracking(delay=0.01), max_concurrency=2)
+        await asyncio.gather(*(call(client, str(i)) for i in range(6)))
+        assert max(in_flight) == 2
+
+    async def test_rate_limit_pauses_then_retries(self):
+        """Test a 429 pauses dispatching for Retry-After and the call then succeeds."""
+        completions = FakeCompletions(rate_limit_error({"retry-after-ms": "100"}))
+        client, dispatcher = make_client(completions)
+
+        await call(client, "prompt")
+
+        (_, first), (_, second) = completions.calls
+        assert second - first >= 0.09
+        assert dispatcher.rate_limited == 1
+
+    async def test_rate_limit_is_raised_after_max_retries(self):
+        """Test persistent 429s are raised once max_retries is used up."""
+        completions = FakeCompletions(*(rate_limit_error({"retry-after-ms": "1"}) for _ in range(3)))
+        client, dispatcher = make_client(completions, max_retries=2)
+
+        with pytest.raises(RateLimitError):
+            await call(client, "prompt")
+        assert len(completions.calls) == 3
+        assert dispatcher.stats()["in_flight"] == 0
+
+    async def test_reported_usage_corrects_the_token_budget(self):
+        """Test the estimate is refunded down to the usage the provider reported."""
+        client, dispatcher = make_client(FakeCompletions(), tokens_per_minute=10000)
+        await call(client, "x" * 400)
+        assert dispatcher.tokens.tokens == pytest.approx(10000 - 10, abs=1)
+
+
+class TestEventLoops:
+    """Test the module-level dispatcher survives being used from several loops."""
+
+    def test_dispatcher_works_across_event_loops(self):
+        """Test acquiring from a second event loop does not hit a loop-bound Condition."""
+        client, dispatcher = make_client(FakeCompletions(delay=0.01), max_concurrency=1)
+
+        async def contended(label):
+            # Two calls for one slot, so the second waits on the Condition
+            await asyncio.gather(call(client, f"{label} a"), call(client, f"{label} b"))
+
+        asyncio.run(contended("first loop"))
+        asyncio.run(contended("second loop"))
+        assert dispatcher.stats()["in_flight"] == 0
@@ -0,0 +1,146 @@
+"""
+AgentLog Sink Tests
+Tests for batched write-behind logging, overload shedding and shutdown flush.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import log_sink as log_sink_module
+from app.services.log_sink import AgentLogSink, shrink_payload
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    batches = []
+
+    async def insert_many(batch):
+        batches.append(list(batch))
+
+    monkeypatch.setattr(log_sink_module.AgentLog, "insert_many", insert_many)
+    return batches
+
+
+def make_log(n):
+    return SimpleNamespace(input={"prompt": f"prompt {n}"}, output={"content": f"output {n}"})
+
+
+class TestShrinkPayload:
+    """Test field size limits."""
+
+    def test_default_keeps_fields_in_full(self):
+        """Test the default limit of 0 stores prompts and outputs unchanged."""
+        assert settings.AGENT_LOG_MAX_FIELD_CHARS == 0
+        payload = {"prompt": "x" * 100000}
+        assert shrink_payload(payload, settings.AGENT_LOG_MAX_FIELD_CHARS) == payload
+
+    def test_truncates_or_compresses_nested_strings(self):
+        """Test long strings in nested payloads are truncated, or compressed when asked."""
+        payload = {"messages": ["short", "y" * 50]}
+        assert shrink_payload(payload, 10)["messages"] == ["short", "yyyyyyyyyy... [truncated 40 chars]"]
+
+        compressed = shrink_payload(payload, 10, compress=True)["messages"][1]
+        assert compressed["encoding"] == "zlib+base64" and compressed["length"] == 50
+
+
+@pytest.mark.asyncio
+class TestAgentLogSink:
+    """Test the background writer."""
+
+    async def test_full_batches_are_written_together(self, writes):
+        """Test logs are written with one insert_many per batch."""
+        sink = AgentLogSink(batch_size=3, flush_interval=10)
+        for n in range(6):
+            sink.submit(make_log(n))
+        await asyncio.sleep(0.01)
+
+        assert [len(batch) for batch in writes] == [3, 3]
+        assert sink.stats()["written"] == 6
+        await sink.stop()
+
+    async def test_partial_batch_is_written_after_flush_interval(self, writes):
+        """Test a batch that never fills is written once the interval elapses."""
+        sink = AgentLogSink(batch_size=100, flush_interval=0.05)
+        sink.submit(make_log(0))
+        await asyncio.sleep(0.01)
+        assert writes == []
+
+        await asyncio.sleep(0.08)
+        assert [len(batch) for batch in writes] == [1]
+        await sink.stop()
+
+    async def test_stop_flushes_queued_logs(self, writes):
+        """Test stop() writes everything still queued or being batched."""
+        sink = AgentLogSink(batch_size=4, flush_interval=10)
+        for n in range(10):
+            sink.submit(make_log(n))
+
+        await sink.stop()
+
+        written = [log.input["prompt"] for batch in writes for log in batch]
+        assert sorted(written) == sorted(f"prompt {n}" for n in range(10))
+        assert sink.stats()["queue_depth"] == 0
+
+    async def test_stop_during_slow_write_keeps_batch(self, monkeypatch):
+        """Test a batch whose insert_many is cut short by stop() is written by the final flush."""
+        written = []
+        started = asyncio.Event()
+
+        async def insert_many(batch):
+            started.set()
+            await asyncio.sleep(1)
+            written.extend(log.input["prompt"] for log in batch)
+
+        monkeypatch.setattr(log_sink_module.AgentLog, "insert_many", insert_many)
+        sink = AgentLogSink(batch_size=3, flush_interval=10)
+        for n in range(5):
+            sink.submit(make_log(n))
+        await started.wait()
+
+        async def fast_insert_many(batch):
+            written.extend(log.input["prompt"] for log in batch)
+
+        monkeypatch.setattr(log_sink_module.AgentLog, "insert_many", fast_insert_many)
+        await sink.stop()
+
+        assert sorted(written) == sorted(f"prompt {n}" for n in range(5))
+        assert sink.stats()["queue_depth"] == 0
+
+    async def test_overload_sheds_new_logs(self, writes, monkeypatch):
+        """Test logs past the overload threshold are kept only at the sample rate."""
+        sink = AgentLogSink(max_queue=10, batch_size=100, flush_interval=10, overload_threshold=0.5,
+                            overload_sample_rate=0.0)
+        # Stop the writer from draining so the queue fills up
+        monkeypatch.setattr(sink, "start", lambda: setattr(sink, "_queue", sink._queue or asyncio.Queue(10)))
+
+        accepted = [sink.submit(make_log(n)) for n in range(8)]
+
+        assert accepted == [True] * 5 + [False] * 3
+        assert sink.stats()["sampled_out"] == 3
+
+    async def test_failed_write_is_counted(self, monkeypatch):
+        """Test a failing insert_many is counted instead of killing the writer."""
+        async def insert_many(batch):
+            raise RuntimeError("mongo down")
+
+        monkeypatch.setattr(log_sink_module.AgentLog, "insert_many", insert_many)
+        sink = AgentLogSink(batch_size=2, flush_interval=10)
+        sink.submit(make_log(0))
+        sink.submit(make_log(1))
+        await asyncio.sleep(0.01)
+
+        assert sink.stats()["failed"] == 2
+        assert not sink._worker.done()
+        await sink.stop()
+
+
+class TestWithoutEventLoop:
+    """Test submitting outside the application's event loop."""
+
+    def test_submit_without_loop_is_dropped(self):
+        """Test scripts without a running loop drop the log instead of raising."""
+        sink = AgentLogSink()
+        assert sink.submit(make_log(0)) is False
+        assert sink.stats()["dropped"] == 1
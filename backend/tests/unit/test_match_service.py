@@ -0,0 +1,151 @@
+"""
+Match Service Tests
+Tests for batched resume/job scoring, chunking and per-job fallback.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import ai_usage
+from app.services.ai_service import ai_service
+from app.services.match_service import MatchService
+
+
+class FakeMatchRepo:
+    def __init__(self, fail_for=()):
+        self.created = []
+        self.fail_for = set(fail_for)
+
+    async def create(self, **fields):
+        if fields["job_id"] in self.fail_for:
+            raise RuntimeError("write failed")
+        self.created.append(fields)
+        return SimpleNamespace(**fields)
+
+
+class FakeLLM:
+    """Replaces AIService._generate_json; answers batch prompts for the jobs it is told to score."""
+
+    def __init__(self, skip_titles=(), delay=0.0):
+        self.skip_titles = set(skip_titles)
+        self.delay = delay
+        self.prompts = []
+        self.usage = []
+        self.single_in_flight = 0
+        self.max_single_in_flight = 0
+
+    async def __call__(self, prompt, model):
+        self.prompts.append(prompt)
+        self.usage.append((ai_usage._usage_method.get(), ai_usage._usage_user.get(), model))
+        if "[Job 0]" not in prompt:
+            self.single_in_flight += 1
+            self.max_single_in_flight = max(self.max_single_in_flight, self.single_in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+            finally:
+                self.single_in_flight -= 1
+            return {"match_score": 0.4, "reasoning": "single"}
+
+        matches = []
+        position = 0
+        while f"[Job {position}]" in prompt:
+            title = prompt.split(f"[Job {position}]\n", 1)[1].split(" at ", 1)[0]
+            if title not in self.skip_titles:
+                matches.append({"index": position, "match_score": 0.9, "reasoning": f"batch {title}"})
+            position += 1
+        return {"matches": matches}
+
+
+def make_job(n, description="Python developer"):
+    return SimpleNamespace(id=f"job{n}", title=f"Title{n}", company="Acme", description=description)
+
+
+@pytest.fixture
+def resume():
+    return SimpleNamespace(id="resume1", user_id="user1", content="Python engineer with 5 years experience")
+
+
+class TestChunking:
+    """Test how jobs are packed into batch prompts."""
+
+    def test_chunks_respect_max_jobs(self, resume, monkeypatch):
+        """Test no chunk holds more than MATCH_BATCH_MAX_JOBS jobs."""
+        monkeypatch.setattr(settings, "MATCH_BATCH_MAX_JOBS", 3)
+        chunks = MatchService(FakeMatchRepo())._chunk_jobs(resume.content, [make_job(i) for i in range(7)])
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+    def test_chunks_respect_token_budget(self, resume, monkeypatch):
+        """Test a chunk is closed once the next job would exceed the token budget."""
+        monkeypatch.setattr(settings, "MATCH_BATCH_TOKEN_BUDGET", 600)
+        monkeypatch.setattr(settings, "MATCH_BATCH_JOB_CHARS", 1000)
+        jobs = [make_job(i, description="x" * 800) for i in range(4)]
+        chunks = MatchService(FakeMatchRepo())._chunk_jobs(resume.content, jobs)
+        assert [len(chunk) for chunk in chunks] == [2, 2]
+        assert [job for chunk in chunks for job in chunk] == jobs
+
+
+@pytest.mark.asyncio
+class TestBatchMatching:
+    """Test match_resume_with_jobs."""
+
+    async def test_one_call_per_chunk_in_job_order(self, resume, monkeypatch):
+        """Test jobs are scored in one call and matches come back in input order."""
+        llm = FakeLLM()
+        monkeypatch.setattr(ai_service, "_generate_json", llm)
+        repo = FakeMatchRepo()
+        jobs = [make_job(i) for i in range(4)]
+
+        matches = await MatchService(repo).match_resume_with_jobs(resume, jobs)
+
+        assert len(llm.prompts) == 1
+        assert [m.job_id for m in matches] == ["job0", "job1", "job2", "job3"]
+        assert all(m.match_score == 0.9 for m in matches)
+        assert llm.usage == [("match_resume_with_jobs", "user1", settings.AI_MODEL_FAST)]
+
+    async def test_missing_jobs_fall_back_with_bounded_concurrency(self, resume, monkeypatch):
+        """Test jobs absent from the batch reply are scored singly, a few at a time."""
+        monkeypatch.setattr(settings, "MATCH_FALLBACK_CONCURRENCY", 2)
+        jobs = [make_job(i) for i in range(6)]
+        llm = FakeLLM(skip_titles={f"Title{i}" for i in range(1, 6)}, delay=0.02)
+        monkeypatch.setattr(ai_service, "_generate_json", llm)
+
+        matches = await MatchService(FakeMatchRepo()).match_resume_with_jobs(resume, jobs)
+
+        assert [m.match_score for m in matches] == [0.9, 0.4, 0.4, 0.4, 0.4, 0.4]
+        assert llm.max_single_in_flight == 2
+        single_usage = [usage for usage in llm.usage if usage[0] == "match_resume_with_job"]
+        assert single_usage == [("match_resume_with_job", "user1", settings.AI_MODEL_FAST)] * 5
+
+    async def test_invalid_entries_are_rejected(self, resume, monkeypatch):
+        """Test out-of-range scores and indexes fall back instead of being stored."""
+        async def reply(prompt, model):
+            if "[Job 0]" not in prompt:
+                return {"match_score": 0.3, "reasoning": "single"}
+            return {"matches": [
+                {"index": 0, "match_score": 7, "reasoning": "bad score"},
+                {"index": 5, "match_score": 0.5, "reasoning": "bad index"},
+                {"index": 1, "match_score": 0.8, "reasoning": "ok"},
+            ]}
+
+        monkeypatch.setattr(ai_service, "_generate_json", reply)
+        matches = await MatchService(FakeMatchRepo()).match_resume_with_jobs(resume, [make_job(0), make_job(1)])
+        assert [m.match_score for m in matches] == [0.3, 0.8]
+
+    async def test_store_failure_is_returned_per_job(self, resume, monkeypatch):
+        """Test a failed write surfaces for that job only when return_exceptions is set."""
+        monkeypatch.setattr(ai_service, "_generate_json", FakeLLM())
+        jobs = [make_job(i) for i in range(3)]
+        service = MatchService(FakeMatchRepo(fail_for={"job1"}))
+
+        matches = await service.match_resume_with_jobs(resume, jobs, return_exceptions=True)
+        assert isinstance(matches[1], RuntimeError)
+        assert [m.job_id for m in (matches[0], matches[2])] == ["job0", "job2"]
+
+        with pytest.raises(RuntimeError):
+            await service.match_resume_with_jobs(resume, jobs)
+
+    async def test_empty_job_list(self, resume):
+        """Test no call is made for an empty job list."""
+        assert await MatchService(FakeMatchRepo()).match_resume_with_jobs(resume, []) == []
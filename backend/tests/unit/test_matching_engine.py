@@ -0,0 +1,132 @@
+"""
+Matching Engine Tests
+Tests for the parallel analysis graph, its state reducers and node timings.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.core.cache import TieredCache
+from app.services import matching_engine as engine_module
+from app.services.ai_service import ai_service
+
+
+class FakeLLM:
+    """Replaces AIService._complete; records how many calls overlap."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, prompt, model=None, json_mode=False, temperature=0.7):
+        self.calls.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if "Analyze this job description" in prompt:
+            return json.dumps({"tech_skills": ["python"], "soft_skills": [], "experience_years": 3, "responsibilities": []})
+        if "Extract key skills" in prompt:
+            return json.dumps({"skills": ["python"], "experience_summary": "3 years"})
+        if "Calculate a match score" in prompt:
+            return json.dumps({"score": 80, "matching_skills": ["python"], "missing_skills": ["go"], "fit_summary": "good"})
+        return "Add Go\nMention scale\nQuantify impact"
+
+
+@pytest.fixture
+def fake_llm(monkeypatch, cache_backend):
+    llm = FakeLLM()
+    monkeypatch.setattr(ai_service, "_complete", llm)
+    monkeypatch.setattr(engine_module, "analysis_cache", TieredCache("match_analysis", backend=cache_backend))
+    return llm
+
+
+def initial_state(job_description="Python developer", resume_text="Python engineer"):
+    return {
+        "job_description": job_description,
+        "resume_text": resume_text,
+        "job_analysis": None,
+        "resume_analysis": None,
+        "match_result": None,
+        "recommendations": [],
+        "error": None,
+        "node_timings_ms": {},
+    }
+
+
+class TestReducers:
+    """Test the state reducers used by the parallel branches."""
+
+    def test_keep_first_error(self):
+        """Test the first reported error wins."""
+        assert engine_module._keep_first_error(None, "job failed") == "job failed"
+        assert engine_module._keep_first_error("job failed", "resume failed") == "job failed"
+        assert engine_module._keep_first_error(None, None) is None
+
+    def test_merge_timings(self):
+        """Test timings from several branches are merged."""
+        merged = engine_module._merge_timings({"analyze_job": 1.0}, {"analyze_resume": 2.0})
+        assert merged == {"analyze_job": 1.0, "analyze_resume": 2.0}
+        assert engine_module._merge_timings(None, {"a": 1.0}) == {"a": 1.0}
+
+
+@pytest.mark.asyncio
+class TestMatchingGraph:
+    """Test the compiled matching workflow."""
+
+    async def test_analyses_run_in_parallel(self, fake_llm):
+        """Test job and resume analysis overlap instead of running back to back."""
+        state = await engine_module.engine.ainvoke(initial_state())
+
+        assert fake_llm.max_in_flight == 2
+        assert state["match_result"]["score"] == 80
+        assert state["recommendations"] == ["Add Go", "Mention scale", "Quantify impact"]
+
+    async def test_node_timings_recorded_for_every_node(self, fake_llm):
+        """Test node_timings_ms has an entry per node."""
+        state = await engine_module.engine.ainvoke(initial_state())
+
+        timings = state["node_timings_ms"]
+        assert set(timings) == {"analyze_job", "analyze_resume", "calculate_match", "generate_advice"}
+        assert all(ms >= 0 for ms in timings.values())
+
+
+@pytest.mark.asyncio
+class TestAnalysisCache:
+    """Test caching of job and resume analyses."""
+
+    async def test_repeat_match_reuses_cached_analyses(self, fake_llm):
+        """Test a second match for the same texts only calls the LLM for scoring and advice."""
+        await engine_module.engine.ainvoke(initial_state())
+        assert len(fake_llm.calls) == 4
+
+        await engine_module.engine.ainvoke(initial_state())
+        assert len(fake_llm.calls) == 6
+        assert not any("Analyze this job description" in prompt for prompt in fake_llm.calls[4:])
+
+    async def test_cache_key_ignores_whitespace_but_not_content(self):
+        """Test keys are stable under reformatting and change when the text changes."""
+        model = "model"
+        key = engine_module.analysis_cache_key("job", "Python  developer\n", model)
+        assert key == engine_module.analysis_cache_key("job", "Python developer", model)
+        assert key != engine_module.analysis_cache_key("job", "Go developer", model)
+        assert key != engine_module.analysis_cache_key("resume", "Python developer", model)
+
+    async def test_failed_analysis_is_not_cached(self, fake_llm, monkeypatch):
+        """Test an LLM failure is reported as an error and nothing is cached."""
+        async def unavailable(prompt, model):
+            raise RuntimeError("upstream down")
+
+        monkeypatch.setattr(ai_service, "_complete_json", unavailable)
+        state = await engine_module.engine.ainvoke(initial_state())
+
+        assert state["error"] in {"Failed to analyze job description", "Failed to analyze resume"}
+        assert state["match_result"] is None
+        assert len(engine_module.analysis_cache.local) == 0
+        assert engine_module.analysis_cache.backend.data == {}
@@ -0,0 +1,323 @@
+"""
+Near Duplicates Tests
+Tests for MinHash signatures, the LSH index and flagging near-duplicate scraped jobs.
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models.job import ScrapedJob
+from app.services import near_duplicates as near_dup_module
+from app.services.job_scraper import JobScraperService
+from app.services.near_duplicates import (
+    MinHasher,
+    MinHashLSH,
+    NearDuplicateService,
+    is_hidden_duplicate,
+    job_shingles,
+    visible_jobs_filter,
+)
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to design build and operate Python services on AWS. "
+    "You will own REST APIs, data pipelines and observability, mentor junior engineers, "
+    "review code, and work closely with product managers to ship features every week."
+)
+REPOSTED = DESCRIPTION + " Apply through our careers page."
+UNRELATED = (
+    "Seeking a pastry chef to run the morning bakery shift, laminate croissant dough, "
+    "plan seasonal tarts and keep the walk-in fridge organised and spotless."
+)
+
+
+def job_data(n, description=DESCRIPTION, company="Acme"):
+    return {
+        "title": "Backend Engineer",
+        "company": company,
+        "location": "Remote",
+        "link": f"https://boards.example/{n}",
+        "description": description,
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = NearDuplicateService()
+    service.index = MinHashLSH(settings.NEAR_DUPLICATE_NUM_PERM, settings.NEAR_DUPLICATE_BANDS)
+    monkeypatch.setattr(near_dup_module, "near_duplicate_service", service)
+    return service
+
+
+class TestMinHash:
+    """Test shingling, signatures and the LSH index."""
+
+    def test_shingles_ignore_case_punctuation_and_stop_words(self):
+        """Test reformatted text gives the same shingles."""
+        assert job_shingles("Backend Engineer", "ACME", "Python, AWS!") == job_shingles("backend engineer", "Acme", "python aws")
+        assert job_shingles("Go", "", None) == {"go"}
+        assert job_shingles("", "", None) == set()
+
+    def test_similarity_estimates_jaccard(self):
+        """Test the MinHash estimate is close to the exact Jaccard similarity."""
+        a = job_shingles("Backend Engineer", "Acme", DESCRIPTION)
+        b = job_shingles("Backend Engineer", "Acme", REPOSTED)
+        exact = len(a & b) / len(a | b)
+        hasher = MinHasher(256)
+
+        assert MinHasher.similarity(hasher.signature(a), hasher.signature(b)) == pytest.approx(exact, abs=0.1)
+        assert MinHasher.similarity(hasher.signature(a), hasher.signature(a)) == 1.0
+        unrelated = hasher.signature(job_shingles("Pastry Chef", "Bakery", UNRELATED))
+        assert MinHasher.similarity(hasher.signature(a), unrelated) < 0.1
+
+    def test_lsh_candidates_and_removal(self):
+        """Test similar signatures share a bucket and removed keys are gone from every bucket."""
+        hasher = MinHasher(120)
+        index = MinHashLSH(120, 40)
+        original = hasher.signature(job_shingles("Backend Engineer", "Acme", DESCRIPTION))
+        index.add("original", original)
+        index.add("chef", hasher.signature(job_shingles("Pastry Chef", "Bakery", UNRELATED)))
+
+        reposted = hasher.signature(job_shingles("Backend Engineer", "Acme", REPOSTED))
+        assert index.candidates(reposted) == {"original"}
+        key, score = index.query(reposted, 0.35)
+        assert key == "original" and score > 0.5
+
+        assert index.remove("original") and not index.remove("original")
+        assert index.candidates(reposted) == set()
+        assert all("original" not in bucket for buckets in index._buckets for bucket in buckets.values())
+
+    def test_bands_must_divide_num_perm(self):
+        """Test a banding that does not split the signature evenly is rejected."""
+        with pytest.raises(ValueError):
+            MinHashLSH(128, 40)
+
+    def test_default_banding_fits_threshold(self):
+        """Test the LSH candidate threshold sits just below the similarity threshold."""
+        rows = settings.NEAR_DUPLICATE_NUM_PERM // settings.NEAR_DUPLICATE_BANDS
+        lsh_threshold = (1 / settings.NEAR_DUPLICATE_BANDS) ** (1 / rows)
+        assert settings.NEAR_DUPLICATE_NUM_PERM % settings.NEAR_DUPLICATE_BANDS == 0
+        assert settings.NEAR_DUPLICATE_THRESHOLD - 0.1 <= lsh_threshold < settings.NEAR_DUPLICATE_THRESHOLD
+        assert settings.NEAR_DUPLICATE_HIDE_THRESHOLD > settings.NEAR_DUPLICATE_THRESHOLD
+
+
+@pytest.mark.asyncio
+class TestFlagging:
+    """Test near-duplicate flagging in JobScraperService.upsert_jobs."""
+
+    async def test_duplicate_of_stored_job(self, service, scraped_jobs):
+        """Test a repost of an indexed job is inserted but points at it."""
+        first = await JobScraperService().upsert_jobs([job_data(1)])
+        result = await JobScraperService().upsert_jobs([job_data(2, description=REPOSTED)])
+
+        [repost] = result["jobs"]
+        assert repost.duplicate_of == first["jobs"][0].id and repost.duplicate_score >= settings.NEAR_DUPLICATE_THRESHOLD
+        assert result["duplicates"] == 1
+        assert scraped_jobs.docs[job_data(2)["link"]]["duplicate_of"] == first["jobs"][0].id
+        assert len(service.index) == 1
+
+    async def test_duplicate_within_batch_is_written_after_insert(self, service, scraped_jobs):
+        """Test a batch job matching an earlier inserted batch job is flagged with a follow-up $set."""
+        result = await JobScraperService().upsert_jobs([
+            job_data(1), job_data(2, description=REPOSTED), job_data(3, description=UNRELATED, company="Bakery"),
+        ])
+
+        original, repost, chef = result["jobs"]
+        assert repost.duplicate_of == original.id and original.duplicate_of is None and chef.duplicate_of is None
+        assert scraped_jobs.docs[job_data(2)["link"]]["duplicate_of"] == original.id
+        assert scraped_jobs.docs[job_data(2)["link"]]["duplicate_score"] == repost.duplicate_score
+        assert len(scraped_jobs.writes) == 2
+        assert set(service.index.signatures) == {str(original.id), str(chef.id)}
+
+    async def test_never_points_at_a_job_that_was_not_inserted(self, service, scraped_jobs):
+        """Test a batch job is not flagged against one whose link turned out to be stored already."""
+        scraped_jobs.race_links = {job_data(1)["link"]}
+
+        result = await JobScraperService().upsert_jobs([job_data(1), job_data(2, description=REPOSTED)])
+
+        [repost] = result["jobs"]
+        assert repost.duplicate_of is None
+        stored_ids = {doc["_id"] for doc in scraped_jobs.docs.values()}
+        assert all(doc.get("duplicate_of") in stored_ids | {None} for doc in scraped_jobs.docs.values())
+        assert list(service.index.signatures) == [str(repost.id)]
+
+    async def test_nothing_flagged_while_index_is_building(self, service, scraped_jobs):
+        """Test jobs are inserted unflagged before the index exists."""
+        service.index = None
+        result = await JobScraperService().upsert_jobs([job_data(1), job_data(2, description=REPOSTED)])
+        assert result["duplicates"] == 0 and len(scraped_jobs.writes) == 1
+
+
+@pytest.mark.asyncio
+class TestDeletion:
+    """Test deleting scraped jobs keeps both indexes in sync."""
+
+    @pytest.fixture
+    def vector_removals(self, monkeypatch):
+        from app.services.vector_index import vector_index_service
+
+        removed = []
+
+        async def remove_jobs(job_ids):
+            removed.extend(job_ids)
+            return len(job_ids)
+
+        monkeypatch.setattr(vector_index_service, "remove_jobs", remove_jobs)
+        return removed
+
+    async def test_delete_jobs_removes_copies_and_index_entries(self, service, scraped_jobs, vector_removals):
+        """Test a deleted posting takes its near-duplicates with it, in MongoDB and both indexes."""
+        saved = await JobScraperService().upsert_jobs([
+            job_data(1), job_data(2, description=REPOSTED), job_data(3, description=UNRELATED, company="Bakery"),
+        ])
+        original, repost, chef = saved["jobs"]
+
+        deleted = await JobScraperService().delete_jobs([original.id])
+
+        assert deleted == 2
+        assert list(scraped_jobs.docs) == [job_data(3)["link"]]
+        assert set(service.index.signatures) == {str(chef.id)}
+        assert vector_removals == [original.id, repost.id]
+
+    async def test_cleanup_task_deletes_jobs_past_retention(self, service, scraped_jobs, vector_removals, monkeypatch):
+        """Test the scheduled cleanup deletes old jobs in batches and is off by default."""
+        from datetime import datetime, timedelta
+
+        from app.scheduler import jobs as scheduler_jobs
+
+        saved = await JobScraperService().upsert_jobs([
+            job_data(1), job_data(2, description=UNRELATED, company="Bakery"),
+        ])
+        old, recent = saved["jobs"]
+        scraped_jobs.docs[old.link]["created_at"] = datetime.utcnow() - timedelta(days=40)
+
+        await scheduler_jobs.cleanup_old_scraped_jobs_task()
+        assert len(scraped_jobs.docs) == 2
+
+        monkeypatch.setattr(settings, "SCRAPED_JOB_RETENTION_DAYS", 30)
+        await scheduler_jobs.cleanup_old_scraped_jobs_task()
+        assert list(scraped_jobs.docs) == [recent.link]
+        assert set(service.index.signatures) == {str(recent.id)}
+
+
+class FakeCursor:
+    def __init__(self, docs, started):
+        self.docs = docs
+        self.started = started
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            self.started.set()
+            await asyncio.sleep(0.01)
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.started = asyncio.Event()
+        self.queries = []
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        return FakeCursor(self.docs, self.started)
+
+
+@pytest.mark.asyncio
+class TestRebuild:
+    """Test building the index from MongoDB."""
+
+    async def test_jobs_stored_during_rebuild_are_indexed(self, monkeypatch, scraped_jobs):
+        """Test canonical jobs added while the rebuild reads MongoDB end up in the new index."""
+        stored = {"_id": "65f000000000000000000001", **job_data(1, description=UNRELATED)}
+        collection = FakeCollection([stored])
+        monkeypatch.setattr(near_dup_module, "get_collection", lambda model: collection)
+        service = NearDuplicateService()
+
+        rebuild = asyncio.create_task(service.start())
+        await collection.started.wait()
+        new_job = ScrapedJob(**job_data(2))
+        new_job.id = "65f000000000000000000002"
+        service.add_jobs([new_job])
+        await rebuild
+
+        assert collection.queries == [{"duplicate_of": None}]
+        assert set(service.index.signatures) == {stored["_id"], str(new_job.id)}
+        assert service._pending is None
+
+    async def test_jobs_deleted_during_rebuild_are_dropped(self, monkeypatch, scraped_jobs):
+        """Test a job the rebuild already read is left out if it was deleted meanwhile."""
+        stored = [
+            {"_id": "65f000000000000000000001", **job_data(1, description=UNRELATED)},
+            {"_id": "65f000000000000000000002", **job_data(2)},
+        ]
+        collection = FakeCollection(stored)
+        monkeypatch.setattr(near_dup_module, "get_collection", lambda model: collection)
+        service = NearDuplicateService()
+
+        rebuild = asyncio.create_task(service.start())
+        await collection.started.wait()
+        service.remove_jobs([stored[0]["_id"]])
+        await rebuild
+
+        assert set(service.index.signatures) == {stored[1]["_id"]}
+
+    async def test_disabled(self, monkeypatch):
+        """Test start does nothing when near-duplicate detection is off."""
+        monkeypatch.setattr(settings, "NEAR_DUPLICATE_ENABLED", False)
+        service = NearDuplicateService()
+        await service.start()
+        assert service.index is None
+
+
+class TestHiding:
+    """Test which flagged jobs are hidden."""
+
+    def test_only_confident_duplicates_are_hidden(self, monkeypatch, scraped_jobs):
+        """Test jobs are hidden only at or above NEAR_DUPLICATE_HIDE_THRESHOLD."""
+        monkeypatch.setattr(settings, "NEAR_DUPLICATE_HIDE_THRESHOLD", 0.5)
+        canonical_id = "65f000000000000000000001"
+        canonical = ScrapedJob(**job_data(1))
+        likely = ScrapedJob(**job_data(2), duplicate_of=canonical_id, duplicate_score=0.42)
+        certain = ScrapedJob(**job_data(3), duplicate_of=canonical_id, duplicate_score=0.5)
+
+        assert [is_hidden_duplicate(job) for job in (canonical, likely, certain)] == [False, False, True]
+        assert visible_jobs_filter() == {"$or": [
+            {"duplicate_of": None},
+            {"duplicate_score": {"$lt": 0.5}},
+        ]}
+
+
+@pytest.mark.asyncio
+class TestSaveNewJobs:
+    """Test alerts and recommendation indexing for saved batches."""
+
+    async def test_hidden_duplicates_not_alerted_and_duplicates_not_indexed(self, service, scraped_jobs, monkeypatch):
+        """Test canonical jobs are alerted and indexed, hidden reposts are neither."""
+        from app.services import job_scraper as job_scraper_module
+        from app.services.vector_index import vector_index_service
+
+        alerts = []
+        indexed = []
+
+        async def send_alert(message):
+            alerts.append(message)
+
+        async def add_jobs(jobs):
+            indexed.extend(jobs)
+
+        monkeypatch.setattr(job_scraper_module.telegram_service, "send_alert", send_alert)
+        monkeypatch.setattr(vector_index_service, "add_jobs", add_jobs)
+        monkeypatch.setattr(settings, "NEAR_DUPLICATE_HIDE_THRESHOLD", 0.4)
+
+        saved = await JobScraperService()._save_new_jobs([job_data(1), job_data(2, description=REPOSTED)])
+        await asyncio.sleep(0)
+
+        original, repost = saved["jobs"]
+        assert repost.duplicate_score >= 0.4
+        assert indexed == [original]
+        assert len(alerts) == 1 and original.link in alerts[0]
@@ -0,0 +1,164 @@
+"""
+Single-Flight Tests
+Tests for coalescing identical in-flight calls, locally and across workers.
+"""
+import asyncio
+
+import pytest
+
+from app.core import singleflight as singleflight_module
+from app.core.ai import ai_client
+from app.core.singleflight import SingleFlight
+from app.services.ai_service import ai_service
+
+
+class FakeRedis:
+    """The few Redis string commands SingleFlight uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class CountingCall:
+    def __init__(self, result="done", delay=0.05, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+class TestLocalSingleFlight:
+    """Test coalescing within one process."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent keys run the function once."""
+        flight = SingleFlight("test")
+        call = CountingCall()
+
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(5)))
+
+        assert results == ["done"] * 5
+        assert call.calls == 1
+        assert flight.stats() == {"hits": 4, "remote_hits": 0, "misses": 1, "in_flight": 0}
+
+    async def test_different_keys_and_later_calls_run_again(self):
+        """Test only concurrent calls with the same key are coalesced."""
+        flight = SingleFlight("test")
+        call = CountingCall()
+
+        await asyncio.gather(flight.do("a", call), flight.do("b", call))
+        await flight.do("a", call)
+        assert call.calls == 3
+
+    async def test_error_reaches_every_waiter(self):
+        """Test a failure is raised to all coalesced callers and not remembered."""
+        flight = SingleFlight("test")
+        call = CountingCall(error=RuntimeError("upstream"))
+
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert call.calls == 1
+        assert flight.stats()["in_flight"] == 0
+
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test cancelling one caller leaves the shared call running for the rest."""
+        flight = SingleFlight("test")
+        call = CountingCall(delay=0.1)
+
+        first = asyncio.create_task(flight.do("key", call))
+        second = asyncio.create_task(flight.do("key", call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+        assert first.cancelled()
+        assert call.calls == 1
+
+
+@pytest.mark.asyncio
+class TestDistributedSingleFlight:
+    """Test coalescing across workers through Redis."""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        fake = FakeRedis()
+
+        async def get_client():
+            return fake
+
+        monkeypatch.setattr(singleflight_module, "get_redis_client", get_client)
+        return fake
+
+    async def test_other_worker_reads_leader_result(self, redis):
+        """Test a second worker waits for the leader and reuses its published result."""
+        leader = SingleFlight("test", distributed=True, poll_interval=0.01)
+        follower = SingleFlight("test", distributed=True, poll_interval=0.01)
+        call = CountingCall(delay=0.05)
+
+        results = await asyncio.gather(leader.do("key", call), follower.do("key", call))
+
+        assert results == ["done", "done"]
+        assert call.calls == 1
+        assert leader.misses + follower.misses == 1
+        assert leader.remote_hits + follower.remote_hits == 1
+        assert "test:lock:key" not in redis.data
+        assert redis.data["test:result:key"] == "done"
+
+    async def test_falls_back_to_local_when_redis_is_down(self, monkeypatch):
+        """Test an unreachable Redis still runs the call (coalesced locally)."""
+        async def get_client():
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(singleflight_module, "get_redis_client", get_client)
+        flight = SingleFlight("test", distributed=True)
+        call = CountingCall()
+
+        assert await asyncio.gather(flight.do("key", call), flight.do("key", call)) == ["done", "done"]
+        assert call.calls == 1
+
+
+@pytest.mark.asyncio
+class TestAIServiceCoalescing:
+    """Test AIService routes completions through the single-flight group."""
+
+    async def test_identical_prompts_make_one_model_call(self, monkeypatch):
+        """Test concurrent identical prompts share a completion; different ones do not."""
+        calls = []
+
+        async def call_model(client, prompt, model, json_mode, temperature):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return f"answer to {prompt}"
+
+        monkeypatch.setattr(ai_client, "get_async_client", lambda: object())
+        monkeypatch.setattr(ai_service, "_call_model", call_model)
+
+        results = await asyncio.gather(
+            ai_service._complete("same"), ai_service._complete("same"), ai_service._complete("other")
+        )
+
+        assert results == ["answer to same", "answer to same", "answer to other"]
+        assert sorted(calls) == ["other", "same"]
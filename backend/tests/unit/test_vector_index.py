@@ -0,0 +1,244 @@
+"""
+Vector Index Tests
+Tests for IVF search recall, tombstones and rebuilding the index from MongoDB.
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services import vector_index as vector_module
+from app.services.embedding_service import EmbeddingService, HashingEmbedder
+from app.services.vector_index import IVFIndex, VectorIndexService
+
+
+def matches(doc, query):
+    """Evaluate the subset of MongoDB filters the index uses."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+            continue
+        if key.endswith(".0"):
+            value = doc.get(key[:-2]) or []
+            present = len(value) > 0
+            if present != condition["$exists"]:
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(condition, dict) and "$ne" in condition:
+            if value == condition["$ne"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.projections = []
+        self.bulk_writes = []
+
+    def find(self, query, projection):
+        self.projections.append(projection)
+        fields = set(projection) | {"_id"}
+        return FakeCursor([
+            {field: doc[field] for field in fields if field in doc}
+            for doc in self.docs.values() if matches(doc, query)
+        ])
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append(len(operations))
+        for operation in operations:
+            doc = self.docs[operation._filter["_id"]]
+            doc.update(operation._doc["$set"])
+
+
+def make_doc(n, **fields):
+    return {
+        "_id": f"job{n}", "title": f"Role {n}", "company": "Acme", "location": "Remote",
+        "description": f"python developer skill{n}", "duplicate_of": None,
+        "embedding_vector": [], "embedding_model": None, **fields,
+    }
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    service = EmbeddingService(HashingEmbedder(32))
+    monkeypatch.setattr(vector_module, "embedding_service", service)
+    return service.embedder
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, embedder):
+    monkeypatch.setattr(settings, "VECTOR_INDEX_LISTS", 4)
+    return VectorIndexService(str(tmp_path / "index.npz"))
+
+
+class TestIVFIndex:
+    """Test the in-memory IVF index."""
+
+    def test_recall_against_brute_force(self):
+        """Test probing a quarter of the lists finds most exact top-10 neighbours."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(16, 32))
+        vectors = np.repeat(centers, 100, axis=0) + rng.normal(scale=0.3, size=(1600, 32))
+        index = IVFIndex(32, n_lists=16, n_probe=4)
+        index.add([str(i) for i in range(len(vectors))], vectors)
+        index.train()
+        assert index.is_trained
+
+        recall = []
+        for query in rng.normal(size=(20, 32)) + centers[rng.integers(0, 16, size=20)]:
+            exact = {vector_id for vector_id, _ in index.brute_force(query, k=10)}
+            approx = {vector_id for vector_id, _ in index.search(query, k=10)}
+            recall.append(len(exact & approx) / 10)
+        assert np.mean(recall) >= 0.9
+
+    def test_small_index_uses_exact_search(self):
+        """Test too few vectors to train falls back to an exact scan."""
+        index = IVFIndex(4, n_lists=16)
+        index.add(["a", "b"], np.array([[1, 0, 0, 0], [0, 1, 0, 0]]))
+        index.train()
+        assert not index.is_trained
+        assert index.search([1, 0.1, 0, 0], k=1)[0][0] == "a"
+
+    def test_fit_leaves_index_unchanged(self):
+        """Test fit only returns centroids and assignments; set_training applies both."""
+        rng = np.random.default_rng(1)
+        index = IVFIndex(8, n_lists=4)
+        index.add([str(i) for i in range(200)], rng.normal(size=(200, 8)))
+
+        centroids, assignments = index.fit()
+        assert not index.is_trained and not index.assignments.any()
+
+        index.set_training(centroids, assignments)
+        assert index.centroids is centroids and index.assignments is assignments
+        index.add(["new"], rng.normal(size=(1, 8)))
+        with pytest.raises(ValueError):
+            index.set_training(centroids, assignments)
+
+    def test_removed_vectors_are_not_returned(self):
+        """Test tombstoned ids disappear from results and compaction keeps the rest."""
+        index = IVFIndex(2, n_lists=1)
+        index.add([f"v{i}" for i in range(8)], np.array([[1.0, i / 10] for i in range(8)]))
+
+        assert index.remove(["v0"]) == 1
+        assert index.deleted.sum() == 1
+        assert "v0" not in {vector_id for vector_id, _ in index.search([1, 0], k=8)}
+
+        index.remove(["v1", "v2"])
+        assert len(index.ids) == 5 and not index.deleted.any()
+        assert {vector_id for vector_id, _ in index.search([1, 0], k=8)} == {f"v{i}" for i in range(3, 8)}
+
+    def test_add_replaces_existing_id(self):
+        """Test re-adding an id keeps a single live entry with the new vector."""
+        index = IVFIndex(2, n_lists=1)
+        index.add(["a"], np.array([[1.0, 0.0]]))
+        index.add(["a"], np.array([[0.0, 1.0]]))
+        assert len(index) == 1
+        assert index.search([0, 1], k=5) == [("a", pytest.approx(1.0))]
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved index loads with the same ids, tombstones and results."""
+        index = IVFIndex(2, n_lists=1)
+        index.add(["a", "b", "c", "d", "e"], np.array([[1.0, i] for i in range(5)]))
+        index.remove(["b"])
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+
+        loaded = IVFIndex.load(path)
+        assert len(loaded) == 4
+        assert loaded.search([1, 0], k=5) == index.search([1, 0], k=5)
+
+
+@pytest.mark.asyncio
+class TestVectorIndexService:
+    """Test building and updating the index from MongoDB."""
+
+    async def test_rebuild_embeds_stale_jobs_in_batches(self, service, embedder, monkeypatch):
+        """Test only stale jobs are embedded, in batches written with one bulk $set each."""
+        monkeypatch.setattr(settings, "VECTOR_INDEX_EMBED_BATCH", 2)
+        current = embedder.embed(["already embedded"])[0]
+        docs = [make_doc(i) for i in range(5)]
+        docs.append(make_doc(5, embedding_vector=current, embedding_model=embedder.name))
+        docs.append(make_doc(6, embedding_vector=current, embedding_model="old-model"))
+        docs.append(make_doc(7, duplicate_of="job0"))
+        collection = FakeCollection(docs)
+        monkeypatch.setattr(vector_module, "get_collection", lambda model: collection)
+
+        await service.rebuild()
+
+        assert collection.bulk_writes == [2, 2, 2]
+        assert set(service.index.ids) == {f"job{i}" for i in range(7)}
+        assert all(collection.docs[f"job{i}"]["embedding_model"] == embedder.name for i in range(7))
+        assert collection.docs["job7"]["embedding_vector"] == []
+        # Text is only loaded for stale jobs; current ones load just their vector
+        assert {"description"} <= set(collection.projections[0]) and "embedding_vector" not in collection.projections[0]
+        assert collection.projections[1] == {"embedding_vector": 1}
+
+    async def test_add_jobs_writes_embeddings_in_one_bulk_write(self, service, monkeypatch):
+        """Test newly scraped jobs are embedded, stored with one bulk write and searchable."""
+        collection = FakeCollection([make_doc(i) for i in range(3)])
+        monkeypatch.setattr(vector_module, "get_collection", lambda model: collection)
+        await service.rebuild()
+        collection.bulk_writes.clear()
+
+        collection.docs["job3"] = make_doc(3, description="golang kubernetes operator")
+        job = SimpleNamespace(id="job3", **{k: v for k, v in collection.docs["job3"].items() if k != "_id"})
+        await service.add_jobs([job])
+
+        assert collection.bulk_writes == [1]
+        assert collection.docs["job3"]["embedding_vector"] == job.embedding_vector
+        query = vector_module.embedding_service.embedder.embed(["golang kubernetes operator"])[0]
+        assert service.index.search(query, k=1)[0][0] == "job3"
+
+    async def test_search_during_retrain_sees_consistent_index(self, service, monkeypatch):
+        """Test recommend-time searches keep the old centroids and assignments until a retrain finishes."""
+        rng = np.random.default_rng(2)
+        index = IVFIndex(8, n_lists=4, n_probe=1)
+        index.add([str(i) for i in range(400)], rng.normal(size=(400, 8)))
+        index.train()
+        service.index = index
+        old_centroids, old_assignments = index.centroids, index.assignments
+
+        fit = index.fit
+        in_thread = threading.Event()
+        release = threading.Event()
+
+        def slow_fit():
+            result = fit(seed=1)
+            in_thread.set()
+            release.wait(5)
+            return result
+
+        monkeypatch.setattr(index, "fit", slow_fit)
+        retrain = asyncio.create_task(service._train(index))
+        while not in_thread.is_set():
+            await asyncio.sleep(0.001)
+
+        query = rng.normal(size=8)
+        before = index.search(query, k=5)
+        assert index.centroids is old_centroids and index.assignments is old_assignments
+        release.set()
+        await retrain
+
+        assert index.centroids is not old_centroids
+        assert (index.assignments == IVFIndex._assign(index.vectors, index.centroids)).all()
+        assert len(before) == 5
@@ -1,6 +1,44 @@
-from .scrapers import *
-from .ai import *
-from .resume import *
-from .automation import *
-from .communications import *
-from .db import *
+"""
+Job scraping, resume generation and application automation.
+
+Subpackages are imported on first use rather than with the package, so
+entry points such as ``python -m bot_engine.worker`` only load (and need
+the dependencies of) the modules they actually use.
+"""
+import importlib
+
+# Public name -> subpackage that provides it
+_EXPORTS = {
+    "scrape_jobs_from_linkedin": "scrapers",
+    "scrape_jobs_from_indeed": "scrapers",
+    "scrape_jobs_from_naukri": "scrapers",
+    "ai_match_jobs_tfidf": "ai",
+    "ats_keyword_booster": "ai",
+    "TfidfJobIndex": "ai",
+    "scraped_jobs_source": "ai",
+    "gpt_rewrite_bullets": "ai",
+    "generate_cover_letter_gpt": "ai",
+    "generate_resume_gpt_async": "ai",
+    "render_resume_text": "ai",
+    "fetch_github_projects": "resume",
+    "parse_readme_to_bullets": "resume",
+    "generate_latex_resume": "resume",
+    "auto_apply_selenium": "automation",
+    "chrome_extension_support": "automation",
+    "send_hr_email_with_attachments": "communications",
+    "followup_email_after_days": "communications",
+    "telegram_notifications": "communications",
+    "EmailService": "communications",
+    "update_database_status": "db",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    subpackage = _EXPORTS.get(name)
+    if subpackage is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{subpackage}", __name__), name)
+    globals()[name] = value
+    return value
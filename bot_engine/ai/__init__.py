@@ -1,2 +1,3 @@
 from .matching import ai_match_jobs_tfidf, ats_keyword_booster
-from .gpt import gpt_rewrite_bullets, generate_cover_letter_gpt
+from .tfidf_index import TfidfJobIndex, scraped_jobs_source
+from .gpt import gpt_rewrite_bullets, generate_cover_letter_gpt, generate_resume_gpt_async, render_resume_text
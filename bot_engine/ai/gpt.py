@@ -1,9 +1,51 @@
 import os
 import openai
-from typing import List
+from typing import Any, Dict, List, NamedTuple, Optional
 
 # openai.api_key = os.getenv("OPENAI_API_KEY")
 
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+OPENAI_DEFAULT_MODEL = "gpt-4o-mini"
+# Same model the backend uses (AI_MODEL_FAST)
+GROQ_DEFAULT_MODEL = "llama3-70b-8192"
+
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+
+class LLMConfig(NamedTuple):
+    api_key: Optional[str]
+    base_url: Optional[str]
+    model: str
+
+
+def get_llm_config() -> LLMConfig:
+    """
+    Provider settings from the environment.
+
+    OPENAI_API_KEY takes precedence. With only GROQ_API_KEY set, requests go
+    to Groq's OpenAI-compatible endpoint with a Groq model. OPENAI_BASE_URL
+    and RESUME_MODEL override the endpoint and model either way.
+    """
+    base_url = os.getenv("OPENAI_BASE_URL") or None
+    model = os.getenv("RESUME_MODEL")
+    if os.getenv("OPENAI_API_KEY"):
+        return LLMConfig(os.getenv("OPENAI_API_KEY"), base_url, model or OPENAI_DEFAULT_MODEL)
+    if os.getenv("GROQ_API_KEY"):
+        return LLMConfig(os.getenv("GROQ_API_KEY"), base_url or GROQ_BASE_URL, model or GROQ_DEFAULT_MODEL)
+    return LLMConfig(None, base_url, model or OPENAI_DEFAULT_MODEL)
+
+
+def get_async_client() -> Optional[openai.AsyncOpenAI]:
+    """
+    Shared async LLM client, or None when no API key is configured.
+    See get_llm_config for how the provider is chosen.
+    """
+    global _async_client
+    config = get_llm_config()
+    if _async_client is None and config.api_key:
+        _async_client = openai.AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+    return _async_client
+
 def gpt_rewrite_bullets(bullets: List[str]) -> List[str]:
     """
     Rewrites resume bullet points to be more impactful using GPT.
@@ -30,3 +72,54 @@ def generate_cover_letter_gpt(resume_text: str, job_description: str) -> str:
     Sincerely,
     [Your Name]
     """
+
+
+def render_resume_text(job_description: str, user_profile: Dict[str, Any]) -> str:
+    """
+    Plain-text resume built from the profile (used when no LLM is configured).
+    """
+    return f"""
+RESUME FOR: {user_profile.get('name', 'Candidate')}
+
+OBJECTIVE:
+Seeking position matching: {job_description[:100]}...
+
+SKILLS:
+{', '.join(user_profile.get('skills', []))}
+
+EXPERIENCE:
+{user_profile.get('experience', 'N/A')}
+
+EDUCATION:
+{user_profile.get('education', 'N/A')}
+"""
+
+
+async def generate_resume_gpt_async(job_description: str, user_profile: Dict[str, Any]) -> str:
+    """
+    Generates a tailored resume with the async LLM client.
+    Falls back to the plain template when no API key is set.
+    """
+    client = get_async_client()
+    if client is None:
+        return render_resume_text(job_description, user_profile)
+
+    prompt = f"""
+    Write a concise, ATS-friendly resume tailored to the job description below.
+    Output only the resume text.
+
+    Candidate profile:
+    Name: {user_profile.get('name', 'Candidate')}
+    Skills: {', '.join(user_profile.get('skills', []))}
+    Experience: {user_profile.get('experience', 'N/A')}
+    Education: {user_profile.get('education', 'N/A')}
+
+    Job Description:
+    {job_description[:2000]}
+    """
+    response = await client.chat.completions.create(
+        model=get_llm_config().model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.7,
+    )
+    return response.choices[0].message.content or ""
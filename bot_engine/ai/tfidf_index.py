@@ -0,0 +1,394 @@
+"""
+Persistent, incrementally updatable TF-IDF index over scraped jobs.
+
+Layout on disk (``index_dir``)::
+
+    CURRENT                 name of the live version directory
+    v000001/
+        meta.json           segment list
+        vocabulary.json     fitted term -> column mapping
+        seg_000000/         one CSR block of raw term counts
+            data.npy  indices.npy  indptr.npy  ids.json
+
+Segments hold raw counts, so IDF can change without rewriting them:
+appending new jobs writes a new segment and updates the document
+frequencies in memory. Segments are loaded with ``mmap_mode='r'``.
+A refit (in the background, if scheduled) learns a fresh vocabulary from
+the full corpus, writes a new version directory and swaps ``CURRENT``.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+logger = logging.getLogger(__name__)
+
+JobSource = Callable[[], Iterable[Dict]]
+
+
+def _job_id(job: Dict) -> str:
+    return str(job.get('id') or job.get('_id') or job.get('link'))
+
+
+def _job_text(job: Dict) -> str:
+    # Same field ai_match_jobs_tfidf ranks on
+    return job.get('description') or ''
+
+
+def _write_atomic(path: str, content: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _write_json_atomic(path: str, payload) -> None:
+    _write_atomic(path, json.dumps(payload))
+
+
+class TfidfJobIndex:
+    """On-disk TF-IDF index with incremental appends and cosine ranking."""
+
+    def __init__(self, index_dir: str, stop_words: Optional[str] = 'english'):
+        """
+        Initialize (and load, if present) the index.
+
+        Args:
+            index_dir: Directory holding the index versions
+            stop_words: Stop word list passed to the vectorizer
+        """
+        self.index_dir = index_dir
+        self.stop_words = stop_words
+
+        self._lock = threading.RLock()
+        self._fit_lock = threading.Lock()
+        self._refit_backlog: Optional[List[Dict]] = None
+        self._refit_thread: Optional[threading.Thread] = None
+        self._stop_refit = threading.Event()
+
+        self._version_dir: Optional[str] = None
+        self._vectorizer: Optional[CountVectorizer] = None
+        self._segment_names: List[str] = []
+        self._segments: List[sp.csr_matrix] = []
+        self._job_ids: List[str] = []
+        self._id_set = set()
+        self._doc_freq = np.zeros(0, dtype=np.int64)
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._row_norms = np.zeros(0, dtype=np.float32)
+
+        os.makedirs(index_dir, exist_ok=True)
+        if os.path.exists(self._current_path):
+            self.load()
+
+    @property
+    def _current_path(self) -> str:
+        return os.path.join(self.index_dir, 'CURRENT')
+
+    def __len__(self) -> int:
+        return len(self._job_ids)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Load the live version from disk, memory-mapping its segments."""
+        with open(self._current_path) as f:
+            version_dir = os.path.join(self.index_dir, f.read().strip())
+
+        with open(os.path.join(version_dir, 'vocabulary.json')) as f:
+            vocabulary = json.load(f)
+        with open(os.path.join(version_dir, 'meta.json')) as f:
+            meta = json.load(f)
+
+        segments = []
+        job_ids: List[str] = []
+        for name in meta['segments']:
+            segment, ids = self._read_segment(version_dir, name, len(vocabulary))
+            segments.append(segment)
+            job_ids.extend(ids)
+
+        with self._lock:
+            self._install(version_dir, vocabulary, meta['segments'], segments, job_ids)
+
+        logger.info(f"Loaded TF-IDF index with {len(job_ids)} jobs from {version_dir}")
+
+    def _read_segment(self, version_dir: str, name: str, n_features: int) -> Tuple[sp.csr_matrix, List[str]]:
+        segment_dir = os.path.join(version_dir, name)
+        data = np.load(os.path.join(segment_dir, 'data.npy'), mmap_mode='r')
+        indices = np.load(os.path.join(segment_dir, 'indices.npy'), mmap_mode='r')
+        indptr = np.load(os.path.join(segment_dir, 'indptr.npy'), mmap_mode='r')
+        with open(os.path.join(segment_dir, 'ids.json')) as f:
+            ids = json.load(f)
+
+        matrix = sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_features), copy=False)
+        return matrix, ids
+
+    def _write_segment(self, version_dir: str, name: str, counts: sp.csr_matrix, ids: List[str]) -> None:
+        # Write into a temp directory and rename so readers never see a partial segment
+        tmp_dir = os.path.join(version_dir, f".{name}.tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        np.save(os.path.join(tmp_dir, 'data.npy'), counts.data.astype(np.float32))
+        np.save(os.path.join(tmp_dir, 'indices.npy'), counts.indices.astype(np.int32))
+        np.save(os.path.join(tmp_dir, 'indptr.npy'), counts.indptr.astype(np.int64))
+        with open(os.path.join(tmp_dir, 'ids.json'), 'w') as f:
+            json.dump(ids, f)
+        os.rename(tmp_dir, os.path.join(version_dir, name))
+
+    def _next_version_dir(self) -> str:
+        versions = [
+            int(name[1:]) for name in os.listdir(self.index_dir)
+            if name.startswith('v') and name[1:].isdigit()
+        ]
+        return os.path.join(self.index_dir, f"v{max(versions, default=0) + 1:06d}")
+
+    def _remove_stale_versions(self) -> None:
+        live = os.path.basename(self._version_dir or '')
+        for name in os.listdir(self.index_dir):
+            if name.startswith('v') and name[1:].isdigit() and name != live:
+                shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Building and updating
+    # ------------------------------------------------------------------
+
+    def fit(self, jobs: Iterable[Dict]) -> None:
+        """
+        Build a new index version from the full job corpus.
+
+        Queries keep using the previous version until the swap; jobs
+        appended while the fit is running are re-applied afterwards.
+        """
+        with self._fit_lock:
+            self._fit(jobs)
+
+    def _fit(self, jobs: Iterable[Dict]) -> bool:
+        """Fit and swap in a new version. Caller holds ``_fit_lock``."""
+        with self._lock:
+            self._refit_backlog = []
+
+        try:
+            unique = {_job_id(job): job for job in jobs}
+            ids = list(unique)
+            vectorizer = CountVectorizer(stop_words=self.stop_words, dtype=np.float32)
+            try:
+                counts = vectorizer.fit_transform([_job_text(job) for job in unique.values()]).tocsr()
+            except ValueError:
+                # Empty vocabulary (no jobs, or only stop words): keep the live version
+                logger.warning(f"Skipped TF-IDF fit: no indexable terms in {len(ids)} jobs")
+                return False
+            vocabulary = {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+
+            version_dir = self._next_version_dir()
+            os.makedirs(version_dir)
+            _write_json_atomic(os.path.join(version_dir, 'vocabulary.json'), vocabulary)
+            self._write_segment(version_dir, 'seg_000000', counts, ids)
+            _write_json_atomic(os.path.join(version_dir, 'meta.json'), {'segments': ['seg_000000']})
+            segment, _ = self._read_segment(version_dir, 'seg_000000', len(vocabulary))
+
+            with self._lock:
+                backlog, self._refit_backlog = self._refit_backlog, None
+                _write_atomic(self._current_path, os.path.basename(version_dir))
+                self._install(version_dir, vocabulary, ['seg_000000'], [segment], ids)
+                if backlog:
+                    self._append(backlog)
+        finally:
+            with self._lock:
+                self._refit_backlog = None
+
+        self._remove_stale_versions()
+        logger.info(f"Fitted TF-IDF index: {len(ids)} jobs, {len(vocabulary)} terms")
+        return True
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> int:
+        """
+        Append newly scraped jobs using the current vocabulary.
+
+        Terms unseen at fit time are ignored until the next refit.
+        Returns the number of jobs actually added.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return 0
+
+        with self._lock:
+            if self._vectorizer is not None:
+                if self._refit_backlog is not None:
+                    self._refit_backlog.extend(jobs)
+                return self._append(jobs)
+
+        # Nothing fitted yet: the first batch becomes the corpus. Concurrent
+        # first batches queue on _fit_lock; later ones append to the winner.
+        with self._fit_lock:
+            with self._lock:
+                if self._vectorizer is not None:
+                    return self._append(jobs)
+            return len(self._job_ids) if self._fit(jobs) else 0
+
+    def _append(self, jobs: List[Dict]) -> int:
+        unique = {}
+        for job in jobs:
+            job_id = _job_id(job)
+            if job_id not in self._id_set:
+                unique[job_id] = job
+        if not unique:
+            return 0
+
+        ids = list(unique)
+        counts = self._vectorizer.transform([_job_text(job) for job in unique.values()]).tocsr()
+
+        name = f"seg_{len(self._segment_names):06d}"
+        self._write_segment(self._version_dir, name, counts, ids)
+        segment_names = self._segment_names + [name]
+        _write_json_atomic(os.path.join(self._version_dir, 'meta.json'), {'segments': segment_names})
+
+        segment, _ = self._read_segment(self._version_dir, name, counts.shape[1])
+        self._segment_names = segment_names
+        self._segments.append(segment)
+        self._job_ids.extend(ids)
+        self._id_set.update(ids)
+        self._doc_freq += np.bincount(segment.indices, minlength=counts.shape[1])
+        self._recompute_weights()
+
+        logger.info(f"Appended {len(ids)} jobs to TF-IDF index ({len(self._job_ids)} total)")
+        return len(ids)
+
+    def _install(
+        self,
+        version_dir: str,
+        vocabulary: Dict[str, int],
+        segment_names: List[str],
+        segments: List[sp.csr_matrix],
+        job_ids: List[str]
+    ) -> None:
+        """Swap in a loaded version. Caller holds ``_lock``."""
+        self._version_dir = version_dir
+        self._vectorizer = CountVectorizer(stop_words=self.stop_words, vocabulary=vocabulary, dtype=np.float32)
+        self._segment_names = list(segment_names)
+        self._segments = segments
+        self._job_ids = job_ids
+        self._id_set = set(job_ids)
+
+        doc_freq = np.zeros(len(vocabulary), dtype=np.int64)
+        for segment in segments:
+            doc_freq += np.bincount(segment.indices, minlength=len(vocabulary))
+        self._doc_freq = doc_freq
+        self._recompute_weights()
+
+    def _recompute_weights(self) -> None:
+        """Refresh IDF and per-row TF-IDF norms after the corpus changed."""
+        n_docs = len(self._job_ids)
+        # Smoothed IDF, as used by sklearn's TfidfVectorizer
+        self._idf = (np.log((1.0 + n_docs) / (1.0 + self._doc_freq)) + 1.0).astype(np.float32)
+
+        idf_squared = self._idf ** 2
+        norms = []
+        for segment in self._segments:
+            squared = sp.csr_matrix(
+                (np.square(segment.data), segment.indices, segment.indptr),
+                shape=segment.shape
+            )
+            norms.append(np.sqrt(squared @ idf_squared))
+        self._row_norms = np.concatenate(norms).astype(np.float32) if norms else np.zeros(0, dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def rank(self, resume_text: str, top_k: Optional[int] = 50) -> List[Tuple[str, float]]:
+        """
+        Rank indexed jobs by cosine similarity to a resume.
+
+        Args:
+            resume_text: Resume text
+            top_k: Number of results (None for all)
+
+        Returns:
+            (job_id, score) pairs, best first
+        """
+        with self._lock:
+            if not self._job_ids:
+                return []
+
+            query = self._vectorizer.transform([resume_text]).toarray().ravel() * self._idf
+            query_norm = np.linalg.norm(query)
+            if query_norm == 0:
+                return []
+
+            # dot(row * idf, query) == row . (query * idf), so segments stay as raw counts
+            weights = (query / query_norm) * self._idf
+            scores = np.concatenate([segment @ weights for segment in self._segments])
+            scores = np.divide(
+                scores, self._row_norms,
+                out=np.zeros_like(scores), where=self._row_norms > 0
+            )
+
+            if top_k is None or top_k >= len(scores):
+                order = np.argsort(-scores)
+            else:
+                top = np.argpartition(-scores, top_k)[:top_k]
+                order = top[np.argsort(-scores[top])]
+
+            return [(self._job_ids[i], float(scores[i])) for i in order]
+
+    # ------------------------------------------------------------------
+    # Background refits
+    # ------------------------------------------------------------------
+
+    def start_background_refit(self, source: JobSource, interval_seconds: float = 3600) -> None:
+        """
+        Periodically refit vocabulary and IDF statistics from ``source``.
+
+        Args:
+            source: Callable returning the full job corpus
+            interval_seconds: Delay between refits
+        """
+        if self._refit_thread and self._refit_thread.is_alive():
+            return
+
+        self._stop_refit.clear()
+
+        def _loop():
+            while not self._stop_refit.wait(interval_seconds):
+                try:
+                    self.fit(source())
+                except Exception as e:
+                    logger.error(f"Background TF-IDF refit failed: {e}", exc_info=True)
+
+        self._refit_thread = threading.Thread(target=_loop, name="TfidfIndexRefit", daemon=True)
+        self._refit_thread.start()
+        logger.info(f"Scheduled TF-IDF index refit every {interval_seconds}s")
+
+    def stop_background_refit(self) -> None:
+        """Stop the background refit thread."""
+        self._stop_refit.set()
+        if self._refit_thread:
+            self._refit_thread.join(timeout=5)
+            self._refit_thread = None
+
+
+def scraped_jobs_source(mongo_uri: str, db_name: str) -> JobSource:
+    """
+    Build a JobSource that reads the backend's ``scraped_jobs`` collection.
+
+    Args:
+        mongo_uri: MongoDB connection string
+        db_name: Database name
+    """
+    def _load() -> List[Dict]:
+        from pymongo import MongoClient
+
+        client = MongoClient(mongo_uri)
+        try:
+            cursor = client[db_name]['scraped_jobs'].find({}, {'link': 1, 'description': 1})
+            return [{'id': str(doc['_id']), **doc} for doc in cursor]
+        finally:
+            client.close()
+
+    return _load
@@ -0,0 +1,122 @@
+"""
+Benchmark: one Chrome per URL vs the pooled WebDrivers in ParallelScraper.
+
+Scrapes job pages served from a local HTTP server (the rate limiter is
+bypassed) and reports pages/sec and browser startup time.
+
+Usage (from the repository root, Chrome/chromedriver required):
+    python -m bot_engine.benchmarks.driver_pool_benchmark [--pages 50] [--workers 5]
+
+Without Chrome, ``--simulate`` swaps in a driver that fetches the same pages
+over HTTP and sleeps ``--startup-ms`` to stand in for launching a browser:
+    python -m bot_engine.benchmarks.driver_pool_benchmark --simulate [--startup-ms 1000]
+"""
+import argparse
+import functools
+import http.server
+import tempfile
+import threading
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from bot_engine.scrapers.parallel_scraper import ParallelScraper
+
+PAGE = """<html><body>
+<h1>Software Engineer {i}</h1>
+<div class="company">Company {i}</div>
+<div class="description">Build and operate Python services. {filler}</div>
+<span class="location">Remote</span>
+</body></html>"""
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_fixture(directory: str, pages: int) -> http.server.ThreadingHTTPServer:
+    for i in range(pages):
+        Path(directory, f"job-{i}.html").write_text(PAGE.format(i=i, filler="lorem ipsum " * 200))
+
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class SimulatedDriver:
+    """Just enough of the WebDriver API for ParallelScraper._scrape_job."""
+
+    def __init__(self, startup_s: float):
+        time.sleep(startup_s)
+        self.root = None
+
+    def get(self, url: str):
+        if url == "about:blank":
+            self.root = ET.fromstring("<html><body/></html>")
+            return
+        with urllib.request.urlopen(url) as response:
+            self.root = ET.fromstring(response.read())
+
+    def find_element(self, by: str, value: str):
+        element = self.root.find(f".//{value}" if by == "tag name" else f".{value}")
+        if element is None:
+            raise LookupError(value)
+        return element
+
+    def execute_script(self, script: str):
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def bench(label: str, urls, workers: int, max_pages_per_driver: int, startup_s: float = None):
+    scraper = ParallelScraper(max_workers=workers, max_pages_per_driver=max_pages_per_driver)
+    if startup_s is not None:
+        scraper.driver_pool.factory = lambda: SimulatedDriver(startup_s)
+
+    start = time.perf_counter()
+    results = list(scraper.executor.map(scraper._scrape_job, urls))
+    elapsed = time.perf_counter() - start
+
+    stats = scraper.driver_pool.stats()
+    scraper.shutdown()
+
+    scraped = sum(1 for result in results if result)
+    print(
+        f"{label:>12} | {scraped:>7} | {scraped / elapsed:>9.2f} | "
+        f"{stats['drivers_started']:>8} | {stats['avg_startup_ms']:>14.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--simulate", action="store_true", help="use a fake driver instead of Chrome")
+    parser.add_argument("--startup-ms", type=float, default=1000, help="simulated browser startup time")
+    args = parser.parse_args()
+    startup_s = args.startup_ms / 1000 if args.simulate else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = serve_fixture(directory, args.pages)
+        port = server.server_address[1]
+        urls = [f"http://127.0.0.1:{port}/job-{i}.html" for i in range(args.pages)]
+
+        print("        mode | scraped | pages/sec | browsers | avg startup(ms)")
+        print("-" * 66)
+        # max_pages_per_driver=1 quits the browser after every page (previous behaviour)
+        bench("per-url", urls, args.workers, max_pages_per_driver=1, startup_s=startup_s)
+        bench("pooled", urls, args.workers, max_pages_per_driver=50, startup_s=startup_s)
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: scrape-everything-then-gather vs the streaming staged pipeline.
+
+Uses simulated stage latencies (no browser or LLM) and reports time to the
+first application, total time and peak traced memory.
+
+Usage (from the repository root):
+    python -m bot_engine.benchmarks.pipeline_benchmark [--urls 1000]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from bot_engine.pipeline import Pipeline, Stage
+
+SCRAPE_S = 0.02
+GENERATE_S = 0.05
+SEND_S = 0.01
+SCRAPERS = 5
+APPLIERS = 10
+
+
+async def scrape(url: str):
+    await asyncio.sleep(SCRAPE_S)
+    # A scraped page keeps its full description in memory until applied
+    return {"url": url, "description": "x" * 20000}
+
+
+async def generate(job):
+    await asyncio.sleep(GENERATE_S)
+    return job, "resume " * 500
+
+
+async def send(item):
+    await asyncio.sleep(SEND_S)
+    return item[0]["url"]
+
+
+async def batch(urls):
+    """Previous flow: scrape all URLs, then gather one task per job."""
+    start = time.monotonic()
+    first = None
+    scrape_slots = asyncio.Semaphore(SCRAPERS)
+    apply_slots = asyncio.Semaphore(APPLIERS)
+
+    async def scrape_limited(url):
+        async with scrape_slots:
+            return await scrape(url)
+
+    async def apply(job):
+        nonlocal first
+        async with apply_slots:
+            await send(await generate(job))
+        if first is None:
+            first = time.monotonic() - start
+
+    jobs = await asyncio.gather(*(scrape_limited(url) for url in urls))
+    await asyncio.gather(*(apply(job) for job in jobs))
+    return first, time.monotonic() - start
+
+
+async def streaming(urls):
+    pipeline = Pipeline([
+        Stage("scrape", scrape, concurrency=SCRAPERS, queue_size=20),
+        Stage("generate", generate, concurrency=APPLIERS, queue_size=20),
+        Stage("send", send, concurrency=APPLIERS, queue_size=20),
+    ])
+    result = await pipeline.run(urls)
+    return result.first_output_seconds, result.elapsed_seconds
+
+
+def measure(label, flow, urls):
+    tracemalloc.start()
+    first, total = asyncio.run(flow(urls))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>10} | {first:>14.2f} | {total:>8.2f} | {peak / 1024 / 1024:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=1000)
+    args = parser.parse_args()
+
+    urls = [f"https://example.com/jobs/{i}" for i in range(args.urls)]
+    print("      flow | first apply(s) | total(s) | peak mem(MiB)")
+    print("-" * 56)
+    measure("batch", batch, urls)
+    measure("pipeline", streaming, urls)
+
+
+if __name__ == "__main__":
+    main()
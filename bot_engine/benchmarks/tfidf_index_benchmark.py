@@ -0,0 +1,82 @@
+"""
+Benchmark: ai_match_jobs_tfidf vs the persistent TfidfJobIndex.
+
+Usage (from the repository root):
+    python -m bot_engine.benchmarks.tfidf_index_benchmark [--sizes 1000 10000 100000]
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from bot_engine.ai.matching import ai_match_jobs_tfidf
+from bot_engine.ai.tfidf_index import TfidfJobIndex
+
+SKILLS = [
+    "python", "django", "fastapi", "react", "typescript", "kubernetes", "docker", "aws",
+    "gcp", "terraform", "postgres", "mongodb", "redis", "kafka", "spark", "airflow",
+    "pytorch", "tensorflow", "java", "spring", "golang", "rust", "graphql", "selenium",
+]
+
+
+def make_corpus(n_jobs: int, seed: int = 42):
+    """Synthetic job descriptions with a Zipf-like long tail of filler terms."""
+    rng = random.Random(seed)
+    filler = [f"term{i}" for i in range(20000)]
+    weights = [1.0 / (i + 1) for i in range(len(filler))]
+
+    jobs = []
+    for i in range(n_jobs):
+        words = rng.sample(SKILLS, 5) + rng.choices(filler, weights=weights, k=120)
+        rng.shuffle(words)
+        jobs.append({"id": f"job-{i}", "description": " ".join(words)})
+    return jobs
+
+
+def bench(n_jobs: int, queries: int = 20):
+    jobs = make_corpus(n_jobs)
+    resume = "Senior python engineer with fastapi, docker, kubernetes and aws experience"
+
+    start = time.perf_counter()
+    ai_match_jobs_tfidf(resume, jobs)
+    baseline_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = TfidfJobIndex(index_dir)
+
+        start = time.perf_counter()
+        index.fit(jobs[: n_jobs - n_jobs // 10])
+        fit_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.add_jobs(jobs[n_jobs - n_jobs // 10:])
+        append_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reloaded = TfidfJobIndex(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            reloaded.rank(resume, top_k=50)
+        query_ms = (time.perf_counter() - start) * 1000 / queries
+
+    print(
+        f"{n_jobs:>8} | {baseline_ms:>12.1f} | {query_ms:>9.2f} | {fit_ms:>9.1f} | "
+        f"{append_ms:>13.1f} | {load_ms:>8.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print("    jobs | baseline(ms) | query(ms) |   fit(ms) | append10%(ms) | load(ms)")
+    print("-" * 75)
+    for n_jobs in args.sizes:
+        bench(n_jobs)
+
+
+if __name__ == "__main__":
+    main()
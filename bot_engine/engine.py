@@ -3,12 +3,22 @@ Optimized bot automation engine with parallel processing.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor
-import time
+import uuid
 
+from bot_engine.ai.gpt import render_resume_text
+from bot_engine.ai.matching import ai_match_jobs_tfidf
+from bot_engine.pipeline import Pipeline, PipelineResult, Stage
 from bot_engine.scrapers.parallel_scraper import scraper
 from bot_engine.queue.resume_queue import resume_queue
+from bot_engine.queue.durable import (
+    DurableJobQueue,
+    QueueMessage,
+    default_consumer_name,
+    job_idempotency_key,
+    job_queue,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,14 +26,16 @@ logger = logging.getLogger(__name__)
 class BotEngine:
     """Optimized bot engine for high-throughput job applications."""
     
-    def __init__(self, max_concurrent_jobs: int = 10):
+    def __init__(self, max_concurrent_jobs: int = 10, stage_queue_size: int = 20):
         """
         Initialize bot engine.
         
         Args:
             max_concurrent_jobs: Maximum concurrent job applications
+            stage_queue_size: Items buffered between pipeline stages
         """
         self.max_concurrent_jobs = max_concurrent_jobs
+        self.stage_queue_size = stage_queue_size
         self.semaphore = asyncio.Semaphore(max_concurrent_jobs)
         self.executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs)
         
@@ -45,49 +57,96 @@ class BotEngine:
         Returns:
             Processing results
         """
-        start_time = time.time()
-        
+        pipeline = Pipeline(
+            self._apply_stages(user_profile),
+            describe=lambda item: item.get('id') if isinstance(item, dict) else item[0].get('id')
+        )
+        result = await pipeline.run(jobs)
+        return self._summarize(len(jobs), result)
+    
+    def _summarize(self, total: int, result: PipelineResult) -> Dict[str, Any]:
+        """Turn a pipeline run into processing results."""
         results = {
-            'total': len(jobs),
-            'successful': 0,
-            'failed': 0,
-            'errors': []
+            'total': total,
+            'successful': len(result.outputs),
+            'failed': len(result.errors),
+            'skipped': sum(stage['dropped'] for stage in result.stages.values()),
+            'errors': [
+                {'job_id': error['item'], 'stage': error['stage'], 'error': error['error']}
+                for error in result.errors
+            ],
+            'stages': result.stages,
+            'first_application_seconds': result.first_output_seconds,
         }
         
-        # Process jobs concurrently
-        tasks = [
-            self._process_single_job(job, user_profile)
-            for job in jobs
-        ]
-        
-        # Wait for all tasks to complete
-        task_results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Aggregate results
-        for i, result in enumerate(task_results):
-            if isinstance(result, Exception):
-                results['failed'] += 1
-                results['errors'].append({
-                    'job_id': jobs[i].get('id'),
-                    'error': str(result)
-                })
-            elif result:
-                results['successful'] += 1
-            else:
-                results['failed'] += 1
-        
-        elapsed = time.time() - start_time
+        elapsed = result.elapsed_seconds
         results['elapsed_seconds'] = elapsed
         results['jobs_per_hour'] = (results['successful'] / elapsed) * 3600 if elapsed > 0 else 0
         
         logger.info(
             f"Processed {results['total']} jobs in {elapsed:.2f}s "
             f"({results['jobs_per_hour']:.1f} jobs/hour). "
-            f"Success: {results['successful']}, Failed: {results['failed']}"
+            f"Success: {results['successful']}, Failed: {results['failed']}, Skipped: {results['skipped']}"
         )
         
         return results
     
+    def _apply_stages(self, user_profile: Dict[str, Any]) -> List[Stage]:
+        """Generate → send stages shared by process_jobs and scrape_and_apply."""
+        async def generate(job: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+            return job, await self._generate_resume(job, user_profile)
+        
+        async def send(item: Tuple[Dict[str, Any], str]) -> Dict[str, Any]:
+            job, resume = item
+            await self._send_application_email(job=job, resume=resume, user_profile=user_profile)
+            logger.info(f"Successfully processed job {job.get('id', 'unknown')}")
+            return job
+        
+        return [
+            Stage('generate', generate, concurrency=self.max_concurrent_jobs, queue_size=self.stage_queue_size),
+            Stage('send', send, concurrency=self.max_concurrent_jobs, queue_size=self.stage_queue_size),
+        ]
+    
+    async def _generate_resume(self, job: Dict[str, Any], user_profile: Dict[str, Any]) -> str:
+        """
+        Generate a tailored resume through the resume queue.
+        
+        Raises:
+            Exception: If generation failed or timed out
+        """
+        job_id = job.get('id', 'unknown')
+        logger.info(f"Processing job {job_id}: {job.get('title', 'Unknown')}")
+        
+        task_id = f"resume_{job_id}_{uuid.uuid4().hex}"
+        # Waits here while the queue is full (backpressure)
+        future = await resume_queue.submit(
+            task_id=task_id,
+            job_description=job.get('description', ''),
+            user_profile=user_profile
+        )
+        
+        # Wait on our own future (resolved by the worker, no polling or lookups)
+        try:
+            resume_result = await asyncio.wait_for(asyncio.shield(future), timeout=60)
+        except asyncio.TimeoutError:
+            # Free the worker instead of finishing a resume nobody will use
+            resume_queue.cancel(task_id)
+            resume_result = None
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                resume_queue.cancel(task_id)
+                raise
+            # The queue was stopped
+            resume_result = {'status': 'cancelled', 'resume': None, 'error': 'resume queue stopped'}
+        finally:
+            resume_queue.discard(task_id)
+        
+        if not resume_result or resume_result['status'] != 'completed':
+            error = resume_result['error'] if resume_result else 'timed out'
+            raise Exception(f"Resume generation failed: {error}")
+        
+        return resume_result['resume']
+    
     async def _process_single_job(
         self,
         job: Dict[str, Any],
@@ -105,33 +164,15 @@ class BotEngine:
         """
         async with self.semaphore:
             try:
-                job_id = job.get('id', 'unknown')
-                logger.info(f"Processing job {job_id}: {job.get('title', 'Unknown')}")
-                
-                # Step 1: Generate resume (async queue)
-                task_id = f"resume_{job_id}_{int(time.time())}"
-                await resume_queue.submit(
-                    task_id=task_id,
-                    job_description=job.get('description', ''),
-                    user_profile=user_profile
-                )
-                
-                # Wait for resume generation
-                resume_result = await resume_queue.get_result(task_id, timeout=60)
-                
-                if not resume_result or resume_result['status'] != 'completed':
-                    raise Exception(f"Resume generation failed: {resume_result.get('error')}")
-                
-                resume_content = resume_result['resume']
+                resume_content = await self._generate_resume(job, user_profile)
                 
-                # Step 2: Send application email (async)
                 await self._send_application_email(
                     job=job,
                     resume=resume_content,
                     user_profile=user_profile
                 )
                 
-                logger.info(f"Successfully processed job {job_id}")
+                logger.info(f"Successfully processed job {job.get('id', 'unknown')}")
                 return True
                 
             except Exception as e:
@@ -160,24 +201,65 @@ class BotEngine:
     async def scrape_and_apply(
         self,
         job_urls: List[str],
-        user_profile: Dict[str, Any]
+        user_profile: Dict[str, Any],
+        min_match_score: float = 0.0
     ) -> Dict[str, Any]:
         """
-        Scrape jobs and apply in one flow.
+        Scrape jobs and apply in one streaming pipeline.
+        
+        Stages: scrape → dedupe → score → generate → send. Each job moves on
+        as soon as its stage is done, so applications start while later URLs
+        are still being scraped.
         
         Args:
             job_urls: List of job URLs to scrape
             user_profile: User profile
+            min_match_score: Skip jobs whose TF-IDF match with the profile is lower
             
         Returns:
             Processing results
         """
         logger.info(f"Starting scrape and apply for {len(job_urls)} URLs")
         
-        # Step 1: Parallel scraping
-        jobs = await scraper.scrape_jobs(job_urls)
+        seen: Set[str] = set()
+        resume_text = user_profile.get('resume_text') or render_resume_text('', user_profile)
+        loop = asyncio.get_running_loop()
+        
+        async def scrape(url: str) -> Dict[str, Any]:
+            job = await scraper.scrape_one(url)
+            if job is None:
+                raise Exception("Scraping failed")
+            return job
+        
+        async def dedupe(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            key = str(job.get('id') or job.get('url'))
+            if key in seen:
+                return None
+            seen.add(key)
+            return job
+        
+        async def score(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if not min_match_score:
+                return job
+            # CPU-bound, keep it off the event loop
+            scored = await loop.run_in_executor(self.executor, self._score_job, resume_text, job)
+            return scored if scored['match_score'] >= min_match_score else None
+        
+        stages = [
+            Stage('scrape', scrape, concurrency=scraper.max_workers, queue_size=self.stage_queue_size),
+            Stage('dedupe', dedupe, concurrency=1, queue_size=self.stage_queue_size),
+            Stage('score', score, concurrency=2, queue_size=self.stage_queue_size),
+        ] + self._apply_stages(user_profile)
+        
+        def describe(item: Any) -> Any:
+            if isinstance(item, str):
+                return item
+            job = item if isinstance(item, dict) else item[0]
+            return job.get('id') or job.get('url')
         
-        if not jobs:
+        result = await Pipeline(stages, describe=describe).run(job_urls)
+        
+        if not result.stages['scrape']['processed']:
             logger.warning("No jobs scraped successfully")
             return {
                 'total': 0,
@@ -186,10 +268,110 @@ class BotEngine:
                 'errors': ['Failed to scrape any jobs']
             }
         
-        # Step 2: Parallel application
-        results = await self.process_jobs(jobs, user_profile)
+        return self._summarize(len(job_urls), result)
+    
+    @staticmethod
+    def _score_job(resume_text: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job copy with its TF-IDF ``match_score`` against the resume."""
+        try:
+            return ai_match_jobs_tfidf(resume_text, [job])[0]
+        except ValueError:
+            # Empty vocabulary (no description)
+            return {**job, 'match_score': 0.0}
+    
+    async def enqueue_jobs(
+        self,
+        jobs: List[Dict[str, Any]],
+        user_profile: Dict[str, Any],
+        user_id: str,
+        queue: Optional[DurableJobQueue] = None
+    ) -> Dict[str, int]:
+        """
+        Queue job applications for any bot worker to process.
+        
+        A job already queued or applied to for this user is skipped.
         
-        return results
+        Args:
+            jobs: List of job data
+            user_profile: User profile for resume generation
+            user_id: Owner of the applications (part of the idempotency key)
+            queue: Durable queue (defaults to the global one)
+            
+        Returns:
+            Counts of queued and duplicate jobs
+        """
+        queue = queue or job_queue
+        counts = {'queued': 0, 'duplicates': 0}
+        
+        for job in jobs:
+            job_key = next(
+                (job[field] for field in ('id', 'url', 'link') if job.get(field) is not None),
+                None
+            )
+            message_id = await queue.enqueue(
+                {'job': job, 'user_profile': user_profile, 'user_id': user_id},
+                idempotency_key=job_idempotency_key(user_id, str(job_key)) if job_key is not None else None
+            )
+            counts['queued' if message_id else 'duplicates'] += 1
+        
+        logger.info(f"Queued {counts['queued']} jobs for user {user_id} ({counts['duplicates']} duplicates)")
+        return counts
+    
+    async def run_worker(
+        self,
+        queue: Optional[DurableJobQueue] = None,
+        consumer: Optional[str] = None,
+        stop_event: Optional[asyncio.Event] = None
+    ):
+        """
+        Consume the durable job queue until ``stop_event`` is set.
+        
+        Run one worker per bot container; they share the consumer group, so
+        adding containers scales throughput. Messages are acknowledged only
+        after the application succeeded, so a crashed worker's jobs are
+        redelivered to another one.
+        
+        Args:
+            queue: Durable queue (defaults to the global one)
+            consumer: Consumer name (defaults to hostname-pid)
+            stop_event: Set to stop after in-flight jobs finish
+        """
+        queue = queue or job_queue
+        consumer = consumer or default_consumer_name()
+        stop_event = stop_event or asyncio.Event()
+        in_flight: Set[asyncio.Task] = set()
+        
+        logger.info(f"Bot worker {consumer} started")
+        
+        while not stop_event.is_set():
+            free_slots = self.max_concurrent_jobs - len(in_flight)
+            if free_slots <= 0:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            
+            messages = await queue.dequeue(consumer, count=free_slots, block_ms=1000)
+            for message in messages:
+                task = asyncio.create_task(self._process_message(queue, message))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+        
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        logger.info(f"Bot worker {consumer} stopped")
+    
+    async def _process_message(self, queue: DurableJobQueue, message: QueueMessage):
+        """Apply to one queued job and ack or nack its message."""
+        payload = message.payload
+        try:
+            success = await self._process_single_job(payload['job'], payload['user_profile'])
+        except Exception as e:
+            await queue.nack(message, str(e))
+            return
+        
+        if success:
+            await queue.ack(message)
+        else:
+            await queue.nack(message, f"Application failed (attempt {message.attempts})")
     
     def shutdown(self):
         """Shutdown bot engine."""
@@ -0,0 +1,155 @@
+"""
+Streaming staged pipeline for the bot engine.
+
+Stages are connected by bounded ``asyncio.Queue``s and each runs its own
+pool of worker coroutines. An item moves to the next stage as soon as it is
+processed, so the first application goes out while later URLs are still
+being scraped, and a slow stage fills its input queue until upstream
+workers block on ``put`` (backpressure) instead of piling up tasks.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Returns the item for the next stage, or None to drop it
+StageHandler = Callable[[Any], Awaitable[Optional[Any]]]
+
+
+@dataclass
+class Stage:
+    """One pipeline step with its own concurrency limit and input queue."""
+    name: str
+    handler: StageHandler
+    concurrency: int = 1
+    queue_size: int = 100
+
+
+@dataclass
+class StageMetrics:
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        handled = self.processed + self.dropped + self.failed
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "avg_ms": round(self.busy_seconds * 1000 / handled, 2) if handled else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class PipelineResult:
+    """Outputs of the last stage plus per-stage metrics."""
+    outputs: List[Any] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    first_output_seconds: Optional[float] = None
+
+
+class Pipeline:
+    """Runs items from a source through ``stages`` in order."""
+
+    def __init__(self, stages: List[Stage], describe: Optional[Callable[[Any], Any]] = None):
+        """
+        Args:
+            stages: Pipeline steps, in order
+            describe: Maps an item to the identifier recorded with its errors
+        """
+        self.stages = stages
+        self.describe = describe or (lambda item: item)
+        self.metrics: Dict[str, StageMetrics] = {stage.name: StageMetrics() for stage in stages}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage metrics (also valid while running)."""
+        return {name: metrics.to_dict() for name, metrics in self.metrics.items()}
+
+    async def run(self, source: Union[Iterable[Any], AsyncIterable[Any]]) -> PipelineResult:
+        """Feed ``source`` through the pipeline and wait until every item is handled."""
+        result = PipelineResult()
+        start = time.monotonic()
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+
+        async def worker(index: int):
+            stage = self.stages[index]
+            metrics = self.metrics[stage.name]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+            while True:
+                item = await inbox.get()
+                metrics.in_flight += 1
+                started = time.monotonic()
+                try:
+                    output = await stage.handler(item)
+                except Exception as e:
+                    metrics.failed += 1
+                    logger.error(f"Pipeline stage {stage.name} failed for {self.describe(item)}: {e}")
+                    result.errors.append({"stage": stage.name, "item": self.describe(item), "error": str(e)})
+                    output = None
+                else:
+                    if output is None:
+                        metrics.dropped += 1
+                    else:
+                        metrics.processed += 1
+                finally:
+                    metrics.in_flight -= 1
+                    metrics.busy_seconds += time.monotonic() - started
+
+                try:
+                    if output is not None:
+                        if outbox is None:
+                            if result.first_output_seconds is None:
+                                result.first_output_seconds = time.monotonic() - start
+                            result.outputs.append(output)
+                        else:
+                            # Blocks while the next stage is saturated (backpressure)
+                            await outbox.put(output)
+                            next_metrics = self.metrics[self.stages[index + 1].name]
+                            next_metrics.max_queue_depth = max(next_metrics.max_queue_depth, outbox.qsize())
+                finally:
+                    inbox.task_done()
+
+        workers = [
+            [asyncio.create_task(worker(i), name=f"pipeline-{stage.name}-{n}") for n in range(stage.concurrency)]
+            for i, stage in enumerate(self.stages)
+        ]
+
+        try:
+            first_metrics = self.metrics[self.stages[0].name]
+            if hasattr(source, "__aiter__"):
+                async for item in source:
+                    await queues[0].put(item)
+                    first_metrics.max_queue_depth = max(first_metrics.max_queue_depth, queues[0].qsize())
+            else:
+                for item in source:
+                    await queues[0].put(item)
+                    first_metrics.max_queue_depth = max(first_metrics.max_queue_depth, queues[0].qsize())
+
+            # Drain stage by stage: once a stage's queue is empty and its
+            # workers are idle, nothing more can reach the stages after it
+            for queue, stage_workers in zip(queues, workers):
+                await queue.join()
+                for task in stage_workers:
+                    task.cancel()
+        finally:
+            all_workers = [task for stage_workers in workers for task in stage_workers]
+            for task in all_workers:
+                task.cancel()
+            await asyncio.gather(*all_workers, return_exceptions=True)
+
+        result.elapsed_seconds = time.monotonic() - start
+        result.stages = self.stats()
+        return result
@@ -0,0 +1,257 @@
+"""
+Asyncio-native resume generation queue.
+
+N coroutine workers drain a bounded ``asyncio.Queue`` and call the async LLM
+client, so the number of in-flight generations is not capped by OS threads.
+Use ``ResumeGenerationQueue`` (threaded) for CPU-bound work such as LaTeX/PDF
+rendering instead.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from bot_engine.ai.gpt import generate_resume_gpt_async
+
+logger = logging.getLogger(__name__)
+
+GenerateFn = Callable[[str, Dict[str, Any]], Awaitable[str]]
+
+
+class AsyncResumeGenerationQueue:
+    """Resume generation with coroutine workers and a bounded queue."""
+
+    def __init__(
+        self,
+        num_workers: int = 10,
+        max_queue_size: int = 100,
+        task_timeout: float = 60,
+        result_ttl: float = 300,
+        generate: Optional[GenerateFn] = None
+    ):
+        """
+        Initialize async resume generation queue.
+
+        Args:
+            num_workers: Number of coroutine workers (concurrent LLM calls)
+            max_queue_size: Pending tasks before submit() waits (backpressure)
+            task_timeout: Seconds before a single generation is cancelled
+            result_ttl: Seconds a finished result is kept if nobody consumes it
+            generate: Coroutine producing the resume (defaults to the async LLM client)
+        """
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.task_timeout = task_timeout
+        self.result_ttl = result_ttl
+        self.generate = generate or generate_resume_gpt_async
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.results: Dict[str, asyncio.Future] = {}
+        self._completed_at: Dict[str, float] = {}
+        self._running_tasks: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: Set[str] = set()
+        self._last_eviction = time.monotonic()
+        self.workers: List[asyncio.Task] = []
+        self.running = False
+
+    def start(self):
+        """
+        Mark the queue as running.
+
+        Workers need an event loop, so they are spawned on the first submit().
+        """
+        self.running = True
+
+    def _ensure_workers(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+
+        self.workers = [worker for worker in self.workers if not worker.done()]
+        if len(self.workers) >= self.num_workers:
+            return
+
+        for i in range(len(self.workers), self.num_workers):
+            self.workers.append(asyncio.create_task(self._worker(i), name=f"AsyncResumeWorker-{i}"))
+
+        logger.info(f"Started {self.num_workers} async resume generation workers")
+
+    def stop(self):
+        """Cancel workers and any pending or running tasks."""
+        self.running = False
+
+        for worker in self.workers:
+            worker.cancel()
+        self.workers.clear()
+
+        for future in self.results.values():
+            if not future.done():
+                future.cancel()
+
+        logger.info("Stopped async resume generation workers")
+
+    async def _worker(self, index: int):
+        """Coroutine worker that processes resume generation tasks."""
+        while True:
+            task = await self.queue.get()
+            try:
+                await self._process(task)
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, task: Dict[str, Any]):
+        task_id = task['id']
+        future: asyncio.Future = task['future']
+        if future.done():
+            # Cancelled while waiting in the queue
+            return
+
+        logger.info(f"Async worker processing task {task_id}")
+
+        generation = asyncio.create_task(
+            self.generate(task['job_description'], task['user_profile'])
+        )
+        self._running_tasks[task_id] = generation
+        try:
+            resume = await asyncio.wait_for(generation, timeout=self.task_timeout)
+            result = {'status': 'completed', 'resume': resume, 'error': None}
+            logger.info(f"Task {task_id} completed successfully")
+        except asyncio.TimeoutError:
+            logger.error(f"Task {task_id} timed out after {self.task_timeout}s")
+            result = {'status': 'failed', 'resume': None, 'error': f"timed out after {self.task_timeout}s"}
+        except asyncio.CancelledError:
+            if task_id not in self._cancel_requested:
+                # The worker itself is being cancelled (stop())
+                raise
+            logger.info(f"Task {task_id} cancelled")
+            result = {'status': 'cancelled', 'resume': None, 'error': 'cancelled'}
+        except Exception as e:
+            logger.error(f"Task {task_id} failed: {e}", exc_info=True)
+            result = {'status': 'failed', 'resume': None, 'error': str(e)}
+        finally:
+            self._running_tasks.pop(task_id, None)
+            self._cancel_requested.discard(task_id)
+
+        if not future.done():
+            future.set_result(result)
+        if self.results.get(task_id) is future:
+            self._completed_at[task_id] = time.monotonic()
+
+    def _evict_expired(self):
+        """Drop finished results nobody consumed within ``result_ttl``."""
+        now = time.monotonic()
+        if now - self._last_eviction < 1:
+            return
+        self._last_eviction = now
+
+        expired = [
+            task_id for task_id, completed_at in self._completed_at.items()
+            if now - completed_at > self.result_ttl
+        ]
+        for task_id in expired:
+            self._completed_at.pop(task_id, None)
+            self.results.pop(task_id, None)
+
+    async def submit(
+        self,
+        task_id: str,
+        job_description: str,
+        user_profile: Dict[str, Any]
+    ) -> asyncio.Future:
+        """
+        Submit resume generation task.
+
+        Waits while the queue is full, so producers slow down instead of
+        piling up work.
+
+        Args:
+            task_id: Unique task ID
+            job_description: Job description
+            user_profile: User profile data
+
+        Returns:
+            Future resolved with the result dict
+            ({'status': 'completed'|'failed'|'cancelled', 'resume': ..., 'error': ...})
+        """
+        if not self.running:
+            raise RuntimeError("Resume queue is not running")
+
+        self._ensure_workers()
+        self._evict_expired()
+
+        future = asyncio.get_running_loop().create_future()
+        self.results[task_id] = future
+
+        await self.queue.put({
+            'id': task_id,
+            'job_description': job_description,
+            'user_profile': user_profile,
+            'future': future
+        })
+
+        logger.info(f"Submitted task {task_id} to async queue (queue size: {self.queue.qsize()})")
+        return future
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a pending or running task.
+
+        Returns:
+            True if the task was still pending or running
+        """
+        running = self._running_tasks.get(task_id)
+        if running is not None:
+            self._cancel_requested.add(task_id)
+            running.cancel()
+            return True
+
+        future = self.results.get(task_id)
+        if future is not None and not future.done():
+            future.set_result({'status': 'cancelled', 'resume': None, 'error': 'cancelled'})
+            self._completed_at[task_id] = time.monotonic()
+            return True
+
+        return False
+
+    async def get_result(
+        self,
+        task_id: str,
+        timeout: int = 60
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the result of a resume generation task.
+
+        The result is evicted once returned; after a timeout it stays
+        available until ``result_ttl`` expires.
+
+        Args:
+            task_id: Task ID
+            timeout: Max wait time in seconds
+
+        Returns:
+            Result dict or None if unknown or timed out
+        """
+        future = self.results.get(task_id)
+        if future is None:
+            return None
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Task {task_id} timed out after {timeout}s")
+            return None
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            result = {'status': 'cancelled', 'resume': None, 'error': 'cancelled'}
+
+        self.discard(task_id)
+        return result
+
+    def discard(self, task_id: str) -> None:
+        """Forget a task whose future the caller awaited directly."""
+        self.results.pop(task_id, None)
+        self._completed_at.pop(task_id, None)
+
+    def get_queue_size(self) -> int:
+        """Get current queue size."""
+        return self.queue.qsize() if self.queue is not None else 0
@@ -0,0 +1,340 @@
+"""
+Durable job queue backends for the bot engine.
+
+Work is enqueued as JSON payloads and consumed through consumer groups, so
+several bot processes can share one queue and a crashed consumer's messages
+are redelivered once their visibility timeout expires. Failed messages are
+retried up to ``max_attempts`` times, then moved to a dead-letter stream.
+Enqueueing with an idempotency key (one per user and job) is a no-op while
+that key is already queued or done.
+
+``InMemoryJobQueue`` is for tests and single-process runs;
+``RedisStreamJobQueue`` (Redis Streams) is for production.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def job_idempotency_key(user_id: str, job_id: str) -> str:
+    """Idempotency key for applying ``user_id`` to ``job_id``."""
+    return f"{user_id}:{job_id}"
+
+
+def default_consumer_name() -> str:
+    """Unique consumer name per bot process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+@dataclass
+class QueueMessage:
+    """A message delivered to a consumer."""
+    id: str
+    payload: Dict[str, Any]
+    attempts: int = 1
+    idempotency_key: Optional[str] = None
+    error: Optional[str] = None
+
+
+class DurableJobQueue:
+    """Interface shared by the queue backends."""
+
+    def __init__(self, visibility_timeout: float = 300, max_attempts: int = 3):
+        """
+        Args:
+            visibility_timeout: Seconds before an unacknowledged message is redelivered
+            max_attempts: Deliveries before a message is dead-lettered
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    async def enqueue(self, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Optional[str]:
+        """Add a message. Returns its id, or None if the idempotency key was already used."""
+        raise NotImplementedError
+
+    async def dequeue(self, consumer: str, count: int = 1, block_ms: int = 1000) -> List[QueueMessage]:
+        """Receive up to ``count`` messages, including expired unacknowledged ones."""
+        raise NotImplementedError
+
+    async def ack(self, message: QueueMessage) -> None:
+        """Mark a message as done."""
+        raise NotImplementedError
+
+    async def nack(self, message: QueueMessage, error: str) -> None:
+        """Mark a message as failed: retry it, or dead-letter it after ``max_attempts``."""
+        raise NotImplementedError
+
+    async def dead_letters(self, count: int = 100) -> List[QueueMessage]:
+        """Messages that exhausted their attempts."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass
+class _InFlight:
+    message: QueueMessage
+    consumer: str
+    deadline: float = field(default=0.0)
+
+
+class InMemoryJobQueue(DurableJobQueue):
+    """Process-local implementation with the same semantics as the Redis backend."""
+
+    def __init__(self, visibility_timeout: float = 300, max_attempts: int = 3):
+        super().__init__(visibility_timeout, max_attempts)
+        self._ready: List[QueueMessage] = []
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._dead: List[QueueMessage] = []
+        self._keys: set = set()
+        self._ids = itertools.count(1)
+        self._available = asyncio.Event()
+
+    async def enqueue(self, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Optional[str]:
+        if idempotency_key is not None:
+            if idempotency_key in self._keys:
+                return None
+            self._keys.add(idempotency_key)
+
+        message = QueueMessage(id=str(next(self._ids)), payload=payload, idempotency_key=idempotency_key)
+        self._ready.append(message)
+        self._available.set()
+        return message.id
+
+    def _reclaim_expired(self) -> None:
+        now = time.monotonic()
+        for message_id, entry in list(self._in_flight.items()):
+            if entry.deadline <= now:
+                del self._in_flight[message_id]
+                message = entry.message
+                message.attempts += 1
+                if message.attempts > self.max_attempts:
+                    message.error = message.error or "visibility timeout expired"
+                    self._dead_letter(message)
+                else:
+                    self._ready.append(message)
+
+    async def dequeue(self, consumer: str, count: int = 1, block_ms: int = 1000) -> List[QueueMessage]:
+        self._reclaim_expired()
+        if not self._ready:
+            self._available.clear()
+            try:
+                await asyncio.wait_for(self._available.wait(), block_ms / 1000)
+            except asyncio.TimeoutError:
+                return []
+
+        batch, self._ready = self._ready[:count], self._ready[count:]
+        deadline = time.monotonic() + self.visibility_timeout
+        for message in batch:
+            self._in_flight[message.id] = _InFlight(message, consumer, deadline)
+        return batch
+
+    async def ack(self, message: QueueMessage) -> None:
+        self._in_flight.pop(message.id, None)
+
+    async def nack(self, message: QueueMessage, error: str) -> None:
+        if self._in_flight.pop(message.id, None) is None:
+            return
+
+        message.error = error
+        if message.attempts >= self.max_attempts:
+            self._dead_letter(message)
+            return
+
+        message.attempts += 1
+        self._ready.append(message)
+        self._available.set()
+
+    def _dead_letter(self, message: QueueMessage) -> None:
+        logger.warning(f"Dead-lettering message {message.id} after {message.attempts} attempts: {message.error}")
+        self._dead.append(message)
+        # Allow the same user/job to be enqueued again manually
+        self._keys.discard(message.idempotency_key)
+
+    async def dead_letters(self, count: int = 100) -> List[QueueMessage]:
+        return self._dead[:count]
+
+
+class RedisStreamJobQueue(DurableJobQueue):
+    """
+    Redis Streams implementation.
+
+    Messages live in ``<stream>``, read through the consumer group ``group``.
+    Unacknowledged messages idle longer than the visibility timeout are
+    claimed by the next consumer with XAUTOCLAIM. Retries are re-added to the
+    stream with an incremented attempt count; exhausted messages go to
+    ``<stream>:dead``. Idempotency keys are ``<stream>:idem:<key>`` entries
+    set with NX.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        stream: str = "bot:jobs",
+        group: str = "bot-workers",
+        visibility_timeout: float = 300,
+        max_attempts: int = 3,
+        idempotency_ttl: int = 7 * 24 * 3600
+    ):
+        super().__init__(visibility_timeout, max_attempts)
+        # Optional dependency, only needed for this backend
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(redis_url, decode_responses=True)
+        self.stream = stream
+        self.group = group
+        self.dead_stream = f"{stream}:dead"
+        self.idempotency_ttl = idempotency_ttl
+        self._group_ready = False
+
+    def _idempotency_key(self, key: str) -> str:
+        return f"{self.stream}:idem:{key}"
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            # BUSYGROUP: another consumer created it first
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _add(self, payload: Dict[str, Any], attempts: int, idempotency_key: Optional[str], error: Optional[str] = None, stream: Optional[str] = None) -> str:
+        fields = {
+            "payload": json.dumps(payload),
+            "attempts": str(attempts),
+            "idempotency_key": idempotency_key or "",
+        }
+        if error:
+            fields["error"] = error
+        return await self.redis.xadd(stream or self.stream, fields)
+
+    @staticmethod
+    def _parse(message_id: str, fields: Dict[str, str]) -> QueueMessage:
+        return QueueMessage(
+            id=message_id,
+            payload=json.loads(fields["payload"]),
+            attempts=int(fields.get("attempts", 1)),
+            idempotency_key=fields.get("idempotency_key") or None,
+            error=fields.get("error"),
+        )
+
+    async def enqueue(self, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Optional[str]:
+        await self._ensure_group()
+        if idempotency_key is not None:
+            claimed = await self.redis.set(
+                self._idempotency_key(idempotency_key), "1", nx=True, ex=self.idempotency_ttl
+            )
+            if not claimed:
+                return None
+        return await self._add(payload, 1, idempotency_key)
+
+    async def _claim_expired(self, consumer: str, count: int) -> List[QueueMessage]:
+        """Take over messages whose consumer did not ack within the visibility timeout."""
+        _, claimed, *_ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer,
+            min_idle_time=int(self.visibility_timeout * 1000), start_id="0-0", count=count
+        )
+
+        messages = []
+        for message_id, fields in claimed:
+            if not fields:
+                # Entry was trimmed from the stream
+                await self.redis.xack(self.stream, self.group, message_id)
+                continue
+
+            message = self._parse(message_id, fields)
+            pending = await self.redis.xpending_range(
+                self.stream, self.group, min=message_id, max=message_id, count=1
+            )
+            deliveries = pending[0]["times_delivered"] if pending else 1
+            message.attempts += deliveries - 1
+
+            if message.attempts > self.max_attempts:
+                message.error = message.error or "visibility timeout expired"
+                await self._dead_letter(message)
+                continue
+            messages.append(message)
+        return messages
+
+    async def dequeue(self, consumer: str, count: int = 1, block_ms: int = 1000) -> List[QueueMessage]:
+        await self._ensure_group()
+
+        messages = await self._claim_expired(consumer, count)
+        if messages:
+            return messages
+
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return [
+            self._parse(message_id, fields)
+            for _, entries in response or []
+            for message_id, fields in entries
+        ]
+
+    async def ack(self, message: QueueMessage) -> None:
+        await self.redis.xack(self.stream, self.group, message.id)
+        await self.redis.xdel(self.stream, message.id)
+
+    async def nack(self, message: QueueMessage, error: str) -> None:
+        if message.attempts >= self.max_attempts:
+            message.error = error
+            await self._dead_letter(message)
+            return
+
+        # Re-add with the next attempt number, then drop the failed delivery
+        await self._add(message.payload, message.attempts + 1, message.idempotency_key, error)
+        await self.ack(message)
+
+    async def _dead_letter(self, message: QueueMessage) -> None:
+        logger.warning(f"Dead-lettering message {message.id} after {message.attempts} attempts: {message.error}")
+        await self._add(
+            message.payload, message.attempts, message.idempotency_key,
+            message.error, stream=self.dead_stream
+        )
+        await self.ack(message)
+        if message.idempotency_key:
+            # Allow the same user/job to be enqueued again manually
+            await self.redis.delete(self._idempotency_key(message.idempotency_key))
+
+    async def dead_letters(self, count: int = 100) -> List[QueueMessage]:
+        entries = await self.redis.xrange(self.dead_stream, count=count)
+        return [self._parse(message_id, fields) for message_id, fields in entries]
+
+    async def close(self) -> None:
+        await self.redis.close()
+
+
+def create_job_queue(backend: Optional[str] = None) -> DurableJobQueue:
+    """
+    Build the queue selected by BOT_QUEUE_BACKEND ("memory" or "redis").
+    """
+    backend = backend or os.getenv("BOT_QUEUE_BACKEND", "memory")
+    visibility_timeout = float(os.getenv("BOT_QUEUE_VISIBILITY_TIMEOUT", "300"))
+    max_attempts = int(os.getenv("BOT_QUEUE_MAX_ATTEMPTS", "3"))
+
+    if backend == "redis":
+        return RedisStreamJobQueue(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            stream=os.getenv("BOT_QUEUE_STREAM", "bot:jobs"),
+            group=os.getenv("BOT_QUEUE_GROUP", "bot-workers"),
+            visibility_timeout=visibility_timeout,
+            max_attempts=max_attempts,
+        )
+    return InMemoryJobQueue(visibility_timeout=visibility_timeout, max_attempts=max_attempts)
+
+
+# Global job queue instance
+job_queue = create_job_queue()
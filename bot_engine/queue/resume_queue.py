@@ -3,27 +3,35 @@ Resume generation queue with worker pool.
 """
 import asyncio
 import logging
+import os
 from typing import Dict, Any, Optional
-from queue import Queue
-from threading import Thread
+from queue import Empty, Queue
+from threading import Thread, current_thread
 import time
 
+from bot_engine.ai.gpt import render_resume_text
+
 logger = logging.getLogger(__name__)
 
 
 class ResumeGenerationQueue:
     """Queue-based resume generation with worker pool."""
     
-    def __init__(self, num_workers: int = 3):
+    def __init__(self, num_workers: int = 3, result_ttl: float = 300):
         """
         Initialize resume generation queue.
         
         Args:
             num_workers: Number of worker threads
+            result_ttl: Seconds a finished result is kept if nobody consumes it
         """
         self.num_workers = num_workers
+        self.result_ttl = result_ttl
         self.queue = Queue()
-        self.results = {}
+        # task_id -> future; only touched from the event loop thread
+        self.results: Dict[str, asyncio.Future] = {}
+        self._completed_at: Dict[str, float] = {}
+        self._last_eviction = time.monotonic()
         self.workers = []
         self.running = False
     
@@ -65,21 +73,29 @@ class ResumeGenerationQueue:
         while self.running:
             try:
                 # Get task from queue (blocking)
-                task = self.queue.get(timeout=1)
+                try:
+                    task = self.queue.get(timeout=1)
+                except Empty:
+                    continue
                 
                 if task is None:  # Sentinel value
                     break
                 
                 task_id = task['id']
+                if task['future'].done():
+                    # Cancelled while waiting in the queue
+                    self.queue.task_done()
+                    continue
+                
                 job_description = task['job_description']
                 user_profile = task['user_profile']
                 
-                logger.info(f"Worker {Thread.current_thread().name} processing task {task_id}")
+                logger.info(f"Worker {current_thread().name} processing task {task_id}")
                 
                 # Generate resume
                 try:
                     resume = self._generate_resume(job_description, user_profile)
-                    self.results[task_id] = {
+                    result = {
                         'status': 'completed',
                         'resume': resume,
                         'error': None
@@ -88,7 +104,7 @@ class ResumeGenerationQueue:
                     
                 except Exception as e:
                     logger.error(f"Task {task_id} failed: {e}", exc_info=True)
-                    self.results[task_id] = {
+                    result = {
                         'status': 'failed',
                         'resume': None,
                         'error': str(e)
@@ -96,6 +112,12 @@ class ResumeGenerationQueue:
                 
                 finally:
                     self.queue.task_done()
+                
+                # Futures are not thread-safe: resolve on the submitting loop
+                try:
+                    task['loop'].call_soon_threadsafe(self._resolve, task_id, task['future'], result)
+                except RuntimeError:
+                    logger.warning(f"Event loop closed before task {task_id} could be resolved")
                     
             except Exception as e:
                 if self.running:
@@ -120,29 +142,39 @@ class ResumeGenerationQueue:
         time.sleep(2)
         
         # In production, call OpenAI API here
-        resume = f"""
-RESUME FOR: {user_profile.get('name', 'Candidate')}
-
-OBJECTIVE:
-Seeking position matching: {job_description[:100]}...
-
-SKILLS:
-{', '.join(user_profile.get('skills', []))}
-
-EXPERIENCE:
-{user_profile.get('experience', 'N/A')}
-
-EDUCATION:
-{user_profile.get('education', 'N/A')}
-"""
-        return resume
+        return render_resume_text(job_description, user_profile)
+    
+    def _resolve(self, task_id: str, future: asyncio.Future, result: Dict[str, Any]):
+        """Complete a task's future (runs on the event loop thread)."""
+        if not future.done():
+            future.set_result(result)
+        if self.results.get(task_id) is future:
+            self._completed_at[task_id] = time.monotonic()
+    
+    def _evict_expired(self):
+        """Drop finished results nobody consumed within ``result_ttl``."""
+        now = time.monotonic()
+        if now - self._last_eviction < 1:
+            return
+        self._last_eviction = now
+        
+        expired = [
+            task_id for task_id, completed_at in self._completed_at.items()
+            if now - completed_at > self.result_ttl
+        ]
+        for task_id in expired:
+            self._completed_at.pop(task_id, None)
+            self.results.pop(task_id, None)
+        
+        if expired:
+            logger.debug(f"Evicted {len(expired)} unconsumed resume results")
     
     async def submit(
         self,
         task_id: str,
         job_description: str,
         user_profile: Dict[str, Any]
-    ) -> str:
+    ) -> asyncio.Future:
         """
         Submit resume generation task.
         
@@ -152,19 +184,44 @@ EDUCATION:
             user_profile: User profile data
             
         Returns:
-            Task ID for tracking
+            Future resolved with the result dict
+            ({'status': 'completed'|'failed', 'resume': ..., 'error': ...})
         """
+        self._evict_expired()
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
         task = {
             'id': task_id,
             'job_description': job_description,
-            'user_profile': user_profile
+            'user_profile': user_profile,
+            'loop': loop,
+            'future': future
         }
         
+        self.results[task_id] = future
         self.queue.put(task)
-        self.results[task_id] = {'status': 'pending', 'resume': None, 'error': None}
         
         logger.info(f"Submitted task {task_id} to queue (queue size: {self.queue.qsize()})")
-        return task_id
+        return future
+    
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a task that has not started yet.
+        
+        Threads cannot be interrupted, so a task already being generated
+        runs to completion and its result is discarded.
+        
+        Returns:
+            True if the task was still pending
+        """
+        future = self.results.get(task_id)
+        if future is None or future.done():
+            return False
+        
+        future.set_result({'status': 'cancelled', 'resume': None, 'error': 'cancelled'})
+        self._completed_at[task_id] = time.monotonic()
+        return True
     
     async def get_result(
         self,
@@ -172,33 +229,60 @@ EDUCATION:
         timeout: int = 60
     ) -> Optional[Dict[str, Any]]:
         """
-        Get result of resume generation task.
+        Wait for the result of a resume generation task.
+        
+        The result is evicted once returned; after a timeout it stays
+        available until ``result_ttl`` expires.
         
         Args:
             task_id: Task ID
             timeout: Max wait time in seconds
             
         Returns:
-            Result dict or None if timeout
+            Result dict or None if unknown or timed out
         """
-        start_time = time.time()
+        future = self.results.get(task_id)
+        if future is None:
+            return None
         
-        while time.time() - start_time < timeout:
-            if task_id in self.results:
-                result = self.results[task_id]
-                
-                if result['status'] in ['completed', 'failed']:
-                    return result
-            
-            await asyncio.sleep(0.5)
+        try:
+            # Shield so a timeout here does not cancel the shared future
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Task {task_id} timed out after {timeout}s")
+            return None
         
-        logger.warning(f"Task {task_id} timed out after {timeout}s")
-        return None
+        self.discard(task_id)
+        return result
+    
+    def discard(self, task_id: str) -> None:
+        """Forget a task whose future the caller awaited directly."""
+        self.results.pop(task_id, None)
+        self._completed_at.pop(task_id, None)
     
     def get_queue_size(self) -> int:
         """Get current queue size."""
         return self.queue.qsize()
 
 
+def create_resume_queue(mode: Optional[str] = None):
+    """
+    Build the resume queue selected by RESUME_QUEUE_MODE.
+    
+    "async" (default) runs coroutine workers around the async LLM client;
+    "threaded" runs OS threads for CPU-bound rendering (LaTeX/PDF).
+    """
+    mode = mode or os.getenv("RESUME_QUEUE_MODE", "async")
+    if mode == "threaded":
+        return ResumeGenerationQueue(num_workers=int(os.getenv("RESUME_WORKERS", "3")))
+    
+    from bot_engine.queue.async_resume_queue import AsyncResumeGenerationQueue
+    return AsyncResumeGenerationQueue(
+        num_workers=int(os.getenv("RESUME_WORKERS", "10")),
+        max_queue_size=int(os.getenv("RESUME_QUEUE_SIZE", "100")),
+        task_timeout=float(os.getenv("RESUME_TIMEOUT", "60"))
+    )
+
+
 # Global resume queue instance
-resume_queue = ResumeGenerationQueue(num_workers=3)
+resume_queue = create_resume_queue()
@@ -0,0 +1,199 @@
+"""
+Bounded pool of reusable WebDriver instances.
+
+Starting Chrome dominates the cost of scraping a single page, so drivers are
+checked out per page and returned afterwards instead of being quit. Between
+uses a driver's cookies and web storage are cleared; drivers are replaced
+after ``max_pages_per_driver`` pages or when a health check fails (crashed
+browser, dead session).
+"""
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledDriver:
+    driver: Any
+    pages: int = 0
+
+
+class WebDriverPool:
+    """Thread-safe pool of at most ``size`` WebDrivers."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 5,
+        max_pages_per_driver: int = 50
+    ):
+        """
+        Initialize driver pool.
+
+        Args:
+            factory: Creates a new WebDriver
+            size: Maximum number of drivers alive at once
+            max_pages_per_driver: Pages after which a driver is recycled
+        """
+        self.factory = factory
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+
+        self._idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use: Set[int] = set()
+        self._closed = False
+
+        self.drivers_started = 0
+        self.startup_seconds = 0.0
+        self.pages = 0
+        self.recycled = 0
+        self.crashed = 0
+        self._first_checkout: Optional[float] = None
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for one page; it is returned (or replaced) on exit."""
+        if self._closed:
+            raise RuntimeError("Driver pool is shut down")
+
+        self._slots.acquire()
+        try:
+            pooled = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        failed = False
+        try:
+            yield pooled.driver
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            try:
+                self._checkin(pooled, failed)
+            finally:
+                self._slots.release()
+
+    def _checkout(self) -> _PooledDriver:
+        with self._lock:
+            if self._first_checkout is None:
+                self._first_checkout = time.monotonic()
+
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_healthy(pooled.driver):
+                self._track(pooled)
+                return pooled
+            self.crashed += 1
+            self._quit(pooled)
+
+        start = time.perf_counter()
+        pooled = _PooledDriver(self.factory())
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.drivers_started += 1
+            self.startup_seconds += elapsed
+        logger.debug(f"Started WebDriver in {elapsed * 1000:.0f}ms")
+
+        self._track(pooled)
+        return pooled
+
+    def _track(self, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._in_use.add(id(pooled))
+
+    def _checkin(self, pooled: _PooledDriver, failed: bool) -> None:
+        pooled.pages += 1
+        with self._lock:
+            self._in_use.discard(id(pooled))
+            self.pages += 1
+
+        if self._closed:
+            self._quit(pooled)
+            return
+
+        if failed and not self._is_healthy(pooled.driver):
+            logger.warning("WebDriver crashed, replacing it")
+            self.crashed += 1
+            self._quit(pooled)
+            return
+
+        if pooled.pages >= self.max_pages_per_driver:
+            self.recycled += 1
+            self._quit(pooled)
+            return
+
+        if not self._reset(pooled.driver):
+            self.crashed += 1
+            self._quit(pooled)
+            return
+
+        self._idle.put(pooled)
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        """A round-trip to the browser; fails if the session or process is gone."""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver) -> bool:
+        """Clear cookies and web storage so the next page starts clean."""
+        try:
+            driver.delete_all_cookies()
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                # Storage is unavailable on some pages (e.g. data: or error pages)
+                pass
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset WebDriver: {e}")
+            return False
+
+    @staticmethod
+    def _quit(pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Pool counters since the first checkout."""
+        elapsed = time.monotonic() - self._first_checkout if self._first_checkout else 0.0
+        return {
+            "drivers_started": self.drivers_started,
+            "avg_startup_ms": round(self.startup_seconds * 1000 / self.drivers_started, 1) if self.drivers_started else 0.0,
+            "pages": self.pages,
+            "pages_per_sec": round(self.pages / elapsed, 2) if elapsed > 0 else 0.0,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "idle": self._idle.qsize(),
+            "in_use": len(self._in_use),
+        }
+
+    def shutdown(self) -> None:
+        """Quit idle drivers; drivers still in use are quit when returned."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
@@ -3,8 +3,9 @@ Parallel web scraping with thread pool and rate limiting.
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -13,52 +14,74 @@ from selenium.webdriver.support import expected_conditions as EC
 import time
 import random
 
+from bot_engine.scrapers.driver_pool import WebDriverPool
+
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Rate limiter to avoid detection and respect site limits."""
+    """
+    Per-domain token bucket to avoid detection and respect site limits.
+    
+    Each domain refills ``max_requests`` tokens per ``time_window`` up to
+    ``burst`` tokens. ``acquire`` reserves a token and then sleeps for its
+    turn plus a random human-like delay. Reserving is plain arithmetic with
+    no await, so concurrent callers never wait on each other, only on the
+    rate.
+    """
     
-    def __init__(self, max_requests: int = 10, time_window: int = 60):
+    def __init__(
+        self,
+        max_requests: int = 10,
+        time_window: int = 60,
+        burst: Optional[int] = None,
+        jitter: Tuple[float, float] = (1, 3)
+    ):
         """
         Initialize rate limiter.
         
         Args:
-            max_requests: Maximum requests per time window
+            max_requests: Maximum requests per time window (per domain)
             time_window: Time window in seconds
+            burst: Requests a domain may make back to back (defaults to max_requests)
+            jitter: Range of the random delay added to every request, in seconds
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
-        self.lock = asyncio.Lock()
+        self.rate = max_requests / time_window
+        self.burst = burst or max_requests
+        self.jitter = jitter
+        # domain -> (tokens, last refill time); tokens go negative for reservations
+        self._buckets: Dict[str, Tuple[float, float]] = {}
     
-    async def acquire(self):
-        """Wait if rate limit exceeded."""
-        async with self.lock:
-            now = time.time()
-            
-            # Remove old requests outside time window
-            self.requests = [
-                req_time for req_time in self.requests
-                if now - req_time < self.time_window
-            ]
-            
-            # Wait if limit exceeded
-            if len(self.requests) >= self.max_requests:
-                oldest = self.requests[0]
-                wait_time = self.time_window - (now - oldest)
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached. Waiting {wait_time:.2f}s...")
-                    await asyncio.sleep(wait_time)
-                    # Retry acquire
-                    return await self.acquire()
-            
-            # Record this request
-            self.requests.append(now)
-            
-            # Add random delay to appear more human-like
-            delay = random.uniform(1, 3)
-            await asyncio.sleep(delay)
+    @staticmethod
+    def _domain(url: Optional[str]) -> str:
+        if not url:
+            return ""
+        return urlparse(url).netloc or url
+    
+    def reserve(self, url: Optional[str] = None) -> float:
+        """
+        Take a token for ``url``'s domain.
+        
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        domain = self._domain(url)
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(domain, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        self._buckets[domain] = (tokens, now)
+        return -tokens / self.rate if tokens < 0 else 0.0
+    
+    async def acquire(self, url: Optional[str] = None):
+        """Wait until a request to ``url``'s domain is allowed."""
+        wait_time = self.reserve(url)
+        if wait_time > 0:
+            logger.info(f"Rate limit reached for {self._domain(url) or 'default'}. Waiting {wait_time:.2f}s...")
+        
+        # Add random delay to appear more human-like
+        await asyncio.sleep(wait_time + random.uniform(*self.jitter))
 
 
 class ParallelScraper:
@@ -68,7 +91,8 @@ class ParallelScraper:
         self,
         max_workers: int = 5,
         rate_limit: int = 10,
-        headless: bool = True
+        headless: bool = True,
+        max_pages_per_driver: int = 50
     ):
         """
         Initialize parallel scraper.
@@ -77,11 +101,18 @@ class ParallelScraper:
             max_workers: Maximum concurrent scrapers
             rate_limit: Max requests per minute
             headless: Run browsers in headless mode
+            max_pages_per_driver: Pages a pooled browser serves before it is replaced
         """
         self.max_workers = max_workers
         self.rate_limiter = RateLimiter(max_requests=rate_limit, time_window=60)
         self.headless = headless
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # One reusable browser per worker thread
+        self.driver_pool = WebDriverPool(
+            self._create_driver,
+            size=max_workers,
+            max_pages_per_driver=max_pages_per_driver
+        )
     
     def _create_driver(self) -> webdriver.Chrome:
         """Create Chrome WebDriver using shared utility."""
@@ -98,24 +129,23 @@ class ParallelScraper:
         Returns:
             Job data or None if failed
         """
-        driver = None
         try:
-            driver = self._create_driver()
-            driver.get(job_url)
-            
-            # Wait for page load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Extract job data (customize based on site)
-            job_data = {
-                'url': job_url,
-                'title': self._safe_extract(driver, "//h1"),
-                'company': self._safe_extract(driver, "//div[@class='company']"),
-                'description': self._safe_extract(driver, "//div[@class='description']"),
-                'location': self._safe_extract(driver, "//span[@class='location']"),
-            }
+            with self.driver_pool.driver() as driver:
+                driver.get(job_url)
+                
+                # Wait for page load
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                
+                # Extract job data (customize based on site)
+                job_data = {
+                    'url': job_url,
+                    'title': self._safe_extract(driver, "//h1"),
+                    'company': self._safe_extract(driver, "//div[@class='company']"),
+                    'description': self._safe_extract(driver, "//div[@class='description']"),
+                    'location': self._safe_extract(driver, "//span[@class='location']"),
+                }
             
             logger.info(f"Scraped job: {job_data.get('title', 'Unknown')}")
             return job_data
@@ -123,10 +153,6 @@ class ParallelScraper:
         except Exception as e:
             logger.error(f"Failed to scrape {job_url}: {e}")
             return None
-            
-        finally:
-            if driver:
-                driver.quit()
     
     def _safe_extract(self, driver: webdriver.Chrome, xpath: str) -> str:
         """Safely extract text from element."""
@@ -136,6 +162,58 @@ class ParallelScraper:
         except Exception:
             return ""
     
+    async def scrape_one(self, url: str, timeout: float = 30) -> Optional[Dict[str, Any]]:
+        """Rate-limited scrape of a single URL, run in the thread pool."""
+        # Wait for rate limiter
+        await self.rate_limiter.acquire(url)
+        
+        # Run in the thread pool without blocking the event loop
+        future = self.executor.submit(self._scrape_job, url)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    
+    async def iter_jobs(
+        self,
+        job_urls: List[str],
+        timeout: float = 30
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape multiple jobs in parallel, yielding each one as soon as it is scraped.
+        
+        Breaking out of the loop cancels URLs that have not started yet.
+        
+        Args:
+            job_urls: List of job URLs to scrape
+            timeout: Seconds to wait for a single page
+            
+        Yields:
+            Scraped job data, in completion order
+        """
+        # Rate-limit URLs concurrently so independent domains and bursts overlap
+        tasks = [asyncio.create_task(self.scrape_one(url, timeout)) for url in job_urls]
+        scraped = 0
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    logger.error(f"Scraping task failed: {e}")
+                    continue
+                
+                if result:
+                    scraped += 1
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            
+            pool_stats = self.driver_pool.stats()
+            logger.info(
+                f"Scraped {scraped}/{len(job_urls)} jobs successfully "
+                f"({pool_stats['pages_per_sec']} pages/s, {pool_stats['drivers_started']} browsers started, "
+                f"avg startup {pool_stats['avg_startup_ms']}ms)"
+            )
+    
     async def scrape_jobs(self, job_urls: List[str]) -> List[Dict[str, Any]]:
         """
         Scrape multiple jobs in parallel.
@@ -146,33 +224,12 @@ class ParallelScraper:
         Returns:
             List of scraped job data
         """
-        results = []
-        
-        # Submit scraping tasks to thread pool
-        futures = []
-        for url in job_urls:
-            # Wait for rate limiter
-            await self.rate_limiter.acquire()
-            
-            # Submit to thread pool
-            future = self.executor.submit(self._scrape_job, url)
-            futures.append(future)
-        
-        # Collect results as they complete
-        for future in as_completed(futures):
-            try:
-                result = future.result(timeout=30)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                logger.error(f"Scraping task failed: {e}")
-        
-        logger.info(f"Scraped {len(results)}/{len(job_urls)} jobs successfully")
-        return results
+        return [job async for job in self.iter_jobs(job_urls)]
     
     def shutdown(self):
-        """Shutdown thread pool."""
+        """Shutdown thread pool and quit pooled browsers."""
         self.executor.shutdown(wait=True)
+        self.driver_pool.shutdown()
 
 
 # Global scraper instance
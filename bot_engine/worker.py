@@ -0,0 +1,30 @@
+"""
+Bot worker entrypoint: consumes the durable job queue.
+
+Run one per container (``python -m bot_engine.worker``); with
+BOT_QUEUE_BACKEND=redis all containers share the same consumer group.
+"""
+import asyncio
+import logging
+import signal
+
+from bot_engine.engine import bot_engine
+from bot_engine.queue.durable import job_queue
+
+
+async def main():
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await bot_engine.run_worker(job_queue, stop_event=stop_event)
+    finally:
+        await job_queue.close()
+        bot_engine.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())